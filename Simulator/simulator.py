@@ -3,6 +3,13 @@ import random
 import requests
 import json
 import logging
+import argparse
+import asyncio
+import gzip
+import math
+from collections import Counter
+
+import httpx
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -12,15 +19,25 @@ logger = logging.getLogger(__name__)
 BASE_URL = "http://localhost:8000"
 API_URL = f"{BASE_URL}/api/predict"
 
-def get_real_customers():
-    """Asks the backend for a list of real customers (IDs + Card Info)."""
+CUSTOMER_PAGE_SIZE = 1000  # Backend maximum (CUSTOMERS_MAX_PAGE_SIZE)
+
+def get_real_customers(base_url=BASE_URL):
+    """Asks the backend for a list of real customers (IDs + Card Info), following its pagination cursor."""
+    customers = []
+    params = {"limit": CUSTOMER_PAGE_SIZE}
     try:
-        response = requests.get(f"{BASE_URL}/api/customers")
-        if response.status_code == 200:
-            return response.json() # Returns [{id, full_name, card_type, card_last_four...}]
+        while True:
+            response = requests.get(f"{base_url}/api/customers", params=params)
+            if response.status_code != 200:
+                break
+            customers.extend(response.json()) # [{id, full_name, card_type, card_last_four...}]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["after"] = cursor
     except Exception as e:
         logger.error(f"Could not fetch customers: {e}")
-    return [] # Fallback
+    return customers # Empty list = fallback
 
 def generate_transaction(customers):
     # 1. Pick a REAL customer (if available)
@@ -82,7 +99,7 @@ def generate_transaction(customers):
     return txn_payload
 
 
-def run_simulation():
+def run_simulation(record_path=None):
     print("="*60)
     print("[*] STARTING BANK TRANSACTION SIMULATOR (LKR SUPPORT)")
     print(f"[*] Target: {API_URL}")
@@ -97,11 +114,15 @@ def run_simulation():
         customers = []
 
     transaction_count = 1
+    recorder = StreamRecorder(record_path, {"mode": "demo"}) if record_path else None
+    started = time.perf_counter()
 
     while True:
         try:
             # 1. Create Data
             txn_data = generate_transaction(customers)
+            if recorder:
+                recorder.write(time.perf_counter() - started, txn_data)
 
             # 2. Send to Backend
             response = requests.post(API_URL, json=txn_data)
@@ -137,10 +158,254 @@ def run_simulation():
 
         except KeyboardInterrupt:
             print("\n[*] Simulation Stopped.")
+            if recorder:
+                recorder.close()
+                print(f"[*] {recorder.count} transactions recorded to {record_path}")
             break
         except Exception as e:
             print(f"[X] Connection Error: {e}")
             time.sleep(2)
 
+
+# ─── RECORD / REPLAY ─────────────────────────────────────────────────────────
+# A recording is JSONL (gzip-compressed if the name ends in .gz): one header
+# line {"meta": {...}}, then one {"t": <send offset in s>, "txn": <payload>}
+# per transaction. Replaying the same file gives two runs the exact same
+# traffic, so a model or database change can be A/B tested on an identical
+# workload.
+
+def open_stream(path, mode):
+    return gzip.open(path, mode + "t") if path.endswith(".gz") else open(path, mode)
+
+
+class StreamRecorder:
+    """Appends sent transactions (with their send offset) to a recording."""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.count = 0
+        self._file = open_stream(path, "w")
+        self._write({"meta": {**meta, "created": time.strftime("%Y-%m-%dT%H:%M:%S")}})
+
+    def write(self, offset, payload):
+        self._write({"t": round(offset, 6), "txn": payload})
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def read_stream(path):
+    """Yields (send offset, payload) one line at a time; the file is never loaded whole."""
+    with open_stream(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "meta" in record:
+                continue
+            yield record["t"], record["txn"]
+
+
+def generated_stream(customers, rps, duration):
+    """Fresh transactions at a fixed arrival rate, generated just in time."""
+    interval = 1.0 / rps
+    for i in range(int(rps * duration)):
+        yield i * interval, generate_transaction(customers)
+
+
+# ─── LOAD TEST MODE ──────────────────────────────────────────────────────────
+# Open-loop: each request is *scheduled* at its offset (i/rps, or the recorded
+# send time on replay) no matter how slowly the server answers, and its latency
+# is measured from that scheduled time. A slow response therefore can't hide
+# the queueing it causes for the requests behind it (coordinated omission),
+# unlike the demo loop above which only sends the next transaction after the
+# previous one returned.
+
+REPORT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies_ms):
+    latencies_ms = sorted(latencies_ms)
+    if not latencies_ms:
+        return {}
+    return {
+        **{f"p{pct:g}": round(percentile(latencies_ms, pct), 3) for pct in REPORT_PERCENTILES},
+        "min": round(latencies_ms[0], 3),
+        "max": round(latencies_ms[-1], 3),
+        "mean": round(sum(latencies_ms) / len(latencies_ms), 3),
+    }
+
+
+def build_report(url, source, span_s, latencies_ms, service_ms, outcomes, errors, sent, elapsed_s, args):
+    completed = len(latencies_ms)
+    return {
+        "target": url,
+        "source": source,
+        "offered_rps": round((sent - 1) / span_s, 2) if sent > 1 and span_s > 0 else None,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed_s, 3),
+        "sent": sent,
+        "completed": completed,
+        "ok": completed - sum(errors.values()),
+        "throughput_rps": round(completed / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        "latency_ms": summarize(latencies_ms),   # From the scheduled send time (what callers see)
+        "service_ms": summarize(service_ms),     # From the actual send (hides queueing; for comparison)
+        "decisions": dict(outcomes),
+        "errors": dict(errors),
+    }
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print("[*] LOAD TEST REPORT")
+    print("=" * 60)
+    print(f"Target:      {report['target']}")
+    print(f"Source:      {report['source']}")
+    print(f"Offered:     {report['offered_rps']} req/s over {report['duration_s']}s (max {report['concurrency']} in flight)")
+    print(f"Sent:        {report['sent']}   Completed: {report['completed']}   OK: {report['ok']}")
+    print(f"Throughput:  {report['throughput_rps']} req/s")
+    latency, service = report["latency_ms"], report["service_ms"]
+    if latency:
+        print(f"\n{'Latency (ms)':<12} {'scheduled':>12} {'service':>12}")
+        for key in [f"p{pct:g}" for pct in REPORT_PERCENTILES] + ["max", "mean"]:
+            print(f"  {key:>10} {latency[key]:>12.3f} {service[key]:>12.3f}")
+    if report["decisions"]:
+        print("\nDecisions: " + ", ".join(f"{k}={v}" for k, v in sorted(report["decisions"].items())))
+    if report["errors"]:
+        print("\nErrors:")
+        for kind, count in sorted(report["errors"].items(), key=lambda item: -item[1]):
+            print(f"  {kind:<30} {count}")
+    print("=" * 60)
+
+
+async def run_load_test(args):
+    """
+    Fires transactions open-loop and reports latency percentiles.
+
+    Traffic is either generated at --rps for --duration seconds, or replayed
+    from a recording at its original timing divided by --speed (--duration
+    then optionally cuts the replay short).
+    """
+    url = args.base_url + args.endpoint
+    if args.replay:
+        source = f"replay {args.replay} x{args.speed:g}"
+        stream, speed = read_stream(args.replay), args.speed
+    else:
+        customers = get_real_customers(args.base_url)
+        duration = args.duration or 30.0
+        source = f"generated {args.rps:g} req/s for {duration:g}s ({len(customers) or 'no'} customers, seed {args.seed})"
+        stream, speed = generated_stream(customers, args.rps, duration), 1.0
+    recorder = StreamRecorder(args.record, {"mode": "load", "source": source}) if args.record else None
+
+    print("=" * 60)
+    print(f"[*] LOAD TEST: {source}, up to {args.concurrency} in flight")
+    print(f"[*] Target: {url}")
+    print("=" * 60)
+
+    latencies_ms = []
+    service_ms = []
+    outcomes = Counter()
+    errors = Counter()
+    in_flight = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+
+        async def fire(payload, scheduled_at):
+            # Waiting for a free connection counts as latency: that is what a real caller would see
+            async with in_flight:
+                sent_at = time.perf_counter()
+                try:
+                    response = await client.post(url, json=payload)
+                    if response.status_code == 200:
+                        outcomes[response.json().get("status", "?")] += 1
+                    else:
+                        errors[f"HTTP {response.status_code}"] += 1
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] += 1
+                finally:
+                    done_at = time.perf_counter()
+                    latencies_ms.append((done_at - scheduled_at) * 1000)
+                    service_ms.append((done_at - sent_at) * 1000)
+
+        tasks = []
+        span_s = 0.0
+        start = time.perf_counter()
+        next_progress = start + args.progress
+        try:
+            for offset, payload in stream:
+                span_s = offset / speed
+                if args.replay and args.duration and span_s > args.duration:
+                    break
+                scheduled_at = start + span_s
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(fire(payload, scheduled_at)))
+                if recorder:
+                    recorder.write(offset, payload)
+                if args.progress and scheduled_at >= next_progress:
+                    next_progress += args.progress
+                    print(f"    {len(tasks)} sent, {len(latencies_ms)} completed, {sum(errors.values())} errors")
+        finally:
+            if recorder:
+                recorder.close()
+
+        # Stragglers still count; anything past the timeout shows up as an error
+        await asyncio.gather(*tasks)
+        elapsed_s = time.perf_counter() - start
+
+    if recorder:
+        print(f"[*] {recorder.count} transactions recorded to {args.record}")
+    report = build_report(url, source, span_s, latencies_ms, service_ms, outcomes, errors, len(tasks), elapsed_s, args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[*] Report written to {args.json}")
+    return report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bank transaction simulator (demo feed or open-loop load test)")
+    parser.add_argument("--load", action="store_true", help="Run an open-loop load test instead of the demo feed")
+    parser.add_argument("--rps", type=float, default=50.0, help="Target arrival rate (requests/second)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max requests in flight (HTTP connection pool size)")
+    parser.add_argument("--duration", type=float, help="Test length in seconds (default 30; with --replay: whole file)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--base-url", default=BASE_URL, help="Backend base URL")
+    parser.add_argument("--endpoint", default="/api/predict", help="Path to load (e.g. /api/async/predict)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report to this JSON file")
+    parser.add_argument("--progress", type=float, default=5.0, help="Progress line every N seconds (0 = off)")
+    parser.add_argument("--seed", type=int, help="Seed the transaction generator (reproducible traffic)")
+    parser.add_argument("--record", metavar="PATH", help="Record sent transactions to a JSONL file (.gz = compressed)")
+    parser.add_argument("--replay", metavar="PATH", help="Replay a recording instead of generating (implies --load)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed-up (2 = twice as fast as recorded)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    run_simulation()
\ No newline at end of file
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.speed <= 0:
+        raise SystemExit("--speed must be > 0")
+    if args.load or args.replay:
+        # Don't log every generated attack / HTTP request at hundreds of req/s
+        logger.setLevel(logging.ERROR)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        asyncio.run(run_load_test(args))
+    else:
+        run_simulation(args.record)
@@ -15,6 +15,74 @@ class Settings(BaseSettings):
     SMTP_USERNAME: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
 
+    # Async Endpoints (/api/async/*)
+    ASYNC_DATABASE_URL: Optional[str] = None   # Defaults to DATABASE_URL on asyncpg / aiosqlite
+    ASYNC_DB_POOL_SIZE: int = 20
+    ASYNC_DB_MAX_OVERFLOW: int = 40
+    INFERENCE_THREADS: int = 4                 # Dedicated executor for model inference (async endpoints)
+
+    # Model Hot-Swap
+    MODEL_WATCH_INTERVAL_SECONDS: float = 0.0  # >0: poll model artifacts and hot-swap on change
+    MODEL_RETIRE_GRACE_SECONDS: float = 30.0   # Keep a replaced version's inference pool this long
+
+    # Inference Process Pool
+    INFERENCE_PROCESSES: int = 0          # >0: score in forked processes (needs AUTOENCODER_BACKEND=numpy)
+    INFERENCE_POOL_SLOTS: int = 32        # Shared-memory request/response slots
+    INFERENCE_POOL_SLOT_ROWS: int = 256   # Rows per slot; larger matrices span several slots
+
+    # Fraud Scoring
+    PREDICT_BATCH_MAX_SIZE: int = 5000  # Max transactions per /api/predict/batch call
+    PREDICT_STREAM_CHUNK_SIZE: int = 256        # /api/predict/stream: rows per vectorized model pass + commit
+    PREDICT_STREAM_MAX_LINE_BYTES: int = 65536  # Longer NDJSON lines abort the stream (no newline = bad input)
+    MICRO_BATCH_ENABLED: bool = False    # Group concurrent /api/predict calls into one model pass
+    MICRO_BATCH_WINDOW_MS: float = 2.0   # How long the batcher waits for more rows
+    MICRO_BATCH_MAX_ROWS: int = 64       # Flush early once this many rows are waiting
+    AUTOENCODER_BACKEND: str = "keras"   # "keras" or "numpy" (no TensorFlow import)
+    AUTOENCODER_NUMPY_PATH: str = "autoencoder_numpy.npz"  # Written by export_autoencoder_numpy.py
+    XGBOOST_BACKEND: str = "sklearn"     # "sklearn", "flat", "inplace" or "auto"
+    XGBOOST_FLAT_MAX_ROWS: int = 16      # "auto": flat traversal up to this batch size, inplace_predict above
+    CONFIG_CACHE_TTL_SECONDS: float = 30.0  # SystemConfig snapshot refresh for writes from other workers
+    WHITELIST_CACHE_TTL_SECONDS: float = 30.0  # Merchant whitelist index refresh for writes from other workers
+    CUSTOMER_CACHE_MAX_SIZE: int = 50000       # LRU bound for cached customer state (frozen/active/card)
+    CUSTOMER_CACHE_TTL_SECONDS: float = 5.0    # Bounds staleness of freezes made by other workers
+
+    # Transaction Persistence
+    TRANSACTION_PERSISTENCE: str = "sync"  # "sync" (commit before responding) or "write_behind"
+    WRITE_BEHIND_QUEUE_SIZE: int = 10000   # Bounded queue; when full, requests write synchronously
+    WRITE_BEHIND_FLUSH_MS: float = 5.0     # Group-commit window
+    WRITE_BEHIND_MAX_BATCH: int = 500      # Max rows per multi-row INSERT
+
+    # Notifications
+    NOTIFICATION_ASYNC: bool = True        # Send alerts from a worker pool instead of the request path
+    NOTIFICATION_QUEUE_SIZE: int = 10000   # Bounded queue; when full, requests notify inline
+    NOTIFICATION_WORKERS: int = 4
+    NOTIFICATION_MAX_BATCH: int = 200      # Max in-app alerts stored per INSERT
+    NOTIFICATION_FLUSH_MS: float = 10.0
+
+    # Slack Webhook Delivery
+    SLACK_COALESCE_WINDOW_MS: float = 1000.0   # Alerts within this window are posted as one message
+    SLACK_MAX_MESSAGES_PER_POST: int = 20
+    SLACK_RATE_PER_SECOND: float = 1.0         # Slack allows ~1 message/s per incoming webhook
+    SLACK_RATE_BURST: int = 3
+    SLACK_MAX_RETRIES: int = 3                 # Retries on connection errors, 429 and 5xx
+    SLACK_TIMEOUT_SECONDS: float = 5.0         # Per-request connect/read timeout
+    SLACK_DELIVERY_DEADLINE_SECONDS: float = 30.0  # Give up on a message (incl. retries) after this
+
+    # E-mail Alerts
+    SUBSCRIBER_REGISTRY_TTL_SECONDS: float = 60.0  # Picks up preference changes made by other workers
+    EMAIL_SENDER_WORKERS: int = 2                  # Threads (and pooled SMTP connections) for alert e-mails
+
+    # Dashboard
+    DASHBOARD_TRENDS_MAX_DAYS: int = 366        # Longest /api/dashboard/trends?days= range
+    CUSTOMERS_PAGE_SIZE: int = 100              # /api/customers rows per page (keyset pagination)
+    CUSTOMERS_MAX_PAGE_SIZE: int = 1000
+
+    # Live Dashboard Feed (GET /api/events, server-sent events)
+    LIVE_EVENTS_FEED_SIZE: int = 10             # Newest transactions kept per client between pushes
+    LIVE_EVENTS_INTERVAL_MS: float = 250.0      # Min gap between pushes to one client; events in between are merged
+    LIVE_EVENTS_HEARTBEAT_SECONDS: float = 15.0 # Keep-alive comment on idle connections
+    LIVE_EVENTS_RESYNC_SECONDS: float = 60.0    # Streams reconnect (fresh snapshot) this often; also bounds shutdown waits
+
     class Config:
         env_file = ".env"
         extra = "allow"
@@ -1,4 +1,6 @@
+from fastapi import HTTPException
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -16,3 +18,38 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# --- ASYNC ENGINE (async scoring endpoints) ---
+# Same database through an asyncio driver: postgresql -> asyncpg, sqlite -> aiosqlite
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def to_async_url(url: str) -> str:
+    """Maps a sync DATABASE_URL onto its asyncio driver (keeps credentials, host and options)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+async_engine = None
+AsyncSessionLocal = None
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_url = settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+    pool_options = {}
+    if not async_url.startswith("sqlite"):
+        # Enough connections for many in-flight requests on one worker
+        pool_options = {"pool_size": settings.ASYNC_DB_POOL_SIZE, "max_overflow": settings.ASYNC_DB_MAX_OVERFLOW}
+    async_engine = create_async_engine(async_url, **pool_options)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+except (ImportError, ValueError) as e:
+    # asyncpg / aiosqlite not installed: the async endpoints answer 503, everything else is unaffected
+    print(f"⚠️  Async database engine unavailable: {e}")
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database driver not installed")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,165 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def exponential_buckets(start: float, factor: float, end: float) -> List[float]:
+    """Upper bounds start, start*factor, ... up to `end` (inclusive)."""
+    bounds = []
+    bound = start
+    while bound < end * (1 + 1e-9):
+        bounds.append(float(f"{bound:.6g}"))
+        bound *= factor
+    return bounds
+
+
+# 10 µs .. ~60 s in ~25% steps: fine enough for p50/p95/p99 estimates within a few percent
+LATENCY_BUCKETS = exponential_buckets(0.00001, 1.25, 60.0)
+REPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (Prometheus exposition), one series per label value.
+
+    observe() is a bisect plus two increments under a lock, cheap enough to call
+    several times per request. Quantiles are estimated from the bucket counts.
+    """
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = list(buckets)
+        self._series: Dict[str, Tuple[List[int], List[float]]] = {}  # label value -> (counts, [sum])
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += seconds
+
+    def quantile(self, label_value: str, q: float) -> float:
+        with self._lock:
+            series = self._series.get(label_value)
+            counts = list(series[0]) if series else []
+        total = sum(counts)
+        if total == 0:
+            return math.nan
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = {value: (list(counts), total[0]) for value, (counts, total) in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for value, (counts, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{self.label}="{value}",le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{self.label}="{value}",le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{self.label}="{value}"}} {total:.9f}')
+            lines.append(f'{self.name}_count{{{self.label}="{value}"}} {cumulative}')
+
+        # Pre-computed estimates for dashboards without histogram_quantile()
+        lines.append(f"# HELP {self.name}_quantile {self.help_text} (estimated from the buckets)")
+        lines.append(f"# TYPE {self.name}_quantile gauge")
+        for value in sorted(snapshot):
+            for q in REPORTED_QUANTILES:
+                lines.append(f'{self.name}_quantile{{{self.label}="{value}",quantile="{q}"}} {self.quantile(value, q):.9f}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one series per label value."""
+
+    def __init__(self, name: str, help_text: str, label: str):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount: int = 1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(f'{self.name}{{{self.label}="{value}"}} {count}' for value, count in sorted(values.items()))
+        return lines
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one request into a Histogram:
+
+        timer = StageTimer(PREDICT_STAGE_SECONDS)
+        with timer.stage("customer_lookup"):
+            ...
+        timer.finish()   # records the whole request as stage "total"
+
+    With histogram=None nothing is recorded (for callers that weren't given a timer).
+    """
+
+    def __init__(self, histogram: Optional[Histogram]):
+        self.histogram = histogram
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.histogram is not None:
+                self.histogram.observe(name, time.perf_counter() - start)
+
+    def finish(self, name: str = "total"):
+        if self.histogram is not None:
+            self.histogram.observe(name, time.perf_counter() - self.started)
+
+
+PREDICT_STAGE_SECONDS = Histogram(
+    "fraud_predict_stage_seconds",
+    "Time spent in each stage of /api/predict",
+    label="stage",
+)
+MODEL_STAGE_SECONDS = Histogram(
+    "fraud_model_stage_seconds",
+    "Time per vectorized model pass (xgboost, scaler, autoencoder), any endpoint",
+    label="stage",
+)
+PREDICTIONS_TOTAL = Counter(
+    "fraud_predictions_total",
+    "Decisions returned by /api/predict",
+    label="status",
+)
+
+METRICS = [PREDICT_STAGE_SECONDS, MODEL_STAGE_SECONDS, PREDICTIONS_TOTAL]
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -41,50 +41,69 @@
 # def root():
 #     return {"message": "Welcome to AI Powered Transaction Scrutinization Engine Backend"}
 
-import joblib
+import asyncio
+import threading
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timedelta, date
 import random
 import warnings
 warnings.filterwarnings('ignore')
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, String, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, select, String, cast
 
-# Deep Learning
-try:
-    from tensorflow.keras.models import load_model
-    TF_AVAILABLE = True
-except ImportError:
-    TF_AVAILABLE = False
-    print("⚠️  TensorFlow not available. Autoencoder will not be loaded.")
+from app.core.config import settings
 
 # Import your existing modules
-from app.core.config import settings
 from app.routers import auth, health, admin
 from app.routers import config_rules, reports, search, notifications as notif_router
-from app.core.database import engine, Base, get_db
+from app.routers import metrics as metrics_router
+from app.core.database import engine, Base, get_db, get_async_db, SessionLocal
 from app.models.customer import Customer
 from app.models.transaction import Transaction
-from app.models.config import SystemConfig
 from app.models.notification import Notification        # noqa: F401  — registers table
 from app.models.rules import MerchantWhitelist, CountryBlacklist  # noqa: F401  — registers tables
+from app.models.daily_stats import DailyTransactionStats  # noqa: F401  — registers table
 from app.services.notification_service import notification_service
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.slack_client import slack_client
+from app.services.email_sender import email_sender
+from app.services.subscriber_registry import subscriber_registry
+from app.services.micro_batcher import MicroBatcher
+from app.services.config_cache import config_cache
+from app.services.whitelist_cache import merchant_whitelist_index, normalize_merchant_name
+from app.services.customer_cache import customer_state_cache
+from app.services.transaction_writer import TransactionWriter
+from app.services.live_events import live_events
+from app.services.daily_stats import daily_stats
+from app.ml.numpy_autoencoder import NumpyAutoencoder
+from app.ml.inference_pool import InferencePool
+from app.ml.model_registry import ModelBundle, model_registry
+from app.core.metrics import StageTimer, PREDICT_STAGE_SECONDS, MODEL_STAGE_SECONDS, PREDICTIONS_TOTAL
+from app.utils.wire_format import MEDIA_TYPE as BINARY_MEDIA_TYPE, N_FEATURES, WireFormatError, decode_transactions
+from app.core.responses import DuplexStreamingResponse, FastJSONResponse, dumps
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=FastJSONResponse)
 
 # --- GLOBAL VARIABLES ---
-ml_model = None                    # XGBoost model (known fraud patterns)
-autoencoder_model = None           # Autoencoder model (anomaly detection)
-autoencoder_scaler = None          # Scaler for autoencoder features
-autoencoder_metadata = None        # Metadata with thresholds
-hybrid_mode_enabled = False        # Flag for hybrid prediction
+# Models live in model_registry.current (a ModelBundle: XGBoost, Autoencoder, scaler, metadata)
+micro_batcher = None               # Groups concurrent /api/predict calls (MICRO_BATCH_ENABLED)
+transaction_writer = None          # Group-commit writer (TRANSACTION_PERSISTENCE=write_behind)
+inference_executor = None          # Model inference threads for the async endpoints
+retiring_pools = {}                # InferencePool of a swapped-out model version -> Timer that stops it
 
 # --- PYDANTIC MODELS ---
 class Metadata(BaseModel):
@@ -94,7 +113,7 @@ class Metadata(BaseModel):
 
 class TransactionRequest(BaseModel):
     # The model expects a list of 30 numerical features (V1-V28, Time, Amount)
-    features: List[float]
+    features: List[float] = Field(min_length=N_FEATURES, max_length=N_FEATURES)
     metadata: Metadata
 
 class TransactionResponse(BaseModel):
@@ -102,6 +121,72 @@ class TransactionResponse(BaseModel):
     status: str
     decision_reason: str
 
+class BatchTransactionRequest(BaseModel):
+    # Settlement batches: scored in one vectorized pass, answered in input order
+    transactions: List[TransactionRequest]
+    # Binary requests: the whole N x 30 float32 matrix as decoded from the body
+    _features: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    def feature_matrix(self, rows: List[int]) -> np.ndarray:
+        """float64 feature matrix of the given transactions (in that order)."""
+        if self._features is not None:
+            matrix = self._features if len(rows) == len(self._features) else self._features[rows]
+            return matrix.astype(np.float64)
+        return np.array([self.transactions[i].features for i in rows], dtype=np.float64)
+
+# --- REQUEST BODIES (JSON or binary wire format, see app/utils/wire_format.py) ---
+def _validate_json_body(model, body: bytes):
+    # One pass from raw bytes to the model (same 422 response as a declared body parameter)
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)], body=body
+        )
+
+def _decode_binary_body(body: bytes):
+    """(float32 feature matrix, TransactionRequest per row) — rows are views, nothing is re-validated."""
+    try:
+        features, customer_ids, amounts, merchants = decode_transactions(body)
+    except WireFormatError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid binary payload: {e}")
+    txns = [
+        TransactionRequest.model_construct(
+            features=features[i],
+            metadata=Metadata.model_construct(customer_id=customer_id, merchant=merchant, amount=amount),
+        )
+        for i, (customer_id, amount, merchant) in enumerate(zip(customer_ids.tolist(), amounts.tolist(), merchants))
+    ]
+    return features, txns
+
+def _is_binary(request: Request) -> bool:
+    return request.headers.get("content-type", "").split(";")[0].strip() == BINARY_MEDIA_TYPE
+
+async def read_transaction(request: Request) -> TransactionRequest:
+    body = await request.body()
+    if not _is_binary(request):
+        return _validate_json_body(TransactionRequest, body)
+    _, txns = _decode_binary_body(body)
+    if len(txns) != 1:
+        raise HTTPException(status_code=400, detail=f"Expected 1 transaction, got {len(txns)} (use /api/predict/batch)")
+    return txns[0]
+
+async def read_transaction_batch(request: Request) -> BatchTransactionRequest:
+    body = await request.body()
+    if not _is_binary(request):
+        return _validate_json_body(BatchTransactionRequest, body)
+    features, txns = _decode_binary_body(body)
+    batch = BatchTransactionRequest.model_construct(transactions=txns)
+    batch._features = features
+    return batch
+
+def _request_body_doc(model) -> dict:
+    """OpenAPI requestBody for endpoints that read the body through read_transaction*."""
+    return {"requestBody": {"required": True, "content": {
+        "application/json": {"schema": model.model_json_schema()},
+        BINARY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+    }}}
+
 # --- CORS ---
 origins = [
     "http://localhost:3000",
@@ -118,6 +203,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],  # /api/customers pagination
 )
 
 # --- INCLUDE ROUTERS ---
@@ -128,11 +214,12 @@ app.include_router(config_rules.router)
 app.include_router(reports.router)
 app.include_router(search.router)
 app.include_router(notif_router.router)
+app.include_router(metrics_router.router)
 
 # --- STARTUP EVENT (Database + AI Models Load) ---
 @app.on_event("startup")
 def startup_event():
-    global ml_model, autoencoder_model, autoencoder_scaler, autoencoder_metadata, hybrid_mode_enabled
+    global micro_batcher, transaction_writer, inference_executor
     
     print("\n" + "="*70)
     print("🚀 FRAUD DETECTION ENGINE STARTUP")
@@ -146,66 +233,110 @@ def startup_event():
     except Exception as e:
         print(f"     ❌ Database connection failed: {e}")
 
-    # 2. Load XGBoost Model (Supervised Learning - Known Frauds)
-    print("\n[2/3] Loading XGBoost model (supervised learning)...")
+    # 2-3. Load XGBoost + Autoencoder as one versioned bundle (app/ml/model_registry.py).
+    #      Loaded before any other thread starts so an inference pool can fork cleanly.
+    print("\n[2/3] Loading XGBoost model (supervised learning) + Autoencoder (unsupervised learning)...")
+    model_registry.configure(prepare=_prepare_bundle, on_retire=_retire_bundle)
+    bundle = model_registry.load_initial()
+    if bundle.hybrid_mode_enabled:
+        print("\n" + "="*70)
+        print("🎯 HYBRID FRAUD DETECTION ENABLED")
+        print("    • XGBoost: Known fraud patterns")
+        print("    • Autoencoder: Zero-day anomaly detection")
+        print("="*70 + "\n")
+
+    # 3. Hot-swap: watch the artifacts retrain_models.py re-points (POST /api/admin/models/reload also works)
+    print(f"\n[3/3] Model version {bundle.version} live")
+    if settings.MODEL_WATCH_INTERVAL_SECONDS > 0:
+        model_registry.start_watching(settings.MODEL_WATCH_INTERVAL_SECONDS)
+        print(f"     👀 Watching model artifacts every {settings.MODEL_WATCH_INTERVAL_SECONDS}s")
+
+    # 4. Micro-batching scheduler (optional)
+    if settings.MICRO_BATCH_ENABLED and bundle.has_model:
+        micro_batcher = MicroBatcher(
+            _run_inference,
+            window_ms=settings.MICRO_BATCH_WINDOW_MS,
+            max_rows=settings.MICRO_BATCH_MAX_ROWS,
+        )
+        micro_batcher.start()
+        print(f"     ⚡ Micro-batching enabled ({settings.MICRO_BATCH_WINDOW_MS} ms / {settings.MICRO_BATCH_MAX_ROWS} rows)")
+
+    # 5. Write-behind persistence (optional — sync is the durable default)
+    if settings.TRANSACTION_PERSISTENCE == "write_behind":
+        transaction_writer = TransactionWriter(
+            SessionLocal,
+            queue_size=settings.WRITE_BEHIND_QUEUE_SIZE,
+            flush_interval_ms=settings.WRITE_BEHIND_FLUSH_MS,
+            max_batch=settings.WRITE_BEHIND_MAX_BATCH,
+        )
+        transaction_writer.start()
+        print(f"     💾 Write-behind persistence enabled (flush every {settings.WRITE_BEHIND_FLUSH_MS} ms)")
+
+    # 6. Notification workers (alerts leave the request path)
+    if settings.NOTIFICATION_ASYNC:
+        notification_dispatcher.start()
+        print(f"     🔔 Async notifications enabled ({settings.NOTIFICATION_WORKERS} workers)")
+
+    # 7. Inference executor for the async endpoints (keeps model CPU work off the event loop)
+    inference_executor = ThreadPoolExecutor(max_workers=settings.INFERENCE_THREADS, thread_name_prefix="inference")
+
+    # 8. High-risk e-mail subscribers (kept current by UserService.update_profile)
+    db = SessionLocal()
     try:
-        ml_model = joblib.load("fraud_model.pkl")
-        print("     ✅ XGBoost model loaded successfully")
+        subscriber_registry.load(db)
+        print(f"     📧 {len(subscriber_registry.emails(db))} high-risk e-mail subscriber(s)")
     except Exception as e:
-        print(f"     ❌ Failed to load XGBoost model: {e}")
-        print("     ⚠️  System will operate without XGBoost")
+        print(f"     ⚠️  Could not load e-mail subscribers (will retry on first alert): {e}")
+    finally:
+        db.close()
 
-    # 3. Load Autoencoder Model (Unsupervised Learning - Anomalies)
-    print("\n[3/3] Loading Autoencoder model (unsupervised learning)...")
+    # 9. Daily stats rollup (kept current by the scoring path; built once from existing transactions)
+    db = SessionLocal()
     try:
-        if not TF_AVAILABLE:
-            raise ImportError("TensorFlow not available")
-        
-        # Try loading with both formats (.keras and .h5)
-        autoencoder_model = None
-        
-        # Try new Keras format first
-        try:
-            autoencoder_model = load_model("autoencoder_model.keras")
-            print("     ✅ Autoencoder loaded (keras format)")
-        except:
-            # Fall back to old HDF5 format
-            try:
-                autoencoder_model = load_model("autoencoder_model.h5")
-                print("     ✅ Autoencoder loaded (h5 format)")
-            except Exception as e:
-                print(f"     ⚠️  Could not load Autoencoder: {e}")
-                autoencoder_model = None
-        
-        if autoencoder_model is not None:
-            autoencoder_scaler = joblib.load("autoencoder_scaler.pkl")
-            autoencoder_metadata = joblib.load("autoencoder_metadata.pkl")
-            
-            print(f"     📊 Reconstruction threshold: {autoencoder_metadata['reconstruction_threshold']:.6f}")
-            
-            # Enable hybrid mode only if both models are loaded
-            if ml_model is not None and autoencoder_model is not None:
-                hybrid_mode_enabled = True
-                print("\n" + "="*70)
-                print("🎯 HYBRID FRAUD DETECTION ENABLED")
-                print("    • XGBoost: Known fraud patterns")
-                print("    • Autoencoder: Zero-day anomaly detection")
-                print("="*70 + "\n")
-        
+        days = daily_stats.ensure_initialized(db)
+        if days is not None:
+            print(f"     📊 Daily stats rollup built from existing transactions ({days} days)")
     except Exception as e:
-        print(f"     ⚠️  Autoencoder not available: {e}")
-        print("     (System will use XGBoost only for fraud detection)")
-        autoencoder_model = None
-        autoencoder_scaler = None
-        hybrid_mode_enabled = False
+        db.rollback()
+        print(f"     ⚠️  Could not build the daily stats rollup: {e}")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    if micro_batcher is not None:
+        micro_batcher.stop()
+    if transaction_writer is not None:
+        # Drain every queued decision before the process exits
+        print(f"💾 Flushing {transaction_writer.pending} queued transactions...")
+        transaction_writer.stop()
+    # After the writer: its flushes still hand alerts to the dispatcher
+    if notification_dispatcher.running:
+        print(f"🔔 Sending {notification_dispatcher.pending} queued notifications...")
+        notification_dispatcher.stop()
+    slack_client.close()
+    email_sender.close()
+    if inference_executor is not None:
+        inference_executor.shutdown(wait=True)
+    model_registry.stop_watching()
+    # Pools of versions retired by a hot-swap: don't leave their workers and shared memory behind
+    for pool, timer in list(retiring_pools.items()):
+        timer.cancel()
+        timer.join()  # In case it is stopping the pool right now
+        pool.stop()
+    retiring_pools.clear()
+    if model_registry.current.inference_pool is not None:
+        model_registry.current.inference_pool.stop()
 
 @app.get("/")
 def root():
-    status = "HYBRID MODE" if hybrid_mode_enabled else "XGBOOST ONLY"
+    bundle = model_registry.current
+    status = "HYBRID MODE" if bundle.hybrid_mode_enabled else "XGBOOST ONLY"
     return {
         "message": "Welcome to AI Powered Transaction Scrutinization Engine Backend",
         "mode": status,
-        "hybrid_enabled": hybrid_mode_enabled
+        "hybrid_enabled": bundle.hybrid_mode_enabled,
+        "model_version": bundle.version
     }
 
 @app.get("/api/system/health")
@@ -247,6 +378,8 @@ def system_health(db: Session = Depends(get_db)):
         })
 
     # ── 3. XGBoost ML Model ───────────────────────────────────────────────────
+    bundle = model_registry.current
+    ml_model, autoencoder_model, autoencoder_scaler = bundle.ml_model, bundle.autoencoder_model, bundle.autoencoder_scaler
     if ml_model is not None:
         try:
             dummy = np.zeros((1, 30))
@@ -315,10 +448,40 @@ def create_customer(name: str, email: str, card_type: str = "Visa", card_last_fo
     db.refresh(new_customer)
     return {"message": "Customer created", "id": new_customer.id}
 
+# Per-customer transaction stats, aggregated in the same query as the customer rows
+CUSTOMER_LIST_COLUMNS = (
+    Customer.id, Customer.full_name, Customer.email, Customer.card_type,
+    Customer.card_last_four, Customer.is_frozen, Customer.is_active,
+    func.count(Transaction.id).label("transaction_count"),
+    func.max(Transaction.timestamp).label("last_activity"),
+    func.coalesce(func.avg(Transaction.fraud_score), 0.0).label("risk_score"),
+)
+
 @app.get("/api/customers")
-def get_customers(search: str = None, risk_filter: str = None, db: Session = Depends(get_db)):
-    # 1. Base Query
-    query = db.query(Customer)
+def get_customers(
+    search: str = None,
+    risk_filter: str = None,
+    limit: int = None,
+    after: int = None,
+    include_total: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Customers with their transaction count, last activity and average fraud score.
+
+    One grouped query: customers LEFT JOIN transactions GROUP BY customer, with
+    risk_filter applied as HAVING ("high": avg score >= 0.5, "safe": <= 0.1).
+
+    Keyset pagination in id order: at most `limit` rows (default CUSTOMERS_PAGE_SIZE)
+    with id > `after`. When more rows follow, the X-Next-Cursor header holds the
+    value to pass as `after`; include_total=true adds the match count as X-Total-Count.
+    """
+    limit = settings.CUSTOMERS_PAGE_SIZE if limit is None else limit
+    if not 1 <= limit <= settings.CUSTOMERS_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {settings.CUSTOMERS_MAX_PAGE_SIZE}")
+
+    # 1. Base Query (customer columns + aggregated transaction stats)
+    query = db.query(*CUSTOMER_LIST_COLUMNS).outerjoin(Transaction, Transaction.customer_id == Customer.id)
     
     # 2. Search Logic
     if search:
@@ -328,45 +491,45 @@ def get_customers(search: str = None, risk_filter: str = None, db: Session = Dep
                 Customer.email.ilike(f"%{search}%")
             )
         )
-    
-    customers = query.all()
-    
-    results = []
-    for cust in customers:
-        # 3. Calculate Dynamic Stats
-        # Count transactions
-        txn_count = db.query(Transaction).filter(Transaction.customer_id == cust.id).count()
-        
-        # Last Activity
-        last_txn = db.query(Transaction).filter(Transaction.customer_id == cust.id)\
-                     .order_by(Transaction.timestamp.desc()).first()
-        last_active = last_txn.timestamp if last_txn else None
-
-        # Average Fraud Score
-        avg_score = db.query(func.avg(Transaction.fraud_score))\
-                      .filter(Transaction.customer_id == cust.id).scalar() or 0.0
-        
-        # 4. Filter Logic (Post-Calculation)
-        # "High Risk" > 50%, "Safe" <= 10%
-        if risk_filter == "high" and avg_score < 0.5:
-            continue
-        if risk_filter == "safe" and avg_score > 0.1:
-            continue
 
-        results.append({
+    query = query.group_by(Customer.id)
+
+    # 3. Filter Logic (in SQL, on the aggregated score)
+    # "High Risk" >= 50%, "Safe" <= 10%
+    avg_score = func.coalesce(func.avg(Transaction.fraud_score), 0.0)
+    if risk_filter == "high":
+        query = query.having(avg_score >= 0.5)
+    elif risk_filter == "safe":
+        query = query.having(avg_score <= 0.1)
+
+    headers = {}
+    if include_total:
+        headers["X-Total-Count"] = str(db.query(func.count()).select_from(query.subquery()).scalar())
+
+    # 4. Keyset page (one extra row tells whether another page follows)
+    if after is not None:
+        query = query.filter(Customer.id > after)
+    rows = query.order_by(Customer.id).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1].id)
+
+    results = [
+        {
             "id": cust.id,
             "full_name": cust.full_name,
             "email": cust.email,
             "card_type": cust.card_type,
             "card_last_four": cust.card_last_four,
-            "risk_score": avg_score,
-            "last_activity": last_active.isoformat() if last_active else "Never",
-            "transaction_count": txn_count,
+            "risk_score": float(cust.risk_score),
+            "last_activity": cust.last_activity.isoformat() if cust.last_activity else "Never",
+            "transaction_count": cust.transaction_count,
             "is_frozen": cust.is_frozen,
             "is_active": cust.is_active
-        })
-    
-    return results
+        }
+        for cust in rows
+    ]
+    return FastJSONResponse(results, headers=headers)
 
 @app.post("/api/customers/{customer_id}/deactivate")
 def deactivate_customer(customer_id: int, db: Session = Depends(get_db)):
@@ -377,6 +540,7 @@ def deactivate_customer(customer_id: int, db: Session = Depends(get_db)):
     # Deactivate (Soft Delete)
     customer.is_active = False
     db.commit()
+    customer_state_cache.invalidate(customer_id)
     return {"message": "Customer deactivated", "is_active": False}
 
 @app.post("/api/customers/{customer_id}/freeze")
@@ -388,17 +552,197 @@ def freeze_customer(customer_id: int, db: Session = Depends(get_db)):
     # Toggle Freeze Status
     customer.is_frozen = not customer.is_frozen
     db.commit()
+    customer_state_cache.invalidate(customer_id)
     return {"message": f"Customer {'frozen' if customer.is_frozen else 'unfrozen'}", "is_frozen": customer.is_frozen}
 
 @app.get("/api/customers/ids")
 def get_customer_ids(db: Session = Depends(get_db)):
     # Only fetch ACTIVE customers so the simulator doesn't use deactivated ones
-    customers = db.query(Customer).filter(Customer.is_active == True).all()
-    return [c.id for c in customers]
+    return FastJSONResponse([customer_id for (customer_id,) in db.query(Customer.id).filter(Customer.is_active == True)])
+
+# --- HYBRID SCORING HELPERS (shared by single + batch prediction) ---
+def _score_features(features_array: np.ndarray, bundle: ModelBundle = None):
+    """
+    Runs both models over an N x 30 feature matrix in one vectorized pass.
+    Returns (xgboost_scores, autoencoder_scores, reconstruction_errors) as arrays of length N.
+
+    bundle: model version to use (default: the live one). A model that fails raises:
+    a zero score would read as "Approve", so the request fails instead.
+    """
+    bundle = bundle or model_registry.current
+    ml_model, autoencoder_model, autoencoder_scaler = bundle.ml_model, bundle.autoencoder_model, bundle.autoencoder_scaler
+    n_rows = features_array.shape[0]
+    xgboost_scores = np.zeros(n_rows)
+    autoencoder_scores = np.zeros(n_rows)
+    reconstruction_errors = np.zeros(n_rows)
+    model_timer = StageTimer(MODEL_STAGE_SECONDS)  # Per model pass (in this process; pool workers aren't exported)
+
+    # ===== PATH 1 - XGBoost (Supervised Learning) =====
+    if ml_model is not None:
+        with model_timer.stage("xgboost"):
+            xgboost_scores = ml_model.predict_proba(features_array)[:, 1].astype(np.float64)
+
+    # ===== PATH 2 - Autoencoder (Unsupervised Learning) =====
+    if autoencoder_model is not None and autoencoder_scaler is not None:
+        # Normalize features using the scaler (transform returns a new array)
+        with model_timer.stage("scaler"):
+            features_scaled = autoencoder_scaler.transform(features_array)
+
+        # After StandardScaler, normal rows sit roughly in [-3, 3].
+        # Rows way outside that range are broken somehow: flag them as
+        # maximum anomaly and keep them out of the autoencoder pass.
+        broken = np.max(np.abs(features_scaled), axis=1) > 100
+        reconstruction_errors[broken] = 999.0
+        autoencoder_scores[broken] = 1.0
+
+        valid = ~broken
+        if valid.any():
+            # Get reconstruction from autoencoder
+            with model_timer.stage("autoencoder"):
+                reconstruction = autoencoder_model.predict(features_scaled[valid], verbose=0)
+
+            # Per-row Mean Squared Error (reconstruction error)
+            # For normalized features, MSE should typically be 0.01-0.10
+            errors = np.mean(np.power(features_scaled[valid] - reconstruction, 2), axis=1)
+            reconstruction_errors[valid] = errors
+
+            # Errors above 1.0 are treated as anomalies / data issues (max score),
+            # everything else is normalized to a 0-1 scale against the threshold
+            threshold = bundle.autoencoder_metadata.get('reconstruction_threshold', 0.5)
+            autoencoder_scores[valid] = np.where(errors > 1.0, 1.0, np.minimum(errors / threshold, 1.0))
+
+    return xgboost_scores, autoencoder_scores, reconstruction_errors
+
+
+def _run_inference(features_array: np.ndarray, bundle: ModelBundle = None):
+    """
+    _score_features on the bundle's inference process pool when it has a running one,
+    in-process otherwise. Records the call in the bundle's per-version latency stats.
+    """
+    bundle = bundle or model_registry.current
+    pool = bundle.inference_pool
+    start = time.perf_counter()
+    if pool is not None and pool.running and features_array.shape[1] == pool.n_features:
+        outputs = pool.score(features_array)
+    else:
+        outputs = _score_features(features_array, bundle)
+    bundle.stats.record((time.perf_counter() - start) * 1000, features_array.shape[0])
+    return outputs
+
+
+WARMUP_BATCH_SIZES = (1, 16, 256)
+
+def _prepare_bundle(bundle: ModelBundle):
+    """
+    Readies a freshly loaded model version before it goes live: starts its inference
+    pool (INFERENCE_PROCESSES > 0) and runs synthetic batches through it, so the first
+    real request doesn't pay for lazy initialisation. Raises if the models can't score.
+    """
+    if settings.INFERENCE_PROCESSES > 0:
+        if bundle.autoencoder_model is not None and not isinstance(bundle.autoencoder_model, NumpyAutoencoder):
+            print("     ⚠️  Inference processes need AUTOENCODER_BACKEND=numpy (TensorFlow is not fork-safe); scoring in-process")
+        else:
+            # At startup (no other threads yet, XGBoost not run) the workers are forked and share this
+            # bundle's arrays copy-on-write; on a hot reload they come from a clean forkserver instead
+            bundle.inference_pool = InferencePool(
+                partial(_score_features, bundle=bundle),
+                processes=settings.INFERENCE_PROCESSES,
+                slots=settings.INFERENCE_POOL_SLOTS,
+                max_rows=settings.INFERENCE_POOL_SLOT_ROWS,
+                start_method="forkserver" if model_registry.started else "fork",
+            )
+            bundle.inference_pool.start()
+            print(f"     ⚡ Inference pool: {settings.INFERENCE_PROCESSES} processes, "
+                  f"{settings.INFERENCE_POOL_SLOTS} shared-memory slots x {settings.INFERENCE_POOL_SLOT_ROWS} rows")
+
+    rng = np.random.default_rng(0)
+    for n_rows in WARMUP_BATCH_SIZES:
+        features = rng.normal(size=(n_rows, 30))
+        if bundle.inference_pool is not None:
+            bundle.inference_pool.score(features)
+        else:
+            _score_features(features, bundle)
+
+def _retire_bundle(bundle: ModelBundle):
+    """Called after a hot-swap: stops the old version's pool once its in-flight requests are done."""
+    pool = bundle.inference_pool
+    if pool is not None:
+        timer = threading.Timer(settings.MODEL_RETIRE_GRACE_SECONDS, _stop_retired_pool, args=(pool,))
+        retiring_pools[pool] = timer
+        timer.start()
+
+def _stop_retired_pool(pool: InferencePool):
+    pool.stop()
+    retiring_pools.pop(pool, None)
+
+
+def _hybrid_score(xgboost_score: float, autoencoder_score: float, bundle: ModelBundle):
+    """Weighted ensemble of both model scores. Returns (hybrid_score, model_explanation)."""
+    if bundle.hybrid_mode_enabled:
+        # Weighted ensemble: 60% known patterns, 40% anomalies
+        return (0.6 * xgboost_score) + (0.4 * autoencoder_score), f"XGB:{xgboost_score:.2f}|AE:{autoencoder_score:.2f}"
+    elif bundle.ml_model is not None:
+        # XGBoost only
+        return xgboost_score, f"XGB:{xgboost_score:.2f}"
+    elif bundle.autoencoder_model is not None:
+        # Autoencoder only
+        return autoencoder_score, f"AE:{autoencoder_score:.2f}"
+    return 0.0, "NO_MODEL"
+
+
+def _fetch_thresholds(db: Session):
+    """Returns (decline_threshold, review_threshold) from the in-memory SystemConfig snapshot."""
+    snapshot = config_cache.get(db)
+    return snapshot.decline_threshold, snapshot.review_threshold
+
+
+def _decide(hybrid_score: float, model_explanation: str, decline_threshold: float, review_threshold: float):
+    """Maps a hybrid score onto (status, decision_reason)."""
+    if hybrid_score >= decline_threshold:
+        return "Decline", f"🚨 Critical Risk | {model_explanation}"
+    elif hybrid_score >= review_threshold:
+        return "Escalate", f"⚠️  Medium Risk | {model_explanation}"
+    return "Approve", f"✅ Low Risk | {model_explanation}"
+
+
+def _persist_transactions(db: Session, rows: List[dict], timer: StageTimer = None):
+    """
+    Saves scored transactions (Transaction column values) and triggers their notifications.
+
+    write_behind: rows go to the background group-commit writer and this returns at once;
+                  rows the full queue won't take are written synchronously below.
+    sync:         one commit for all rows, then notifications for rows that can raise one
+                  (queued for the notification workers, or sent inline when NOTIFICATION_ASYNC is off).
+    """
+    timer = timer or StageTimer(None)
+    with timer.stage("commit"):
+        if transaction_writer is not None:
+            rows = [row for row in rows if not transaction_writer.submit(row)]
+        if rows:
+            new_txns = [Transaction(**row) for row in rows]
+            db.add_all(new_txns)
+            db.flush()
+            ids = [new_txn.id for new_txn in new_txns]  # Read before commit() expires the instances
+            daily_stats.record(db, rows)  # Last statement before the commit: the day row stays locked briefly
+            db.commit()
+    if not rows:
+        return
+
+    if live_events.active:
+        with timer.stage("publish"):
+            live_events.publish_transactions(db, [{**row, "id": txn_id} for row, txn_id in zip(rows, ids)])
+
+    with timer.stage("notify"):
+        for new_txn, txn_id, row in zip(new_txns, ids, rows):
+            if not notification_service.is_actionable(row["status"], row["fraud_score"]):
+                continue
+            if not notification_dispatcher.dispatch(txn_id, row["merchant"], row["status"], row["fraud_score"]):
+                notification_service.check_and_notify(db, new_txn)
+
 
 # --- NEW AI ENDPOINT (HYBRID: XGBoost + Autoencoder) ---
-@app.post("/api/predict", response_model=TransactionResponse)
-def predict_fraud(txn: TransactionRequest, db: Session = Depends(get_db)):
+@app.post("/api/predict", response_model=TransactionResponse, openapi_extra=_request_body_doc(TransactionRequest))
+def predict_fraud(txn: TransactionRequest = Depends(read_transaction), db: Session = Depends(get_db)):
     """
     Hybrid Fraud Detection: XGBoost (Known Patterns) + Autoencoder (Anomalies)
     
@@ -411,15 +755,20 @@ def predict_fraud(txn: TransactionRequest, db: Session = Depends(get_db)):
     import time
     
     # Model availability check
-    if not ml_model and not autoencoder_model:
+    bundle = model_registry.current  # One model version for the whole request, even across a hot-swap
+    if not bundle.has_model:
         raise HTTPException(status_code=500, detail="No ML models loaded")
 
     try:
         start_time = time.time()
+        timer = StageTimer(PREDICT_STAGE_SECONDS)
         
         # ===== STEP 1: FREEZE CHECK =====
-        customer = db.query(Customer).filter(Customer.id == txn.metadata.customer_id).first()
+        with timer.stage("customer_lookup"):
+            customer = customer_state_cache.get(db, txn.metadata.customer_id)
         if customer and customer.is_frozen:
+            timer.finish()
+            PREDICTIONS_TOTAL.inc("Decline")
             return {
                 "fraud_score": 1.0,
                 "status": "Decline",
@@ -428,10 +777,12 @@ def predict_fraud(txn: TransactionRequest, db: Session = Depends(get_db)):
 
         # ===== STEP 1b: MERCHANT WHITELIST CHECK =====
         # Whitelisted merchants bypass AI entirely and are auto-approved
-        whitelist_entry = db.query(MerchantWhitelist).filter(
-            func.lower(MerchantWhitelist.merchant_name) == func.lower(txn.metadata.merchant)
-        ).first()
-        if whitelist_entry:
+        # (in-memory hash set lookup, no DB round-trip)
+        with timer.stage("whitelist_check"):
+            whitelisted = merchant_whitelist_index.contains(db, txn.metadata.merchant)
+        if whitelisted:
+            timer.finish()
+            PREDICTIONS_TOTAL.inc("Approve")
             return {
                 "fraud_score": 0.0,
                 "status": "Approve",
@@ -439,129 +790,53 @@ def predict_fraud(txn: TransactionRequest, db: Session = Depends(get_db)):
             }
 
         # ===== STEP 2: PREPARE FEATURES =====
-        features_array = np.array(txn.features).reshape(1, -1)
+        features_array = np.asarray(txn.features, dtype=np.float64).reshape(1, -1)
         
         # NOTE: Simulator now sends normalized features including normalized USD amount
         # No currency conversion needed here anymore
         # features_array[0][29] is already normalized (not LKR raw value)
 
-        # Initialize scores
-        xgboost_score = 0.0
-        autoencoder_score = 0.0
-        reconstruction_error = 0.0
-
-        # ===== STEP 3: PATH 1 - XGBoost (Supervised Learning) =====
-        if ml_model is not None:
-            try:
-                xgboost_score = float(ml_model.predict_proba(features_array)[0][1])
-            except Exception as e:
-                print(f"⚠️  XGBoost prediction failed: {e}")
-                xgboost_score = 0.0
-        
-        # ===== STEP 4: PATH 2 - Autoencoder (Unsupervised Learning) =====
-        if autoencoder_model is not None and autoencoder_scaler is not None:
-            try:
-                # Normalize features using the scaler
-                # IMPORTANT: Create a copy to avoid modifying original features_array
-                features_to_scale = features_array.copy()
-                features_scaled = autoencoder_scaler.transform(features_to_scale)
-                
-                # Validate scaled features are in expected range
-                # After StandardScaler, should be roughly [-3, 3] for normal transactions
-                scaled_mean = np.mean(features_scaled)
-                scaled_std = np.std(features_scaled)
-                scaled_max = np.max(np.abs(features_scaled))
-                
-                # If scaled features look very abnormal, skip Autoencoder
-                if scaled_max > 100:  # Way outside expected range
-                    # Features are broken somehow
-                    reconstruction_error = 999.0  # Indicate error
-                    autoencoder_score = 1.0  # Maximum anomaly
-                else:
-                    # Get reconstruction from autoencoder
-                    reconstruction = autoencoder_model.predict(features_scaled, verbose=0)
-                    
-                    # Calculate Mean Squared Error (reconstruction error)
-                    # For normalized features, MSE should typically be 0.01-0.10
-                    reconstruction_error_raw = np.mean(np.power(features_scaled - reconstruction, 2))
-                    reconstruction_error = float(reconstruction_error_raw)
-                    
-                    # Validate reconstruction error (should be reasonable for normalized features)
-                    # If error is abnormally high (>1.0), something went wrong
-                    if reconstruction_error > 1.0:
-                        # Use max threshold as fallback - likely an anomaly or data issue
-                        autoencoder_score = 1.0
-                    else:
-                        # Normalize reconstruction error to 0-1 scale
-                        threshold = autoencoder_metadata.get('reconstruction_threshold', 0.5)
-                        autoencoder_score = min(reconstruction_error / threshold, 1.0)
-                
-            except Exception as e:
-                print(f"⚠️  Autoencoder prediction failed: {e}")
-                autoencoder_score = 0.0
+        # ===== STEP 3-4: XGBoost + Autoencoder =====
+        # (split per model in fraud_model_stage_seconds)
+        with timer.stage("inference"):
+            if micro_batcher is not None and micro_batcher.running:
+                # Shares one vectorized model pass with other in-flight requests
+                xgboost_score, autoencoder_score, reconstruction_error = micro_batcher.submit(features_array[0], timeout=10, context=bundle)
+            else:
+                xgboost_scores, autoencoder_scores, reconstruction_errors = _run_inference(features_array, bundle)
+                xgboost_score = float(xgboost_scores[0])
+                autoencoder_score = float(autoencoder_scores[0])
+                reconstruction_error = float(reconstruction_errors[0])
 
         # ===== STEP 5: HYBRID SCORE CALCULATION =====
-        if hybrid_mode_enabled and ml_model is not None and autoencoder_model is not None:
-            # Weighted ensemble: 60% known patterns, 40% anomalies
-            hybrid_score = (0.6 * xgboost_score) + (0.4 * autoencoder_score)
-            model_explanation = f"XGB:{xgboost_score:.2f}|AE:{autoencoder_score:.2f}"
-        elif ml_model is not None:
-            # XGBoost only
-            hybrid_score = xgboost_score
-            model_explanation = f"XGB:{xgboost_score:.2f}"
-        elif autoencoder_model is not None:
-            # Autoencoder only
-            hybrid_score = autoencoder_score
-            model_explanation = f"AE:{autoencoder_score:.2f}"
-        else:
-            hybrid_score = 0.0
-            model_explanation = "NO_MODEL"
+        hybrid_score, model_explanation = _hybrid_score(xgboost_score, autoencoder_score, bundle)
 
         # ===== STEP 6: FETCH THRESHOLDS =====
-        decline_threshold = 0.70
-        review_threshold = 0.50
-        
-        config_decline = db.query(SystemConfig).filter(SystemConfig.key == "fraud_threshold_decline").first()
-        if config_decline:
-            decline_threshold = float(config_decline.value)
-
-        config_review = db.query(SystemConfig).filter(SystemConfig.key == "fraud_threshold_review").first()
-        if config_review:
-            review_threshold = float(config_review.value)
+        with timer.stage("threshold_fetch"):
+            decline_threshold, review_threshold = _fetch_thresholds(db)
 
         # ===== STEP 7: DECISION LOGIC =====
-        if hybrid_score >= decline_threshold:
-            status = "Decline"
-            decision_reason = f"🚨 Critical Risk | {model_explanation}"
-        elif hybrid_score >= review_threshold:
-            status = "Escalate"
-            decision_reason = f"⚠️  Medium Risk | {model_explanation}"
-        else:
-            status = "Approve"
-            decision_reason = f"✅ Low Risk | {model_explanation}"
+        status, decision_reason = _decide(hybrid_score, model_explanation, decline_threshold, review_threshold)
 
-        # ===== STEP 8: SAVE TO DATABASE =====
         end_time = time.time()
         processing_time_ms = (end_time - start_time) * 1000
         
-        new_txn = Transaction(
-            customer_id=txn.metadata.customer_id,
-            merchant=txn.metadata.merchant,
-            amount=txn.metadata.amount,
-            fraud_score=round(hybrid_score, 4),
-            xgboost_score=round(xgboost_score, 4),
-            autoencoder_score=round(autoencoder_score, 4),
-            reconstruction_error=round(reconstruction_error, 6),
-            status=status,
-            processing_time_ms=processing_time_ms
-        )
-        db.add(new_txn)
-        db.commit()
-        db.refresh(new_txn)
-        
-        # ===== STEP 9: TRIGGER NOTIFICATIONS =====
-        notification_service.check_and_notify(db, new_txn)
+        # ===== STEP 8-9: SAVE TO DATABASE + TRIGGER NOTIFICATIONS =====
+        _persist_transactions(db, [{
+            "customer_id": txn.metadata.customer_id,
+            "merchant": txn.metadata.merchant,
+            "amount": txn.metadata.amount,
+            "timestamp": datetime.now(),
+            "fraud_score": round(hybrid_score, 4),
+            "xgboost_score": round(xgboost_score, 4),
+            "autoencoder_score": round(autoencoder_score, 4),
+            "reconstruction_error": round(reconstruction_error, 6),
+            "status": status,
+            "processing_time_ms": processing_time_ms,
+        }], timer)
 
+        timer.finish()
+        PREDICTIONS_TOTAL.inc(status)
         return {
             "fraud_score": round(hybrid_score, 4),
             "status": status,
@@ -571,27 +846,239 @@ def predict_fraud(txn: TransactionRequest, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Prediction Error: {str(e)}")
 
+# --- BATCH AI ENDPOINT (settlement batches) ---
+@app.post("/api/predict/batch", response_model=List[TransactionResponse], openapi_extra=_request_body_doc(BatchTransactionRequest))
+def predict_fraud_batch(batch: BatchTransactionRequest = Depends(read_transaction_batch), db: Session = Depends(get_db)):
+    """
+    Vectorized variant of /api/predict for settlement batches.
+
+    Same decision rules as the single endpoint, but:
+    - frozen customers come from the customer-state cache (misses in one bulk query),
+      whitelisted merchants from the in-memory whitelist index
+    - XGBoost + Autoencoder run once over the whole N x 30 matrix
+    - thresholds are fetched once, and all Transaction rows are saved in one commit
+    Results are returned in input order.
+    """
+    import time
+
+    bundle = model_registry.current  # One model version for the whole request, even across a hot-swap
+    if not bundle.has_model:
+        raise HTTPException(status_code=500, detail="No ML models loaded")
+
+    txns = batch.transactions
+    if len(txns) > settings.PREDICT_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(txns)} transactions (max {settings.PREDICT_BATCH_MAX_SIZE})",
+        )
+    if not txns:
+        return []
+
+    try:
+        return _score_transactions(db, batch, bundle)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Prediction Error: {str(e)}")
+
+def _score_transactions(db: Session, batch: BatchTransactionRequest, bundle: ModelBundle) -> List[dict]:
+    """
+    Batch scoring pipeline shared by /api/predict/batch and /api/predict/stream.
+    Returns one decision dict per transaction, in input order.
+    """
+    txns = batch.transactions
+    start_time = time.time()
+    results = [None] * len(txns)
+
+    # ===== STEP 1: FREEZE CHECK (cached; misses fetched in one bulk query) =====
+    customer_states = customer_state_cache.get_many(db, (t.metadata.customer_id for t in txns))
+    frozen_ids = {cid for cid, state in customer_states.items() if state.is_frozen}
+
+    # ===== STEP 1b: MERCHANT WHITELIST CHECK (in-memory index) =====
+    whitelisted = merchant_whitelist_index.names(db)
+
+    to_score = []
+    for i, t in enumerate(txns):
+        if t.metadata.customer_id in frozen_ids:
+            results[i] = {"fraud_score": 1.0, "status": "Decline", "decision_reason": "❌ Customer Card is FROZEN"}
+        elif normalize_merchant_name(t.metadata.merchant) in whitelisted:
+            results[i] = {"fraud_score": 0.0, "status": "Approve", "decision_reason": "✅ Trusted Merchant — Whitelist Bypass"}
+        else:
+            to_score.append(i)
+
+    if not to_score:
+        return results
+
+    # ===== STEP 2: PREPARE FEATURE MATRIX =====
+    features_array = batch.feature_matrix(to_score)
+    if features_array.ndim != 2:
+        raise ValueError("All transactions in a batch must have the same number of features")
+
+    # ===== STEP 3-4: ONE PASS THROUGH XGBoost + Autoencoder =====
+    xgboost_scores, autoencoder_scores, reconstruction_errors = _run_inference(features_array, bundle)
+
+    # ===== STEP 6: FETCH THRESHOLDS (once per batch) =====
+    decline_threshold, review_threshold = _fetch_thresholds(db)
+
+    # Model time is shared evenly across the scored transactions
+    processing_time_ms = (time.time() - start_time) * 1000 / len(to_score)
+
+    # ===== STEP 5 + 7: HYBRID SCORE + DECISION =====
+    scored_at = datetime.now()
+    new_txns = []
+    for row, i in enumerate(to_score):
+        t = txns[i]
+        xgboost_score = float(xgboost_scores[row])
+        autoencoder_score = float(autoencoder_scores[row])
+        hybrid_score, model_explanation = _hybrid_score(xgboost_score, autoencoder_score, bundle)
+        status, decision_reason = _decide(hybrid_score, model_explanation, decline_threshold, review_threshold)
+
+        new_txns.append({
+            "customer_id": t.metadata.customer_id,
+            "merchant": t.metadata.merchant,
+            "amount": t.metadata.amount,
+            "timestamp": scored_at,
+            "fraud_score": round(hybrid_score, 4),
+            "xgboost_score": round(xgboost_score, 4),
+            "autoencoder_score": round(autoencoder_score, 4),
+            "reconstruction_error": round(float(reconstruction_errors[row]), 6),
+            "status": status,
+            "processing_time_ms": processing_time_ms,
+        })
+        results[i] = {
+            "fraud_score": round(hybrid_score, 4),
+            "status": status,
+            "decision_reason": decision_reason
+        }
+
+    # ===== STEP 8-9: SAVE TO DATABASE (single commit) + NOTIFICATIONS =====
+    _persist_transactions(db, new_txns)
+
+    return results
+
+# --- STREAMING BULK SCORING (NDJSON in, NDJSON out) ---
+class StreamLineTooLong(ValueError):
+    pass
+
+async def _ndjson_lines(chunks, max_line_bytes: int):
+    """Splits an async byte stream into (line number, line) pairs without buffering more than one line."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+        if len(buffer) > max_line_bytes:
+            raise StreamLineTooLong(f"Line {line_no + 1} is longer than {max_line_bytes} bytes")
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+def _score_stream_chunk(db: Session, lines: list, bundle: ModelBundle, counts: dict) -> bytes:
+    """Validates and scores one chunk of NDJSON lines; returns the NDJSON decision lines (input order)."""
+    outputs = {}
+    valid_lines, txns = [], []
+    for line_no, line in lines:
+        # Includes the feature count: a short row fails here, not in the chunk's model pass
+        try:
+            txns.append(TransactionRequest.model_validate_json(line))
+            valid_lines.append(line_no)
+        except ValidationError as e:
+            outputs[line_no] = {"line": line_no, "error": "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'body'}: {error['msg']}" for error in e.errors(include_url=False)
+            )}
+
+    if txns:
+        try:
+            results = _score_transactions(db, BatchTransactionRequest.model_construct(transactions=txns), bundle)
+            for line_no, result in zip(valid_lines, results):
+                outputs[line_no] = {"line": line_no, **result}
+            counts["scored"] += len(txns)
+        except Exception as e:
+            db.rollback()
+            for line_no in valid_lines:
+                outputs[line_no] = {"line": line_no, "error": f"Prediction Error: {str(e)}"}
+
+    counts["lines"] += len(lines)
+    counts["errors"] += sum(1 for output in outputs.values() if "error" in output)
+    return b"".join(dumps(outputs[line_no]) + b"\n" for line_no, _ in lines)
+
+async def _stream_decisions(request: Request, bundle: ModelBundle):
+    counts = {"lines": 0, "scored": 0, "errors": 0}
+    chunk_size = max(settings.PREDICT_STREAM_CHUNK_SIZE, 1)
+    db = SessionLocal()  # Own session: the response outlives the endpoint call
+    try:
+        pending = []
+        try:
+            async for line in _ndjson_lines(request.stream(), settings.PREDICT_STREAM_MAX_LINE_BYTES):
+                pending.append(line)
+                if len(pending) >= chunk_size:
+                    yield await run_in_threadpool(_score_stream_chunk, db, pending, bundle, counts)
+                    pending = []
+            if pending:
+                yield await run_in_threadpool(_score_stream_chunk, db, pending, bundle, counts)
+            counts["complete"] = True
+        except StreamLineTooLong as e:
+            counts["complete"] = False
+            yield dumps({"error": str(e)}) + b"\n"
+        yield dumps({"summary": counts}) + b"\n"
+    finally:
+        db.close()
+
+@app.post("/api/predict/stream")
+async def predict_fraud_stream(request: Request):
+    """
+    Bulk scoring for transaction files of any size.
+
+    The body is NDJSON: one /api/predict request object per line. It is read
+    incrementally, and every PREDICT_STREAM_CHUNK_SIZE lines go through the
+    batch pipeline (one vectorized model pass, one commit). Decisions stream
+    back as NDJSON while the upload is still being read, one line per non-empty input line:
+        {"line": 1, "fraud_score": 0.12, "status": "Approve", "decision_reason": "..."}
+        {"line": 2, "error": "metadata.customer_id: Field required"}
+        {"line": 3, "error": "features: List should have at least 30 items after validation, not 5"}
+    followed by a final {"summary": {"lines", "scored", "errors", "complete"}}.
+    Lines are validated one by one (feature count included) before a chunk is
+    scored, so a bad line never costs the rest of its chunk their decisions.
+    Memory stays at one chunk regardless of the upload size.
+    """
+    bundle = model_registry.current  # One model version for the whole stream
+    if not bundle.has_model:
+        raise HTTPException(status_code=500, detail="No ML models loaded")
+    return DuplexStreamingResponse(_stream_decisions(request, bundle), media_type="application/x-ndjson")
+
+# Live feed rows: only the columns the feed shows (plain tuples, no ORM objects)
+RECENT_TRANSACTION_COLUMNS = {
+    "id": Transaction.id,
+    "customer_id": Transaction.customer_id,
+    "merchant": Transaction.merchant,
+    "amount": Transaction.amount,
+    "timestamp": Transaction.timestamp,
+    "fraud_score": Transaction.fraud_score,
+    "status": Transaction.status,
+    "customer_name": Customer.full_name,
+    "card_type": Customer.card_type,
+    "card_last_four": Customer.card_last_four,
+}
+
+def _recent_transaction_rows(rows) -> List[dict]:
+    """Shapes projected RECENT_TRANSACTION_COLUMNS rows for the live feed."""
+    keys = tuple(RECENT_TRANSACTION_COLUMNS)
+    return [dict(zip(keys, row)) for row in rows]
+
+def _format_recent_transactions(rows):
+    return FastJSONResponse(_recent_transaction_rows(rows))
+
+def _query_recent_transactions(db: Session, limit: int):
+    # Join Transaction with Customer to get name and card details
+    return db.query(*RECENT_TRANSACTION_COLUMNS.values()).join(Customer, Transaction.customer_id == Customer.id).order_by(Transaction.timestamp.desc()).limit(limit).all()
+
 @app.get("/api/transactions/recent")
 def get_recent_transactions(limit: int = 10, db: Session = Depends(get_db)):
-    # Join Transaction with Customer to get name and card details
-    results = db.query(Transaction, Customer).join(Customer, Transaction.customer_id == Customer.id).order_by(Transaction.timestamp.desc()).limit(limit).all()
+    results = _query_recent_transactions(db, limit)
     
     # Format the response
-    formatted_transactions = []
-    for txn, cust in results:
-        formatted_transactions.append({
-            "id": txn.id,
-            "customer_id": txn.customer_id,
-            "merchant": txn.merchant,
-            "amount": txn.amount,
-            "timestamp": txn.timestamp,
-            "fraud_score": txn.fraud_score,
-            "status": txn.status,
-            "customer_name": cust.full_name,
-            "card_type": cust.card_type,
-            "card_last_four": cust.card_last_four
-        })
-    return formatted_transactions
+    return _format_recent_transactions(results)
 
 @app.get("/api/transactions")
 def get_transactions(
@@ -602,7 +1089,11 @@ def get_transactions(
     date_filter: str = "all", # "today" or "all"
     db: Session = Depends(get_db)
 ):
-    query = db.query(Transaction).outerjoin(Customer)
+    # Projected columns: one joined query, no per-row Customer lazy loads
+    query = db.query(
+        Transaction.id, Customer.id, Customer.full_name, Customer.card_last_four, Customer.card_type,
+        Transaction.timestamp, Transaction.amount, Transaction.merchant, Transaction.fraud_score, Transaction.status,
+    ).outerjoin(Customer, Transaction.customer_id == Customer.id)
 
     # 1. Search Logic
     if search:
@@ -633,19 +1124,20 @@ def get_transactions(
 
     # Format response
     formatted = []
-    for txn in results:
+    for txn_id, customer_id, name, last_four, card_type, timestamp, amount, merchant, fraud_score, status in results:
+        missing = customer_id is None  # Outer join found no customer row
         formatted.append({
-            "id": txn.id,
-            "customer_name": txn.customer.full_name if txn.customer else "Unknown",
-            "card_last_four": txn.customer.card_last_four if txn.customer else "????",
-            "card_type": txn.customer.card_type if txn.customer else "",
-            "timestamp": txn.timestamp,
-            "amount": txn.amount,
-            "merchant": txn.merchant,
-            "fraud_score": txn.fraud_score,
-            "status": txn.status
+            "id": txn_id,
+            "customer_name": "Unknown" if missing else name,
+            "card_last_four": "????" if missing else last_four,
+            "card_type": "" if missing else card_type,
+            "timestamp": timestamp,
+            "amount": amount,
+            "merchant": merchant,
+            "fraud_score": fraud_score,
+            "status": status
         })
-    return formatted
+    return FastJSONResponse(formatted)
 
 @app.post("/api/transactions/{id}/decide")
 def decide_transaction(id: int, decision: str, db: Session = Depends(get_db)):
@@ -653,6 +1145,7 @@ def decide_transaction(id: int, decision: str, db: Session = Depends(get_db)):
     txn = db.query(Transaction).get(id)
     
     if txn:
+        old_status = txn.status
         # Map "Decline" to specific status if needed, but usually just update status
         # If user says "Decline" -> "Decline" (Red)
         # If "Approve" -> "Approve" (Green)
@@ -662,39 +1155,214 @@ def decide_transaction(id: int, decision: str, db: Session = Depends(get_db)):
             txn.status = "Decline"
         # We could also use the raw string if flexible
         
+        if txn.timestamp is not None:
+            daily_stats.record_status_change(db, txn.timestamp.date(), old_status, txn.status)
         db.commit()
+        if txn.timestamp is not None:
+            live_events.publish_status_change(txn.timestamp, old_status, txn.status)
         return {"status": "success", "new_status": txn.status}
     raise HTTPException(status_code=404, detail="Transaction not found")
 
-@app.get("/api/dashboard/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Returns the 4 big numbers for 'Today'"""
-    
-    # 1. Define 'Today' (Start of the day)
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    # 2. Query Transactions from Today
-    today_query = db.query(Transaction).filter(Transaction.timestamp >= today_start)
-    
-    # 3. Calculate Counts
-    total_txns = today_query.count()
-    fraud_count = today_query.filter(Transaction.status == "Decline").count() # Using "Decline" as "Fraud/Red" in our system
-    review_count = today_query.filter(Transaction.status == "Escalate").count()
-    
-    # 4. Calculate Average Response Time 
-    from sqlalchemy.sql import func
-    avg_latency = db.query(func.avg(Transaction.processing_time_ms)).filter(Transaction.timestamp >= today_start).scalar()
-    
-    # Handle None if no transactions today
-    avg_latency = int(avg_latency) if avg_latency is not None else 0
-    
+def _dashboard_stats(row: Optional[DailyTransactionStats]) -> dict:
+    if row is None:  # No transactions today yet
+        return {"total_transactions": 0, "fraud_detected": 0, "under_review": 0, "avg_response_ms": 0}
     return {
-        "total_transactions": total_txns,
-        "fraud_detected": fraud_count,
-        "under_review": review_count,
-        "avg_response_ms": avg_latency
+        "total_transactions": row.total,
+        "fraud_detected": row.declined,  # Using "Decline" as "Fraud/Red" in our system
+        "under_review": row.escalated,
+        "avg_response_ms": int(row.latency_sum_ms / row.latency_count) if row.latency_count else 0
     }
 
+@app.get("/api/dashboard/stats")
+def get_dashboard_stats(db: Session = Depends(get_db)):
+    """
+    Returns the 4 big numbers for 'Today'.
+    One primary-key read of today's daily_transaction_stats row (kept current by
+    the scoring path and manual decisions), whatever today's transaction volume.
+    """
+    return _dashboard_stats(daily_stats.get(db, date.today()))
+
+# --- LIVE DASHBOARD FEED (server-sent events) ---
+def _sse(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+def _live_snapshot() -> dict:
+    """What the dashboard would otherwise poll: recent feed, today's stats, unread alert count."""
+    db = SessionLocal()
+    try:
+        today = daily_stats.get(db, date.today())
+        return {
+            "day": date.today().isoformat(),
+            "transactions": _recent_transaction_rows(_query_recent_transactions(db, settings.LIVE_EVENTS_FEED_SIZE)),
+            # Raw latency counters too, so the client can apply stats deltas to avg_response_ms exactly
+            "stats": {
+                **_dashboard_stats(today),
+                "latency_sum_ms": today.latency_sum_ms if today else 0,
+                "latency_count": today.latency_count if today else 0,
+            },
+            "unread_count": db.query(func.count(Notification.id)).filter(Notification.is_read == False).scalar(),
+        }
+    finally:
+        db.close()
+
+async def _live_event_stream():
+    subscriber = live_events.subscribe()
+    interval_s = max(settings.LIVE_EVENTS_INTERVAL_MS, 0.0) / 1000.0
+    heartbeat_s = max(settings.LIVE_EVENTS_HEARTBEAT_SECONDS, 1.0)
+    # The stream ends after LIVE_EVENTS_RESYNC_SECONDS and EventSource reconnects to a fresh
+    # snapshot; this also bounds how long a server shutdown waits for open streams
+    close_at = time.monotonic() + max(settings.LIVE_EVENTS_RESYNC_SECONDS, 1.0)
+    try:
+        yield b"retry: 1000\n\n"
+        # Subscribed before the snapshot query, so nothing committed from here on is lost: what was
+        # queued meanwhile goes out right after the snapshot. A row committed while the query runs may
+        # be in both (the feed dedupes by id; stats are corrected by the next resync)
+        snapshot = await run_in_threadpool(_live_snapshot)
+        yield _sse("snapshot", snapshot)
+
+        while time.monotonic() < close_at:
+            if not await subscriber.wait(min(heartbeat_s, max(close_at - time.monotonic(), 0.0))):
+                yield b": keep-alive\n\n"
+                continue
+
+            pending = live_events.drain(subscriber)
+            if pending:
+                if pending["transactions"]:
+                    yield _sse("transactions", pending["transactions"])
+                for delta in pending["stats"]:
+                    yield _sse("stats", delta)
+                if pending["notifications"]["read"] or pending["notifications"]["new"]:
+                    yield _sse("notifications", pending["notifications"])
+            # Events arriving meanwhile are merged into the next push
+            await asyncio.sleep(interval_s)
+    finally:
+        live_events.unsubscribe(subscriber)
+
+@app.get("/api/events")
+async def live_dashboard_events():
+    """
+    Server-sent events for the dashboard and the notification bell (replaces polling).
+
+    event: snapshot       {"day", "transactions": [...], "stats": {...}, "unread_count"} on connect;
+                          stats is /api/dashboard/stats plus "latency_sum_ms" and "latency_count".
+                          The stream closes after LIVE_EVENTS_RESYNC_SECONDS and the browser reconnects
+    event: transactions   newly scored transactions, newest first (same rows as /api/transactions/recent)
+    event: stats          {"day", "total_transactions", "fraud_detected", "under_review", "processing_ms_sum",
+                          "latency_count"} increments to that day's snapshot stats; the average is
+                          latency_sum_ms / latency_count, as on the server
+    event: notifications  {"read": bool, "new": n} — unread count is (read ? 0 : count) + new
+
+    A client gets at most one push per LIVE_EVENTS_INTERVAL_MS; a slow one just
+    receives bigger merged updates (only the newest LIVE_EVENTS_FEED_SIZE transactions).
+    """
+    return StreamingResponse(
+        _live_event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# --- ASYNC VARIANTS OF THE HOT ENDPOINTS (/api/async/*) ---
+# Same contracts as /api/predict, /api/transactions/recent and /api/dashboard/stats,
+# but as coroutines on the async engine (asyncpg / aiosqlite): a waiting request
+# holds no threadpool thread, so one worker can keep thousands in flight.
+# Model inference runs on the dedicated `inference_executor` so it never blocks the event loop.
+
+def _scoring_context(db: Session, customer_id: int, merchant: str):
+    """Cache-backed pre-scoring lookups. Returns (customer_state, whitelisted, (decline, review))."""
+    customer = customer_state_cache.get(db, customer_id)
+    whitelisted = merchant_whitelist_index.contains(db, merchant)
+    return customer, whitelisted, _fetch_thresholds(db)
+
+@app.post("/api/async/predict", response_model=TransactionResponse, openapi_extra=_request_body_doc(TransactionRequest))
+async def predict_fraud_async(txn: TransactionRequest = Depends(read_transaction), db: AsyncSession = Depends(get_async_db)):
+    """Async variant of /api/predict (same decision flow and response)."""
+    bundle = model_registry.current  # One model version for the whole request, even across a hot-swap
+    if not bundle.has_model:
+        raise HTTPException(status_code=500, detail="No ML models loaded")
+
+    try:
+        start_time = time.time()
+
+        # ===== STEP 1, 1b, 6: FREEZE + WHITELIST CHECKS, THRESHOLDS =====
+        # The caches are sync code: run_sync drives them on this connection without blocking the loop
+        customer, whitelisted, (decline_threshold, review_threshold) = await db.run_sync(
+            _scoring_context, txn.metadata.customer_id, txn.metadata.merchant
+        )
+        if customer and customer.is_frozen:
+            return {
+                "fraud_score": 1.0,
+                "status": "Decline",
+                "decision_reason": "❌ Customer Card is FROZEN"
+            }
+        if whitelisted:
+            return {
+                "fraud_score": 0.0,
+                "status": "Approve",
+                "decision_reason": f"✅ Trusted Merchant — Whitelist Bypass",
+            }
+
+        # ===== STEP 2: PREPARE FEATURES =====
+        features_array = np.asarray(txn.features, dtype=np.float64).reshape(1, -1)
+
+        # ===== STEP 3-4: XGBoost + Autoencoder (off the event loop) =====
+        if micro_batcher is not None and micro_batcher.running:
+            xgboost_score, autoencoder_score, reconstruction_error = await asyncio.wait_for(
+                asyncio.wrap_future(micro_batcher.submit_future(features_array[0], bundle)), timeout=10
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            xgboost_scores, autoencoder_scores, reconstruction_errors = await loop.run_in_executor(
+                inference_executor, _run_inference, features_array, bundle
+            )
+            xgboost_score = float(xgboost_scores[0])
+            autoencoder_score = float(autoencoder_scores[0])
+            reconstruction_error = float(reconstruction_errors[0])
+
+        # ===== STEP 5 + 7: HYBRID SCORE + DECISION =====
+        hybrid_score, model_explanation = _hybrid_score(xgboost_score, autoencoder_score, bundle)
+        status, decision_reason = _decide(hybrid_score, model_explanation, decline_threshold, review_threshold)
+
+        processing_time_ms = (time.time() - start_time) * 1000
+
+        # ===== STEP 8-9: SAVE TO DATABASE + TRIGGER NOTIFICATIONS =====
+        # Only blocks the loop on backpressure fallbacks (writer / notification queue full)
+        await db.run_sync(_persist_transactions, [{
+            "customer_id": txn.metadata.customer_id,
+            "merchant": txn.metadata.merchant,
+            "amount": txn.metadata.amount,
+            "timestamp": datetime.now(),
+            "fraud_score": round(hybrid_score, 4),
+            "xgboost_score": round(xgboost_score, 4),
+            "autoencoder_score": round(autoencoder_score, 4),
+            "reconstruction_error": round(reconstruction_error, 6),
+            "status": status,
+            "processing_time_ms": processing_time_ms,
+        }])
+
+        return {
+            "fraud_score": round(hybrid_score, 4),
+            "status": status,
+            "decision_reason": decision_reason
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Prediction Error: {str(e)}")
+
+@app.get("/api/async/transactions/recent")
+async def get_recent_transactions_async(limit: int = 10, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(*RECENT_TRANSACTION_COLUMNS.values())
+        .join(Customer, Transaction.customer_id == Customer.id)
+        .order_by(Transaction.timestamp.desc())
+        .limit(limit)
+    )
+    return _format_recent_transactions(result.all())
+
+@app.get("/api/async/dashboard/stats")
+async def get_dashboard_stats_async(db: AsyncSession = Depends(get_async_db)):
+    """Async variant of /api/dashboard/stats (same daily rollup row)."""
+    return _dashboard_stats(await db.get(DailyTransactionStats, date.today()))
+
 @app.get("/api/dashboard/risky-merchants")
 def get_risky_merchants(db: Session = Depends(get_db)):
     """
@@ -730,45 +1398,49 @@ def get_risky_merchants(db: Session = Depends(get_db)):
     risky_list.sort(key=lambda x: x["risk"], reverse=True)
     return risky_list[:5]
 
+TREND_COLUMNS = (DailyTransactionStats.day, DailyTransactionStats.declined,
+                 DailyTransactionStats.approved, DailyTransactionStats.escalated)
+
 @app.get("/api/dashboard/trends")
-def get_fraud_trends(db: Session = Depends(get_db)):
-    """Returns data for the Last 7 Days Graph"""
-    
-    # 1. Calculate the last 7 days range
+def get_fraud_trends(days: int = 7, db: Session = Depends(get_db)):
+    """
+    Returns data for the trend graph: per-day fraud / approved / review counts
+    for the last `days` days, today included (7 by default; 30 or 90 for longer views).
+
+    One range read of the daily_transaction_stats rollup: finished days are
+    already aggregated and today's row is kept current by the scoring path,
+    so the cost depends on `days`, not on the transaction volume.
+    """
+    if not 1 <= days <= settings.DASHBOARD_TRENDS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {settings.DASHBOARD_TRENDS_MAX_DAYS}")
+
+    # 1. Calculate the date range
     end_date = date.today()
-    start_date = end_date - timedelta(days=6)
-    
-    results = []
+    start_date = end_date - timedelta(days=days - 1)
     
-    # 2. Loop through each day (Mon, Tue, Wed...)
-    current_date = start_date
-    while current_date <= end_date:
-        # Define the 24-hour window for this specific day
-        day_start = datetime.combine(current_date, datetime.min.time())
-        day_end = datetime.combine(current_date, datetime.max.time())
-        
-        # Get counts for this day
-        daily_txns = db.query(Transaction).filter(
-            Transaction.timestamp >= day_start,
-            Transaction.timestamp <= day_end
+    # 2. One query for the whole range (days without transactions have no row)
+    counts = {
+        day: (fraud, approved, review)
+        for day, fraud, approved, review in db.query(*TREND_COLUMNS).filter(
+            DailyTransactionStats.day >= start_date,
+            DailyTransactionStats.day <= end_date,
         )
-        
-        fraud = daily_txns.filter(Transaction.status == "Decline").count()
-        approved = daily_txns.filter(Transaction.status == "Approve").count()
-        review = daily_txns.filter(Transaction.status == "Escalate").count()
-        
-        # Format day name (e.g., "Mon", "Tue")
-        day_name = current_date.strftime("%a")
-        
+    }
+
+    # 3. One point per day, oldest first ("Mon", "Tue"... for a week, "Apr 04" beyond)
+    label_format = "%a" if days <= 7 else "%b %d"
+    results = []
+    for offset in range(days):
+        current_date = start_date + timedelta(days=offset)
+        fraud, approved, review = counts.get(current_date, (0, 0, 0))
         results.append({
-            "name": day_name,
+            "name": current_date.strftime(label_format),
+            "date": current_date.isoformat(),
             "fraud": fraud,
             "approved": approved,
             "review": review
         })
         
-        current_date += timedelta(days=1)
-        
     return results
 
 class NewsletterSubscribeRequest(BaseModel):
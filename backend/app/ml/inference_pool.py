@@ -0,0 +1,292 @@
+import itertools
+import multiprocessing as mp
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+def _worker_loop(score_fn, request_name, response_name, shape_in, shape_out, tasks, results, index, busy, busy_since):
+    """
+    Inference process: score the rows a slot points at, write the outputs back in place.
+    busy[index] holds the sequence number of the task in hand (-1 when idle), so the
+    pool can tell which request a crashed or stuck worker was holding.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the API process
+    request_shm = shared_memory.SharedMemory(name=request_name)
+    response_shm = shared_memory.SharedMemory(name=response_name)
+    requests = np.ndarray(shape_in, dtype=np.float64, buffer=request_shm.buf)
+    responses = np.ndarray(shape_out, dtype=np.float64, buffer=response_shm.buf)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, n_rows, seq = task
+            busy_since[index] = time.monotonic()  # CLOCK_MONOTONIC: comparable across processes
+            busy[index] = seq
+            try:
+                outputs = score_fn(requests[slot, :n_rows])
+                for column, values in enumerate(outputs):
+                    responses[slot, :n_rows, column] = values
+                results.put((slot, seq, None))
+            except Exception as e:
+                results.put((slot, seq, f"{type(e).__name__}: {e}"))
+            busy[index] = -1
+    finally:
+        del requests, responses
+        request_shm.close()
+        response_shm.close()
+
+
+class InferencePool:
+    """
+    Pool of inference processes fed through a shared-memory ring of slots.
+
+    start_method "fork" (default) forks the workers straight from the calling
+    process, so model arrays are shared copy-on-write instead of loaded per
+    process. That is only safe while the caller is still single-threaded and
+    XGBoost has not run in it yet, i.e. at startup, with the models loaded before
+    start(). Pools started later (a hot reload, with request, writer and
+    dispatcher threads running) must use "forkserver" or "spawn": the workers then
+    come from a clean process and `score_fn` (with its models) is pickled to each
+    of them. Each slot is a fixed `max_rows` x `n_features` region in one shared
+    request block plus a matching region in the response block. Callers copy
+    rows into a free slot and send only (slot, n_rows) to the workers; the
+    outputs are read back from the response block. Slots are handed out in
+    FIFO order, so they are reused as a ring. Larger matrices are split across
+    several slots and scored in parallel.
+
+    With "fork", use fork-safe backends only (NumPy autoencoder, not TensorFlow).
+
+    A monitor thread checks the workers every `monitor_interval_s`. A dead worker
+    is replaced, and the request it was scoring fails at once instead of waiting
+    out its timeout (or, if the caller already gave up, its slot goes back to the
+    ring). A worker still busy `stuck_timeout_s` after starting a task its caller
+    gave up on is terminated and handled the same way, so neither crashes nor
+    hangs slowly use up the slots.
+    """
+
+    def __init__(self, score_fn: Callable, processes: int = 2, slots: int = 32, max_rows: int = 256,
+                 n_features: int = 30, n_outputs: int = 3, start_method: str = "fork",
+                 stuck_timeout_s: float = 30.0, monitor_interval_s: float = 0.5):
+        self.score_fn = score_fn
+        self.start_method = start_method
+        self.stuck_timeout_s = stuck_timeout_s
+        self.monitor_interval_s = monitor_interval_s
+        self.processes = max(int(processes), 1)
+        self.slots = max(int(slots), 1)
+        self.max_rows = max(int(max_rows), 1)
+        self.n_features = n_features
+        self.n_outputs = n_outputs
+
+        self._request_shm: Optional[shared_memory.SharedMemory] = None
+        self._response_shm: Optional[shared_memory.SharedMemory] = None
+        self._requests = None
+        self._responses = None
+        self._free_slots: "queue.Queue[int]" = queue.Queue()
+        self._futures: List[Optional[Future]] = [None] * self.slots
+        self._task_seq: List[int] = [-1] * self.slots  # Sequence number of the task each slot carries
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._respawn_ctx = None
+        self._worker_args = None
+        self._workers = []
+        self._busy = None
+        self._busy_since = None
+        self._tasks = None
+        self._results = None
+        self._listener = None
+        self._monitor = None
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        ctx = mp.get_context(self.start_method)
+        # Replacement workers start long after startup, so never by fork; the queues and
+        # busy arrays come from their context (fork-context locks can't be handed to them)
+        self._respawn_ctx = mp.get_context("forkserver" if self.start_method == "fork" else self.start_method)
+        shape_in = (self.slots, self.max_rows, self.n_features)
+        shape_out = (self.slots, self.max_rows, self.n_outputs)
+        self._request_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape_in)) * 8)
+        self._response_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape_out)) * 8)
+        self._requests = np.ndarray(shape_in, dtype=np.float64, buffer=self._request_shm.buf)
+        self._responses = np.ndarray(shape_out, dtype=np.float64, buffer=self._response_shm.buf)
+        for slot in range(self.slots):
+            self._free_slots.put(slot)
+
+        self._tasks = self._respawn_ctx.SimpleQueue()
+        self._results = self._respawn_ctx.SimpleQueue()
+        self._busy = self._respawn_ctx.RawArray("q", [-1] * self.processes)
+        self._busy_since = self._respawn_ctx.RawArray("d", self.processes)
+        self._worker_args = (self.score_fn, self._request_shm.name, self._response_shm.name,
+                             shape_in, shape_out, self._tasks, self._results)
+        self._workers = [self._spawn_worker(ctx, i) for i in range(self.processes)]
+
+        self._listener = threading.Thread(target=self._listen, name="inference-results", daemon=True)
+        self._listener.start()
+        self._running = True
+        self._monitor = threading.Thread(target=self._watch_workers, name="inference-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop(self, timeout: float = 10.0):
+        if not self._running:
+            return
+        self._running = False
+        self._monitor.join(timeout)  # No respawns from here on
+        for _ in self._workers:
+            self._tasks.put(None)
+        for process in self._workers:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._results.put(None)  # Stop the listener
+        self._listener.join(timeout)
+        self._workers = []
+        self._requests = self._responses = None
+        for shm in (self._request_shm, self._response_shm):
+            shm.close()
+            shm.unlink()
+        self._request_shm = self._response_shm = None
+
+    def score(self, features: np.ndarray, timeout: float = 10.0) -> Tuple[np.ndarray, ...]:
+        """Scores an N x n_features matrix on the pool. Returns n_outputs arrays of length N."""
+        if not self._running:
+            raise RuntimeError("InferencePool is not running")
+        features = np.asarray(features, dtype=np.float64)
+        n_rows = features.shape[0]
+        outputs = np.empty((n_rows, self.n_outputs))
+
+        pending = []
+        try:
+            for start in range(0, n_rows, self.max_rows):
+                chunk = features[start:start + self.max_rows]
+                try:
+                    slot = self._free_slots.get_nowait()
+                except queue.Empty:
+                    # Never hold slots while waiting for more (two large batches would deadlock):
+                    # finish our in-flight chunks first, then wait for any free slot
+                    self._collect(pending, outputs, timeout)
+                    try:
+                        slot = self._free_slots.get(timeout=timeout)
+                    except queue.Empty:
+                        raise TimeoutError("No free inference slot")
+                future = Future()
+                seq = next(self._seq)
+                with self._lock:
+                    self._futures[slot] = future
+                    self._task_seq[slot] = seq
+                pending.append((slot, start, chunk.shape[0], future))
+                self._requests[slot, :chunk.shape[0]] = chunk
+                self._tasks.put((slot, chunk.shape[0], seq))
+
+            self._collect(pending, outputs, timeout)
+        finally:
+            self._release(pending)
+
+        return tuple(outputs[:, column] for column in range(self.n_outputs))
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _spawn_worker(self, ctx, index: int):
+        self._busy[index] = -1
+        process = ctx.Process(
+            target=_worker_loop,
+            args=self._worker_args + (index, self._busy, self._busy_since),
+            name=f"inference-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def _watch_workers(self):
+        while self._running:
+            time.sleep(self.monitor_interval_s)
+            for index, process in enumerate(self._workers):
+                if not self._running:
+                    return
+                seq = self._busy[index]
+                if process.is_alive():
+                    if seq < 0 or time.monotonic() - self._busy_since[index] < self.stuck_timeout_s:
+                        continue
+                    with self._lock:
+                        slot = self._slot_of(seq)
+                        abandoned = slot is not None and self._futures[slot] is not None and self._futures[slot].cancelled()
+                    if not abandoned:
+                        continue  # Slow, but someone is still waiting for it
+                    print(f"⚠️  Inference worker {process.name} stuck for {self.stuck_timeout_s:.0f}s, restarting it")
+                    process.terminate()
+                    process.join(1.0)
+                else:
+                    print(f"⚠️  Inference worker {process.name} died (exit code {process.exitcode}), restarting it")
+                self._recover(seq)
+                self._workers[index] = self._spawn_worker(self._respawn_ctx, index)
+
+    def _slot_of(self, seq: int) -> Optional[int]:
+        # Lock held
+        if seq < 0:
+            return None
+        for slot, slot_seq in enumerate(self._task_seq):
+            if slot_seq == seq and self._futures[slot] is not None:
+                return slot
+        return None
+
+    def _recover(self, seq: int):
+        """The task `seq` will never be answered: fail its request, or recycle its slot if nobody waits."""
+        with self._lock:
+            slot = self._slot_of(seq)
+            if slot is None:
+                return  # Answered before the worker went away
+            future = self._futures[slot]
+            if future.cancelled():
+                self._futures[slot] = None
+                self._free_slots.put(slot)
+            elif not future.done():
+                future.set_exception(RuntimeError("Inference worker died while scoring"))
+
+    def _collect(self, pending, outputs, timeout):
+        """Waits for in-flight chunks, copies their outputs and returns their slots to the ring."""
+        for slot, start, rows, future in pending:
+            future.result(timeout)
+            outputs[start:start + rows] = self._responses[slot, :rows]
+        self._release(pending)
+
+    def _release(self, pending):
+        for slot, _, _, future in pending:
+            with self._lock:
+                if future.cancel():
+                    # Still on a worker (caller timed out / failed): _listen recycles it when done
+                    continue
+                self._futures[slot] = None
+            self._free_slots.put(slot)
+        pending.clear()
+
+    def _listen(self):
+        while True:
+            message = self._results.get()
+            if message is None:
+                break
+            slot, seq, error = message
+            with self._lock:
+                future = self._futures[slot]
+                if future is None or self._task_seq[slot] != seq:
+                    continue  # Stale: the task was already recovered after its worker went away
+                if future.cancelled():
+                    # Caller gave up waiting: recycle the slot now that the worker is done with it
+                    self._futures[slot] = None
+                    self._free_slots.put(slot)
+                elif future.done():
+                    continue  # Already failed by _recover()
+                elif error is None:
+                    future.set_result(slot)
+                else:
+                    future.set_exception(RuntimeError(error))
@@ -0,0 +1,339 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from app.core.config import settings
+from app.ml.numpy_autoencoder import NumpyAutoencoder
+from app.ml.tree_ensemble import build_xgboost_predictor
+
+# Deep Learning (only the Keras autoencoder backend needs TensorFlow)
+TF_AVAILABLE = False
+if settings.AUTOENCODER_BACKEND == "keras":
+    try:
+        from tensorflow.keras.models import load_model
+        TF_AVAILABLE = True
+    except ImportError:
+        print("⚠️  TensorFlow not available. Autoencoder will not be loaded.")
+
+XGBOOST_PATH = "fraud_model.pkl"
+AUTOENCODER_KERAS_PATHS = ("autoencoder_model.keras", "autoencoder_model.h5")
+AUTOENCODER_SCALER_PATH = "autoencoder_scaler.pkl"
+AUTOENCODER_METADATA_PATH = "autoencoder_metadata.pkl"
+
+
+class LatencyStats:
+    """Inference latency of one model version: totals plus the most recent calls for percentiles."""
+
+    def __init__(self, window: int = 2048):
+        self.calls = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, rows: int = 1):
+        with self._lock:
+            self.calls += 1
+            self.rows += rows
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self._recent.append(elapsed_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = np.array(self._recent) if self._recent else None
+            return {
+                "calls": self.calls,
+                "rows": self.rows,
+                "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else None,
+                "p50_ms": round(float(np.percentile(recent, 50)), 3) if recent is not None else None,
+                "p95_ms": round(float(np.percentile(recent, 95)), 3) if recent is not None else None,
+                "p99_ms": round(float(np.percentile(recent, 99)), 3) if recent is not None else None,
+                "max_ms": round(self.max_ms, 3),
+            }
+
+
+@dataclass
+class ModelBundle:
+    """Everything one scoring pass needs, loaded and swapped together as one version."""
+    version: str
+    ml_model: Any = None                 # XGBoost model (known fraud patterns)
+    autoencoder_model: Any = None        # Autoencoder model (anomaly detection)
+    autoencoder_scaler: Any = None       # Scaler for autoencoder features
+    autoencoder_metadata: Optional[dict] = None  # Metadata with thresholds
+    sources: Dict[str, str] = field(default_factory=dict)  # artifact -> file it resolved to
+    loaded_at: datetime = field(default_factory=datetime.now)
+    stats: LatencyStats = field(default_factory=LatencyStats)
+    inference_pool: Any = None           # Inference processes bound to this version (optional)
+
+    @property
+    def has_model(self) -> bool:
+        return self.ml_model is not None or self.autoencoder_model is not None
+
+    @property
+    def hybrid_mode_enabled(self) -> bool:
+        return self.ml_model is not None and self.autoencoder_model is not None
+
+    def __getstate__(self):
+        # Pickled for inference workers that are not forked (forkserver/spawn): models only
+        state = self.__dict__.copy()
+        del state["stats"], state["inference_pool"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, stats=LatencyStats(), inference_pool=None)
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "hybrid_enabled": self.hybrid_mode_enabled,
+            "sources": dict(self.sources),
+            "latency": self.stats.snapshot(),
+        }
+
+
+def artifact_paths() -> List[str]:
+    """Files whose change means a new model version (symlinks are followed)."""
+    if settings.AUTOENCODER_BACKEND == "numpy":
+        autoencoder = [settings.AUTOENCODER_NUMPY_PATH]
+    else:
+        autoencoder = list(AUTOENCODER_KERAS_PATHS) + [AUTOENCODER_SCALER_PATH]
+    return [XGBOOST_PATH] + autoencoder + [AUTOENCODER_METADATA_PATH]
+
+
+def artifact_fingerprint() -> Tuple:
+    """(path, resolved file, mtime, size) for every existing artifact."""
+    fingerprint = []
+    for path in artifact_paths():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        fingerprint.append((path, os.path.realpath(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def load_model_bundle(version: str) -> ModelBundle:
+    """Loads XGBoost + Autoencoder from the active artifacts (same rules as startup)."""
+    bundle = ModelBundle(version=version)
+
+    # XGBoost Model (Supervised Learning - Known Frauds)
+    try:
+        bundle.ml_model = joblib.load(XGBOOST_PATH)
+        bundle.sources[XGBOOST_PATH] = os.path.realpath(XGBOOST_PATH)
+        print("     ✅ XGBoost model loaded successfully")
+    except Exception as e:
+        print(f"     ❌ Failed to load XGBoost model: {e}")
+        print("     ⚠️  System will operate without XGBoost")
+
+    if bundle.ml_model is not None and settings.XGBOOST_BACKEND != "sklearn":
+        try:
+            bundle.ml_model = build_xgboost_predictor(bundle.ml_model, settings.XGBOOST_BACKEND, settings.XGBOOST_FLAT_MAX_ROWS)
+            print(f"     ⚡ XGBoost inference backend: {settings.XGBOOST_BACKEND}")
+        except Exception as e:
+            print(f"     ⚠️  Could not build '{settings.XGBOOST_BACKEND}' backend, using sklearn wrapper: {e}")
+
+    # Autoencoder Model (Unsupervised Learning - Anomalies)
+    try:
+        if settings.AUTOENCODER_BACKEND == "numpy":
+            # Exported weights + scaler as NumPy arrays — no TensorFlow needed
+            bundle.autoencoder_model = NumpyAutoencoder.load(settings.AUTOENCODER_NUMPY_PATH)
+            bundle.autoencoder_scaler = bundle.autoencoder_model
+            bundle.sources[settings.AUTOENCODER_NUMPY_PATH] = os.path.realpath(settings.AUTOENCODER_NUMPY_PATH)
+            print(f"     ✅ Autoencoder loaded (numpy backend: {settings.AUTOENCODER_NUMPY_PATH})")
+        else:
+            if not TF_AVAILABLE:
+                raise ImportError("TensorFlow not available")
+
+            # Try new Keras format first, fall back to old HDF5 format
+            for path in AUTOENCODER_KERAS_PATHS:
+                try:
+                    bundle.autoencoder_model = load_model(path)
+                    bundle.sources[path] = os.path.realpath(path)
+                    print(f"     ✅ Autoencoder loaded ({path.rsplit('.', 1)[-1]} format)")
+                    break
+                except Exception as e:
+                    last_error = e
+            else:
+                print(f"     ⚠️  Could not load Autoencoder: {last_error}")
+
+            if bundle.autoencoder_model is not None:
+                bundle.autoencoder_scaler = joblib.load(AUTOENCODER_SCALER_PATH)
+                bundle.sources[AUTOENCODER_SCALER_PATH] = os.path.realpath(AUTOENCODER_SCALER_PATH)
+
+        if bundle.autoencoder_model is not None:
+            bundle.autoencoder_metadata = joblib.load(AUTOENCODER_METADATA_PATH)
+            bundle.sources[AUTOENCODER_METADATA_PATH] = os.path.realpath(AUTOENCODER_METADATA_PATH)
+            print(f"     📊 Reconstruction threshold: {bundle.autoencoder_metadata['reconstruction_threshold']:.6f}")
+
+    except Exception as e:
+        print(f"     ⚠️  Autoencoder not available: {e}")
+        print("     (System will use XGBoost only for fraud detection)")
+        bundle.autoencoder_model = None
+        bundle.autoencoder_scaler = None
+
+    return bundle
+
+
+class ModelRegistry:
+    """
+    Holds the live ModelBundle and hot-swaps new versions without downtime.
+
+    reload() (admin endpoint or the artifact watcher) loads the new artifacts on
+    a background thread, runs `prepare` on them (warm-up with synthetic batches,
+    starting a version-bound inference pool, ...) and only then replaces the
+    `current` reference in one assignment. Requests read `current` once and
+    keep using that bundle to the end, so in-flight requests are never mixed
+    across versions. A failed load or warm-up leaves the live version in place.
+    Latency stats stay available for the last few retired versions.
+    """
+
+    def __init__(self, history: int = 5):
+        self.history = history
+        self._current: Optional[ModelBundle] = None
+        self._retired: "OrderedDict[str, ModelBundle]" = OrderedDict()
+        self._sequence = 0
+        self._prepare: Optional[Callable[[ModelBundle], None]] = None
+        self._on_retire: Optional[Callable[[ModelBundle], None]] = None
+        self._reload_lock = threading.Lock()
+        self._loading = False
+        self._last_error: Optional[str] = None
+        self._fingerprint: Tuple = ()
+        self._watcher = None
+        self._watching = False
+
+    @property
+    def current(self) -> ModelBundle:
+        bundle = self._current
+        return bundle if bundle is not None else ModelBundle(version="none")
+
+    @property
+    def started(self) -> bool:
+        """True once load_initial() has installed a version (later prepares run next to live traffic)."""
+        return self._current is not None
+
+    @property
+    def loading(self) -> bool:
+        return self._loading
+
+    def configure(self, prepare: Callable[[ModelBundle], None] = None, on_retire: Callable[[ModelBundle], None] = None):
+        self._prepare = prepare
+        self._on_retire = on_retire
+
+    def load_initial(self) -> ModelBundle:
+        """Blocking first load at startup (no warm-up failure fallback: there is nothing to fall back to)."""
+        with self._reload_lock:
+            fingerprint = artifact_fingerprint()
+            bundle = load_model_bundle(self._next_version())
+            if self._prepare is not None and bundle.has_model:
+                try:
+                    self._prepare(bundle)
+                except Exception as e:
+                    # Serve anyway (there is nothing else), but in-process and visibly degraded
+                    self._discard_pool(bundle)
+                    self._last_error = f"startup warm-up: {e}"
+                    print(f"     ⚠️  Model warm-up failed, version {bundle.version} is live DEGRADED: {e}")
+            self._fingerprint = fingerprint
+            self._current = bundle
+            return bundle
+
+    def reload(self, reason: str = "manual") -> bool:
+        """Starts a background load + warm-up + swap. Returns False if one is already running."""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        self._loading = True
+        threading.Thread(target=self._reload, args=(reason,), name="model-reload", daemon=True).start()
+        return True
+
+    def start_watching(self, interval_s: float):
+        """Polls the artifact files (and their symlink targets) and reloads when they change."""
+        if self._watching or interval_s <= 0:
+            return
+        self._watching = True
+        self._watcher = threading.Thread(target=self._watch, args=(interval_s,), name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._watching = False
+
+    def status(self) -> dict:
+        return {
+            "current": self.current.describe(),
+            "loading": self._loading,
+            "last_error": self._last_error,
+            "retired": [bundle.describe() for bundle in reversed(self._retired.values())],
+        }
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _next_version(self) -> str:
+        self._sequence += 1
+        return f"v{self._sequence}"
+
+    def _discard_pool(self, bundle: ModelBundle):
+        if bundle.inference_pool is not None:
+            try:
+                bundle.inference_pool.stop()
+            except Exception as e:
+                print(f"⚠️  Could not stop the inference pool of {bundle.version}: {e}")
+            bundle.inference_pool = None
+
+    def _reload(self, reason: str):
+        fingerprint = artifact_fingerprint()
+        bundle = None
+        try:
+            print(f"🔄 Loading new model version ({reason})...")
+            bundle = load_model_bundle(self._next_version())
+            if not bundle.has_model:
+                raise RuntimeError("No ML models could be loaded")
+            if self._prepare is not None:
+                self._prepare(bundle)
+
+            previous, self._current = self._current, bundle  # Atomic pointer flip
+            self._fingerprint = fingerprint
+            self._last_error = None
+            print(f"✅ Model version {bundle.version} is live")
+
+            if previous is not None:
+                # Keep only the version's description + stats; in-flight requests still hold the full bundle
+                self._retired[previous.version] = replace(
+                    previous, ml_model=None, autoencoder_model=None, autoencoder_scaler=None, inference_pool=None
+                )
+                while len(self._retired) > self.history:
+                    self._retired.popitem(last=False)
+                if self._on_retire is not None:
+                    self._on_retire(previous)
+        except Exception as e:
+            if bundle is not None and bundle is not self._current:
+                self._discard_pool(bundle)  # Warm-up failed after its pool started: workers + shared memory
+            self._fingerprint = fingerprint  # Don't retry the same broken artifacts until they change again
+            self._last_error = f"{reason}: {e}"
+            print(f"❌ Model reload failed, keeping {self.current.version}: {e}")
+        finally:
+            self._loading = False
+            self._reload_lock.release()
+
+    def _watch(self, interval_s: float):
+        candidate = None
+        while self._watching:
+            time.sleep(interval_s)
+            fingerprint = artifact_fingerprint()
+            if fingerprint == self._fingerprint:
+                candidate = None
+            elif fingerprint == candidate:
+                # Unchanged for a whole interval: retraining has finished writing
+                if self.reload("artifact change"):
+                    candidate = None
+            else:
+                candidate = fingerprint
+
+
+model_registry = ModelRegistry()
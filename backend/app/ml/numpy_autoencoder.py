@@ -0,0 +1,120 @@
+"""
+Pure-NumPy inference engine for the fraud autoencoder.
+
+The autoencoder is a small stack of Dense layers (30→20→15→10→15→20→30,
+ReLU + sigmoid output). Running it through Keras costs milliseconds of
+TensorFlow dispatch per call, while the actual math is a handful of tiny
+matmuls. This engine holds the exported weights and the StandardScaler's
+mean/scale as plain arrays, so serving needs NumPy only.
+
+Artifacts are produced once by `export_autoencoder_numpy.py`.
+"""
+import numpy as np
+
+
+def _relu(x):
+    return np.maximum(x, 0.0)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+ACTIVATIONS = {
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "linear": lambda x: x,
+}
+
+
+class NumpyAutoencoder:
+    """
+    Drop-in replacement for the (scaler, Keras model) pair used by /api/predict.
+
+    - transform(X)   → same output as the fitted StandardScaler
+    - predict(Xs)    → same output as keras_model.predict(Xs) on scaled input
+
+    The scaler is deliberately not folded into the first layer: scoring needs the
+    scaled features anyway (range check and reconstruction error), so a folded
+    layer would only repeat the scaling inside the matmul.
+    """
+
+    def __init__(self, weights, biases, activations, scaler_mean, scaler_scale):
+        if not (len(weights) == len(biases) == len(activations)):
+            raise ValueError("weights, biases and activations must have one entry per layer")
+        for name in activations:
+            if name not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {name}")
+
+        self.weights = [np.ascontiguousarray(w, dtype=np.float64) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float64) for b in biases]
+        self.activations = [str(a) for a in activations]
+        self.scaler_mean = np.asarray(scaler_mean, dtype=np.float64)
+        self.scaler_scale = np.asarray(scaler_scale, dtype=np.float64)
+        self.n_features = self.weights[0].shape[0]
+
+        # StandardScaler: (x - mean) / scale  ==  x * inv_scale - mean * inv_scale
+        self._inv_scale = 1.0 / self.scaler_scale
+        self._shift = self.scaler_mean * self._inv_scale
+
+    # ── construction ──────────────────────────────────────────────────────
+    @classmethod
+    def from_keras(cls, keras_model, scaler):
+        """Exports weights from a loaded Keras Sequential of Dense layers + a fitted StandardScaler."""
+        weights, biases, activations = [], [], []
+        for layer in keras_model.layers:
+            params = layer.get_weights()
+            if not params:
+                continue  # InputLayer / Dropout etc. carry no inference weights
+            if len(params) != 2:
+                raise ValueError(f"Unsupported layer for NumPy export: {layer.name}")
+            weights.append(params[0])
+            biases.append(params[1])
+            activations.append(layer.get_config().get("activation", "linear"))
+
+        n_features = weights[0].shape[0]
+        mean = scaler.mean_ if getattr(scaler, "mean_", None) is not None else np.zeros(n_features)
+        scale = scaler.scale_ if getattr(scaler, "scale_", None) is not None else np.ones(n_features)
+        return cls(weights, biases, activations, mean, scale)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            n_layers = int(data["n_layers"])
+            return cls(
+                [data[f"W{i}"] for i in range(n_layers)],
+                [data[f"b{i}"] for i in range(n_layers)],
+                [str(a) for a in data["activations"]],
+                data["scaler_mean"],
+                data["scaler_scale"],
+            )
+
+    def save(self, path: str):
+        arrays = {f"W{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(
+            path,
+            n_layers=np.array(len(self.weights)),
+            activations=np.array(self.activations),
+            scaler_mean=self.scaler_mean,
+            scaler_scale=self.scaler_scale,
+            **arrays,
+        )
+
+    # ── inference ─────────────────────────────────────────────────────────
+    def transform(self, features):
+        """StandardScaler.transform equivalent."""
+        return np.asarray(features, dtype=np.float64) * self._inv_scale - self._shift
+
+    def predict(self, features_scaled, verbose=0):
+        """Keras-compatible predict on already-scaled features."""
+        hidden = np.asarray(features_scaled, dtype=np.float64)
+        for w, b, act in zip(self.weights, self.biases, self.activations):
+            hidden = ACTIVATIONS[act](hidden @ w + b)
+        return hidden
+
+    def reconstruction_error(self, features):
+        """Per-row MSE between scaled features and their reconstruction (raw features in)."""
+        features_scaled = self.transform(features)
+        return np.mean(np.power(features_scaled - self.predict(features_scaled), 2), axis=1)
@@ -0,0 +1,199 @@
+"""
+Fast XGBoost inference paths for single-row and small-batch scoring.
+
+At batch size 1, `XGBClassifier.predict_proba` spends most of its time in
+DMatrix construction and the sklearn wrapper rather than in the tree walk.
+Two alternatives are provided, both exposing the same `predict_proba(X)`
+so they can replace the loaded model in place:
+
+- FlatTreeEnsemble: the booster dumped into contiguous NumPy arrays
+  (feature, threshold, children, default direction, leaf value) and evaluated
+  for all trees at once with a vectorized level-by-level traversal.
+- InplaceBoosterPredictor: xgboost's `Booster.inplace_predict`, which skips
+  the DMatrix but still runs the native predictor (better for large batches).
+- AutoXGBoostPredictor: picks between the two by batch size.
+
+`benchmark_xgboost_backends.py` compares both against the sklearn wrapper
+per batch size and checks that the probabilities match.
+"""
+import json
+
+import numpy as np
+
+
+def _best_iteration_limit(xgb_model):
+    """Number of boosting rounds predict_proba would use (honours early stopping)."""
+    try:
+        best = xgb_model.best_iteration
+    except AttributeError:
+        return None
+    return None if best is None else int(best) + 1
+
+
+def _get_booster(xgb_model):
+    return xgb_model.get_booster() if hasattr(xgb_model, "get_booster") else xgb_model
+
+
+def _parse_base_score(raw) -> float:
+    # Newer xgboost stores a vector string like "[1.47E-2]"
+    return float(str(raw).strip("[]").split(",")[0])
+
+
+class FlatTreeEnsemble:
+    """Binary-logistic gbtree model evaluated with NumPy over flattened node arrays."""
+
+    def __init__(self, feature, threshold, left, right, default_child, leaf_value,
+                 roots, max_depth, base_margin, n_features):
+        self.feature = feature              # int32 [total_nodes] split feature (0 at leaves)
+        self.threshold = threshold          # float32 [total_nodes] split condition
+        self.left = left                    # int32 [total_nodes] global index of left child (self at leaves)
+        self.right = right                  # int32 [total_nodes] global index of right child (self at leaves)
+        self.default_child = default_child  # int32 [total_nodes] child taken when the feature is missing
+        self.leaf_value = leaf_value        # float32 [total_nodes] leaf output (0 at split nodes)
+        self.roots = roots                  # int32 [n_trees] global index of each tree's root
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self.n_features = n_features
+        self._children = np.ascontiguousarray(np.stack([left, right], axis=1).ravel())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_xgb_model(cls, xgb_model):
+        """Builds the flat arrays from an XGBClassifier (or raw Booster)."""
+        booster = _get_booster(xgb_model)
+        learner = json.loads(bytes(booster.save_raw("json")))["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"FlatTreeEnsemble supports binary:logistic only (got {objective})")
+        gbm = learner["gradient_booster"]
+        if gbm["name"] != "gbtree":
+            raise ValueError(f"FlatTreeEnsemble supports gbtree only (got {gbm['name']})")
+
+        trees = gbm["model"]["trees"]
+        limit = _best_iteration_limit(xgb_model)
+        if limit is not None:
+            per_round = int(gbm["model"]["gbtree_model_param"].get("num_parallel_tree", 1))
+            trees = trees[: limit * per_round]
+
+        feature, threshold, left, right, default_child, leaf_value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if any(int(t) != 0 for t in tree.get("split_type", [])):
+                raise ValueError("Categorical splits are not supported")
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+            is_leaf = lc == -1
+            idx = np.arange(len(lc))
+
+            left.append(np.where(is_leaf, idx, lc) + offset)
+            right.append(np.where(is_leaf, idx, rc) + offset)
+            default_left = np.asarray(tree["default_left"], dtype=bool)
+            default_child.append(np.where(is_leaf, idx, np.where(default_left, lc, rc)) + offset)
+            feature.append(np.where(is_leaf, 0, np.asarray(tree["split_indices"], dtype=np.int64)))
+            threshold.append(np.where(is_leaf, 0.0, cond).astype(np.float32))
+            leaf_value.append(np.where(is_leaf, cond, 0.0).astype(np.float32))
+            roots.append(offset)
+
+            # Depth of the deepest leaf = number of traversal steps needed
+            depth = np.zeros(len(lc), dtype=np.int64)
+            for node in range(len(lc)):  # Children always have larger ids than parents
+                if not is_leaf[node]:
+                    depth[lc[node]] = depth[rc[node]] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()))
+            offset += len(lc)
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.int32),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float32),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=np.int32),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=np.int32),
+            default_child=np.ascontiguousarray(np.concatenate(default_child), dtype=np.int32),
+            leaf_value=np.ascontiguousarray(np.concatenate(leaf_value), dtype=np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            base_margin=base_margin,
+            n_features=int(learner["learner_model_param"]["num_feature"]),
+        )
+
+    def predict_margin(self, features):
+        # xgboost compares in float32: `x < split_condition` goes left, NaN follows the default
+        X = np.asarray(features, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows = X.shape[0]
+        X_flat = X.ravel()
+        has_missing = bool(np.isnan(X_flat).any())
+
+        if n_rows == 1:
+            node = self.roots
+            row_offsets = 0
+        else:
+            node = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+            row_offsets = (np.arange(n_rows, dtype=np.int32) * X.shape[1])[:, None]
+
+        for _ in range(self.max_depth):
+            x = X_flat[self.feature[node] + row_offsets]
+            # children[2n] = left, children[2n+1] = right
+            next_node = self._children[2 * node + (x >= self.threshold[node])]
+            if has_missing:
+                next_node = np.where(np.isnan(x), self.default_child[node], next_node)
+            node = next_node
+
+        margin = self.leaf_value[node].sum(axis=-1, dtype=np.float64) + self.base_margin
+        return np.atleast_1d(margin)
+
+    def predict_proba(self, features):
+        """sklearn-compatible (N, 2) probabilities."""
+        p = 1.0 / (1.0 + np.exp(-self.predict_margin(features)))
+        return np.column_stack([1.0 - p, p])
+
+
+class InplaceBoosterPredictor:
+    """Thin predict_proba wrapper over Booster.inplace_predict (no DMatrix construction)."""
+
+    def __init__(self, xgb_model):
+        self.booster = _get_booster(xgb_model)
+        limit = _best_iteration_limit(xgb_model)
+        self.iteration_range = (0, limit) if limit is not None else (0, 0)
+
+    def predict_proba(self, features):
+        p = self.booster.inplace_predict(
+            np.asarray(features, dtype=np.float32), iteration_range=self.iteration_range
+        ).astype(np.float64).reshape(-1)
+        return np.column_stack([1.0 - p, p])
+
+
+class AutoXGBoostPredictor:
+    """Flat traversal for small batches, inplace_predict above `flat_max_rows`."""
+
+    def __init__(self, xgb_model, flat_max_rows: int = 16):
+        self.flat = FlatTreeEnsemble.from_xgb_model(xgb_model)
+        self.inplace = InplaceBoosterPredictor(xgb_model)
+        self.flat_max_rows = flat_max_rows
+
+    def predict_proba(self, features):
+        n_rows = 1 if np.ndim(features) == 1 else len(features)
+        backend = self.flat if n_rows <= self.flat_max_rows else self.inplace
+        return backend.predict_proba(features)
+
+
+def build_xgboost_predictor(xgb_model, backend: str, flat_max_rows: int = 16):
+    """Wraps the loaded XGBClassifier according to XGBOOST_BACKEND ("sklearn", "flat", "inplace", "auto")."""
+    if backend == "flat":
+        return FlatTreeEnsemble.from_xgb_model(xgb_model)
+    if backend == "inplace":
+        return InplaceBoosterPredictor(xgb_model)
+    if backend == "auto":
+        return AutoXGBoostPredictor(xgb_model, flat_max_rows)
+    if backend == "sklearn":
+        return xgb_model
+    raise ValueError(f"Unknown XGBOOST_BACKEND: {backend}")
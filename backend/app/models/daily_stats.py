@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, Date
+from app.core.database import Base
+
+
+class DailyTransactionStats(Base):
+    """
+    Per-day rollup of scored transactions (one row per calendar day).
+    Maintained by app/services/daily_stats.py in the same commit as the
+    transactions it counts; backs /api/dashboard/stats.
+    """
+    __tablename__ = "daily_transaction_stats"
+
+    day = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    declined = Column(Integer, nullable=False, default=0)
+    escalated = Column(Integer, nullable=False, default=0)
+    approved = Column(Integer, nullable=False, default=0)
+    latency_sum_ms = Column(Float, nullable=False, default=0.0)   # sum(processing_time_ms)
+    latency_count = Column(Integer, nullable=False, default=0)    # rows with a processing_time_ms
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from datetime import datetime
 from app.core.database import Base
 
@@ -11,6 +11,11 @@ class MerchantWhitelist(Base):
     merchant_name = Column(String, unique=True, index=True, nullable=False)
     added_at = Column(DateTime, default=datetime.now)
 
+    # Case-insensitive lookups (lower(merchant_name) = ...) can't use the plain column index
+    __table_args__ = (
+        Index("ix_merchant_whitelist_merchant_name_lower", func.lower(merchant_name)),
+    )
+
 
 class CountryBlacklist(Base):
     """Countries from which transactions are automatically declined."""
@@ -7,7 +7,7 @@ class Transaction(Base):
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)  # Per-customer stats (/api/customers)
     merchant = Column(String)
     amount = Column(Float)
     timestamp = Column(DateTime, default=datetime.now)
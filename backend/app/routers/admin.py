@@ -6,6 +6,8 @@ from app.core.database import get_db
 from app.models.config import SystemConfig
 from app.models.user import User
 from app.utils.deps import get_current_user
+from app.services.config_cache import config_cache
+from app.ml.model_registry import model_registry
 
 router = APIRouter(prefix="/api/admin", tags=["System Admin"])
 
@@ -32,4 +34,17 @@ def update_system_config(config_in: ConfigUpdate, db: Session = Depends(get_db),
         db.add(config)
     
     db.commit()
+    config_cache.refresh(db)
     return {"message": "Config updated", "key": config.key, "value": config.value}
+
+@router.get("/models")
+def get_model_status(current_user: User = Depends(get_current_user)):
+    """Live model version, artifact sources and per-version inference latency."""
+    return model_registry.status()
+
+@router.post("/models/reload")
+def reload_models(current_user: User = Depends(get_current_user)):
+    """Loads the current artifacts in the background, warms them up, then swaps them in."""
+    if not model_registry.reload("admin request"):
+        raise HTTPException(status_code=400, detail="A model reload is already in progress")
+    return {"message": "Model reload started", "current_version": model_registry.current.version}
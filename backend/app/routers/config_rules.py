@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
@@ -7,6 +8,8 @@ from app.models.config import SystemConfig
 from app.models.rules import MerchantWhitelist, CountryBlacklist
 from app.utils.deps import get_current_user
 from app.models.user import User
+from app.services.config_cache import config_cache
+from app.services.whitelist_cache import merchant_whitelist_index, normalize_merchant_name
 
 router = APIRouter(prefix="/api/config", tags=["Configuration"])
 
@@ -65,6 +68,7 @@ def update_thresholds(
         else:
             db.add(SystemConfig(key=key, value=value))
     db.commit()
+    config_cache.refresh(db)
     return {"message": "Thresholds updated", "decline": payload.decline_threshold, "review": payload.review_threshold}
 
 
@@ -87,7 +91,7 @@ def add_merchant(
     if not name:
         raise HTTPException(status_code=400, detail="Merchant name cannot be empty.")
     existing = db.query(MerchantWhitelist).filter(
-        MerchantWhitelist.merchant_name.ilike(name)
+        func.lower(MerchantWhitelist.merchant_name) == normalize_merchant_name(name)
     ).first()
     if existing:
         raise HTTPException(status_code=409, detail="Merchant already whitelisted.")
@@ -95,6 +99,7 @@ def add_merchant(
     db.add(item)
     db.commit()
     db.refresh(item)
+    merchant_whitelist_index.rebuild(db)
     return {"id": item.id, "merchant_name": item.merchant_name}
 
 
@@ -107,9 +112,11 @@ def remove_merchant(
     item = db.query(MerchantWhitelist).filter(MerchantWhitelist.id == item_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Merchant not found.")
+    merchant_name = item.merchant_name
     db.delete(item)
     db.commit()
-    return {"message": f"'{item.merchant_name}' removed from whitelist."}
+    merchant_whitelist_index.rebuild(db)
+    return {"message": f"'{merchant_name}' removed from whitelist."}
 
 
 # ─────────────────────────────────────────────
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import render_prometheus
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus text exposition: per-stage latency histograms (+ p50/p95/p99 estimates) and decision counts."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -2,7 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.models.notification import Notification
+from app.services.live_events import live_events
+
+FEED_COLUMNS = (
+    Notification.id, Notification.title, Notification.message, Notification.severity,
+    Notification.is_read, Notification.transaction_id, Notification.created_at,
+)
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
@@ -11,12 +18,12 @@ router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 def get_notifications(db: Session = Depends(get_db)):
     """Returns the 20 most recent notifications, newest first."""
     notifications = (
-        db.query(Notification)
+        db.query(*FEED_COLUMNS)
         .order_by(Notification.created_at.desc())
         .limit(20)
         .all()
     )
-    return [
+    return FastJSONResponse([
         {
             "id": n.id,
             "title": n.title,
@@ -27,7 +34,7 @@ def get_notifications(db: Session = Depends(get_db)):
             "created_at": n.created_at.isoformat() if n.created_at else "",
         }
         for n in notifications
-    ]
+    ])
 
 
 @router.get("/unread-count")
@@ -42,4 +49,5 @@ def mark_all_read(db: Session = Depends(get_db)):
     """Marks all unread notifications as read. Called when the user opens the bell drawer."""
     db.query(Notification).filter(Notification.is_read == False).update({"is_read": True})
     db.commit()
+    live_events.publish_notifications_read()
     return {"message": "All notifications marked as read."}
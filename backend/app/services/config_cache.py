@@ -0,0 +1,93 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.config import SystemConfig
+
+DEFAULT_DECLINE_THRESHOLD = 0.70
+DEFAULT_REVIEW_THRESHOLD = 0.50
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable, versioned copy of every SystemConfig row."""
+    version: int
+    values: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    loaded_at: float = 0.0
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.values.get(key, default)
+
+    def get_float(self, key: str, default: float) -> float:
+        try:
+            return float(self.values[key])
+        except (KeyError, TypeError, ValueError):
+            return default
+
+    @property
+    def decline_threshold(self) -> float:
+        return self.get_float("fraud_threshold_decline", DEFAULT_DECLINE_THRESHOLD)
+
+    @property
+    def review_threshold(self) -> float:
+        return self.get_float("fraud_threshold_review", DEFAULT_REVIEW_THRESHOLD)
+
+    @property
+    def slack_webhook_url(self) -> Optional[str]:
+        return self.get("slack_webhook_url") or None
+
+
+class ConfigCache:
+    """
+    In-process SystemConfig cache for the scoring path.
+
+    The whole table is loaded into one snapshot; readers get the current snapshot
+    without touching the database. Writers in this process call refresh() right
+    after committing; the TTL covers writes made by other worker processes.
+
+    Every refresh() and invalidate() bumps a generation counter, and a refresh only
+    installs its snapshot if no newer one started while it was querying, so a slow
+    reader can never put rows from before an admin write back in place.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._version = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot.loaded_at > self.ttl_seconds:
+            return self.refresh(db)
+        return snapshot
+
+    def refresh(self, db: Session) -> ConfigSnapshot:
+        """Reloads every SystemConfig row and atomically swaps in a new snapshot."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        rows = db.query(SystemConfig.key, SystemConfig.value).all()
+        values = MappingProxyType({key: value for key, value in rows})
+        with self._lock:
+            if generation != self._generation:
+                # A newer refresh or an invalidate() happened meanwhile: serve these rows, don't cache them
+                return ConfigSnapshot(version=self._version, values=values, loaded_at=time.monotonic())
+            self._version += 1
+            self._snapshot = ConfigSnapshot(version=self._version, values=values, loaded_at=time.monotonic())
+            return self._snapshot
+
+    def invalidate(self):
+        """Forces the next get() to reload from the database."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+
+config_cache = ConfigCache(ttl_seconds=settings.CONFIG_CACHE_TTL_SECONDS)
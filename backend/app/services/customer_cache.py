@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.customer import Customer
+
+
+class CustomerState(NamedTuple):
+    """The few Customer columns the scoring path (and the live feed) needs."""
+    id: int
+    is_frozen: bool
+    is_active: bool
+    card_type: Optional[str]
+    card_last_four: Optional[str]
+    full_name: Optional[str]
+
+
+_STATE_COLUMNS = (Customer.id, Customer.is_frozen, Customer.is_active, Customer.card_type, Customer.card_last_four,
+                  Customer.full_name)
+_IN_CHUNK = 1000  # Keep IN (...) lists well under driver parameter limits
+
+
+class CustomerStateCache:
+    """
+    Size-bounded LRU + TTL cache of CustomerState, keyed by customer id.
+
+    freeze_customer / deactivate_customer call invalidate() so this process sees
+    the change immediately; the short TTL bounds staleness for changes made by
+    other worker processes. Unknown customer ids are not cached.
+
+    invalidate() and clear() bump a generation counter; a get_many() whose query
+    overlapped one of them does not cache what it loaded, so a lookup racing a
+    freeze cannot put the pre-freeze state back for a full TTL.
+    """
+
+    def __init__(self, max_size: int = 50000, ttl_seconds: float = 5.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # id -> (CustomerState, loaded_at)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, customer_id: int, now: float) -> Optional[CustomerState]:
+        entry = self._entries.get(customer_id)
+        if entry is None:
+            return None
+        if now - entry[1] > self.ttl_seconds:
+            del self._entries[customer_id]
+            return None
+        self._entries.move_to_end(customer_id)
+        return entry[0]
+
+    def _store(self, states: Iterable[CustomerState], now: float):
+        for state in states:
+            self._entries[state.id] = (state, now)
+            self._entries.move_to_end(state.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, db: Session, customer_id: int) -> Optional[CustomerState]:
+        return self.get_many(db, [customer_id]).get(customer_id)
+
+    def get_many(self, db: Session, customer_ids: Iterable[int]) -> Dict[int, CustomerState]:
+        """Returns {id: CustomerState} for every known id; misses are fetched in bulk."""
+        now = time.monotonic()
+        found: Dict[int, CustomerState] = {}
+        missing = []
+        with self._lock:
+            generation = self._generation
+            for cid in set(customer_ids):
+                state = self._lookup(cid, now)
+                if state is None:
+                    missing.append(cid)
+                else:
+                    found[cid] = state
+
+        if missing:
+            loaded = []
+            for start in range(0, len(missing), _IN_CHUNK):
+                rows = db.query(*_STATE_COLUMNS).filter(Customer.id.in_(missing[start:start + _IN_CHUNK])).all()
+                loaded.extend(CustomerState(*row) for row in rows)
+            with self._lock:
+                if generation == self._generation:
+                    self._store(loaded, now)
+            found.update((state.id, state) for state in loaded)
+
+        return found
+
+    def invalidate(self, customer_id: int):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(customer_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+customer_state_cache = CustomerStateCache(
+    max_size=settings.CUSTOMER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.CUSTOMER_CACHE_TTL_SECONDS,
+)
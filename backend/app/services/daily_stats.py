@@ -0,0 +1,123 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.daily_stats import DailyTransactionStats
+from app.models.transaction import Transaction
+
+COUNTER_COLUMNS = ("total", "declined", "escalated", "approved", "latency_sum_ms", "latency_count")
+STATUS_COLUMNS = {"Decline": "declined", "Escalate": "escalated", "Approve": "approved"}
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class DailyStatsRollup:
+    """
+    Keeps daily_transaction_stats in step with the transactions table.
+
+    Writers call record() / record_status_change() *before* their commit, so
+    the counters and the rows they count are committed (or rolled back)
+    together, and every worker process sees the same numbers. Each call is one
+    upsert per affected day (INSERT .. ON CONFLICT DO UPDATE col = col + delta),
+    so the day boundary needs no reset: a new day simply starts a new row.
+    Reading a day is a primary-key lookup, however many transactions it holds.
+    """
+
+    def deltas(self, rows: Iterable[dict]) -> Dict[date, Dict[str, float]]:
+        """Counter increments per day for Transaction column values."""
+        per_day: Dict[date, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+        for row in rows:
+            delta = per_day[row["timestamp"].date()]
+            delta["total"] += 1
+            column = STATUS_COLUMNS.get(row["status"])
+            if column:
+                delta[column] += 1
+            if row.get("processing_time_ms") is not None:
+                delta["latency_sum_ms"] += row["processing_time_ms"]
+                delta["latency_count"] += 1
+        return per_day
+
+    def record(self, db: Session, rows: Iterable[dict]):
+        """Adds newly inserted transactions to their days' counters (caller commits)."""
+        for day, delta in sorted(self.deltas(rows).items()):  # Fixed order: no lock-order deadlocks across days
+            self._increment(db, day, delta)
+
+    def record_status_change(self, db: Session, day: date, old_status: str, new_status: str):
+        """Moves one transaction between the status counters (caller commits)."""
+        old_column, new_column = STATUS_COLUMNS.get(old_status), STATUS_COLUMNS.get(new_status)
+        if old_column == new_column:
+            return
+        delta = {}
+        if old_column:
+            delta[old_column] = -1
+        if new_column:
+            delta[new_column] = 1
+        self._increment(db, day, delta)
+
+    def get(self, db: Session, day: date) -> Optional[DailyTransactionStats]:
+        return db.get(DailyTransactionStats, day)
+
+    def rebuild(self, db: Session, since: date = None) -> int:
+        """
+        Recomputes the counters from the transactions table (all days, or from `since` on).
+        For an empty table on first start-up, or after rows were written around the
+        scoring path (bulk imports, manual SQL). Returns the number of days written.
+        """
+        day_expr = func.date(Transaction.timestamp)
+        query = db.query(
+            day_expr,
+            func.count(Transaction.id),
+            func.count(Transaction.id).filter(Transaction.status == "Decline"),
+            func.count(Transaction.id).filter(Transaction.status == "Escalate"),
+            func.count(Transaction.id).filter(Transaction.status == "Approve"),
+            func.coalesce(func.sum(Transaction.processing_time_ms), 0.0),
+            func.count(Transaction.processing_time_ms),
+        ).filter(Transaction.timestamp.isnot(None))
+        stale = delete(DailyTransactionStats)
+        if since is not None:
+            query = query.filter(Transaction.timestamp >= since)
+            stale = stale.where(DailyTransactionStats.day >= since)
+
+        rows = [
+            dict(zip(("day",) + COUNTER_COLUMNS, (date.fromisoformat(day) if isinstance(day, str) else day, *counters)))
+            for day, *counters in query.group_by(day_expr).all()
+        ]
+        db.execute(stale)
+        if rows:
+            db.execute(insert(DailyTransactionStats), rows)
+        return len(rows)
+
+    def ensure_initialized(self, db: Session) -> Optional[int]:
+        """Builds the rollup from existing transactions if it is empty. Returns the days written (None if nothing to do)."""
+        if db.query(DailyTransactionStats.day).first() is not None:
+            return None
+        if db.query(Transaction.id).first() is None:
+            return None
+        days = self.rebuild(db)
+        db.commit()
+        return days
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _increment(self, db: Session, day: date, delta: Dict[str, float]):
+        table = DailyTransactionStats.__table__
+        upsert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+        if upsert is not None:
+            stmt = upsert(table).values(day=day, **delta)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.day],
+                set_={column: table.c[column] + stmt.excluded[column] for column in delta},
+            ))
+            return
+        # Other databases: update, insert if the day has no row yet
+        result = db.execute(
+            update(table).where(table.c.day == day).values({column: table.c[column] + value for column, value in delta.items()})
+        )
+        if result.rowcount == 0:
+            db.execute(insert(table).values(day=day, **{**dict.fromkeys(COUNTER_COLUMNS, 0), **delta}))
+
+
+daily_stats = DailyStatsRollup()
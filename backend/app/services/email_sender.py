@@ -0,0 +1,126 @@
+import queue
+import smtplib
+import threading
+from email.mime.text import MIMEText
+from typing import List, NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class EmailMessage(NamedTuple):
+    to_email: str
+    subject: str
+    content: str
+
+
+class EmailSender:
+    """
+    Asynchronous, pooled e-mail delivery for fraud alerts.
+
+    send() queues the message and returns. `workers` threads drain the bounded
+    queue; each keeps its own SMTP connection open between messages (reconnecting
+    when the server drops it) instead of a connect + STARTTLS + login per e-mail.
+    Without SMTP credentials messages are printed, like the other mocked e-mails.
+    A full queue drops the message with a warning rather than blocking the caller.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 5000, smtp_server: Optional[str] = None,
+                 smtp_port: int = 587, smtp_username: Optional[str] = None, smtp_password: Optional[str] = None,
+                 timeout_s: float = 10.0):
+        self.workers = max(int(workers), 1)
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.smtp_username = smtp_username
+        self.smtp_password = smtp_password
+        self.timeout_s = timeout_s
+        self._queue: "queue.Queue[EmailMessage]" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def smtp_enabled(self) -> bool:
+        return bool(self.smtp_username and self.smtp_password)
+
+    def send(self, to_email: str, subject: str, content: str):
+        if self._closed:
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(EmailMessage(to_email, subject, content))
+        except queue.Full:
+            print(f"⚠️  E-mail queue full, alert to {to_email} dropped")
+
+    def close(self, timeout: float = 30.0):
+        """Sends what is queued, then closes the SMTP connections."""
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            threads = [
+                threading.Thread(target=self._run, name=f"email-sender-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            self._threads = threads
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout_s)
+        server.starttls()
+        server.login(self.smtp_username, self.smtp_password)
+        return server
+
+    def _run(self):
+        server = None
+        while True:
+            message = self._queue.get()
+            if message is None:
+                break
+            if not self.smtp_enabled:
+                print(f"\n📧 [EMAIL MOCK] To: {message.to_email} | Subject: {message.subject}\n"
+                      f"Content: {message.content}\n")
+                continue
+
+            msg = MIMEText(message.content, "plain")
+            msg["From"] = f"Sentinel <{self.smtp_username}>"
+            msg["To"] = message.to_email
+            msg["Subject"] = message.subject
+            for attempt in range(2):  # One reconnect if the pooled connection went stale
+                try:
+                    if server is None:
+                        server = self._connect()
+                    server.send_message(msg)
+                    break
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    server = None
+                    if attempt == 1:
+                        print(f"❌ Failed to send alert e-mail to {message.to_email}: {e}")
+                except smtplib.SMTPException as e:
+                    print(f"❌ Failed to send alert e-mail to {message.to_email}: {e}")
+                    break
+
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+
+email_sender = EmailSender(
+    workers=settings.EMAIL_SENDER_WORKERS,
+    smtp_server=settings.SMTP_SERVER,
+    smtp_port=int(settings.SMTP_PORT or 587),
+    smtp_username=settings.SMTP_USERNAME,
+    smtp_password=settings.SMTP_PASSWORD,
+)
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.customer_cache import customer_state_cache
+
+_STATS_KEYS = ("total_transactions", "fraud_detected", "under_review", "processing_ms_sum", "latency_count")
+
+
+def _stats_delta(status: str, processing_time_ms: Optional[float] = None, counted: int = 1) -> Dict[str, float]:
+    # Same counting as daily_stats: rows without a processing time don't enter the average
+    return {
+        "total_transactions": counted,
+        "fraud_detected": 1 if status == "Decline" else 0,    # "Decline" is "Fraud" on the dashboard
+        "under_review": 1 if status == "Escalate" else 0,
+        "processing_ms_sum": processing_time_ms or 0.0,
+        "latency_count": 1 if processing_time_ms is not None else 0,
+    }
+
+
+class LiveSubscriber:
+    """
+    One connected dashboard (GET /api/events). Holds only coalesced state, so a
+    slow client costs a bounded amount of memory however many events it misses:
+    the newest `feed_size` transactions, one stats delta per day, one unread delta.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, feed_size: int):
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._signalled = False
+        self.transactions = deque(maxlen=max(int(feed_size), 1))
+        self.stats: Dict[str, Dict[str, float]] = {}   # day (ISO date) -> accumulated delta
+        self.new_notifications = 0
+        self.notifications_read = False
+
+    def _signal(self):
+        # Bus lock held. One wake-up per drain, however many events arrive before it
+        if self._signalled:
+            return
+        self._signalled = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass  # Event loop already closed (shutdown)
+
+    def _add_stats(self, day: str, delta: Dict[str, float]):
+        acc = self.stats.setdefault(day, dict.fromkeys(_STATS_KEYS, 0))
+        for key, value in delta.items():
+            acc[key] += value
+
+    async def wait(self, timeout: float) -> bool:
+        """True once there is something to drain, False on timeout."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class LiveEventBus:
+    """
+    In-process fan-out of dashboard events to the GET /api/events clients.
+
+    The persistence paths publish after their commit (request threads, the
+    write-behind writer and the notification workers all call in), and each
+    subscriber merges the events into its pending state; its SSE loop drains
+    that state at most every LIVE_EVENTS_INTERVAL_MS. With no subscribers every
+    publish call returns immediately.
+
+    Only events of this process are seen; the snapshot a client gets on every
+    (re)connect, at least every LIVE_EVENTS_RESYNC_SECONDS, covers other worker
+    processes and any drift in the client-side totals.
+    """
+
+    def __init__(self, feed_size: int = 10):
+        self.feed_size = feed_size
+        self._subscribers: List[LiveSubscriber] = []
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return bool(self._subscribers)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> LiveSubscriber:
+        """Must be called on the event loop that will drain the subscriber."""
+        subscriber = LiveSubscriber(asyncio.get_running_loop(), self.feed_size)
+        with self._lock:
+            self._subscribers = self._subscribers + [subscriber]
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    def drain(self, subscriber: LiveSubscriber) -> Optional[dict]:
+        """Takes the subscriber's pending state (None if nothing changed) and resets it."""
+        with self._lock:
+            subscriber._wake.clear()
+            subscriber._signalled = False
+            if not (subscriber.transactions or subscriber.stats
+                    or subscriber.new_notifications or subscriber.notifications_read):
+                return None
+            pending = {
+                "transactions": list(reversed(subscriber.transactions)),  # Newest first, like /recent
+                "stats": [{"day": day, **delta} for day, delta in subscriber.stats.items()],
+                "notifications": {"read": subscriber.notifications_read, "new": subscriber.new_notifications},
+            }
+            subscriber.transactions.clear()
+            subscriber.stats = {}
+            subscriber.new_notifications = 0
+            subscriber.notifications_read = False
+        return pending
+
+    # ── publishers (any thread) ────────────────────────────────────────────
+    def publish_transactions(self, db: Session, rows: Iterable[dict]):
+        """
+        Newly committed transactions: Transaction column values including "id".
+        Rows are shaped like /api/transactions/recent (customer fields from the
+        customer-state cache); like that feed, rows without a customer are skipped.
+        """
+        if not self._subscribers:
+            return
+        rows = list(rows)
+        customers = customer_state_cache.get_many(db, (row["customer_id"] for row in rows))
+
+        feed, stats = [], {}
+        for row in rows:
+            day = row["timestamp"].date().isoformat()
+            delta = stats.setdefault(day, dict.fromkeys(_STATS_KEYS, 0))
+            for key, value in _stats_delta(row["status"], row["processing_time_ms"]).items():
+                delta[key] += value
+
+            customer = customers.get(row["customer_id"])
+            if customer is None:
+                continue
+            feed.append({
+                "id": row["id"],
+                "customer_id": row["customer_id"],
+                "merchant": row["merchant"],
+                "amount": row["amount"],
+                "timestamp": row["timestamp"],
+                "fraud_score": row["fraud_score"],
+                "status": row["status"],
+                "customer_name": customer.full_name,
+                "card_type": customer.card_type,
+                "card_last_four": customer.card_last_four,
+            })
+        feed.sort(key=lambda txn: txn["timestamp"])
+
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.transactions.extend(feed)
+                for day, delta in stats.items():
+                    subscriber._add_stats(day, delta)
+                subscriber._signal()
+
+    def publish_status_change(self, timestamp, old_status: str, new_status: str):
+        """A manual decision moved a transaction between the dashboard's counters."""
+        if not self._subscribers or old_status == new_status:
+            return
+        old = _stats_delta(old_status, counted=0)
+        new = _stats_delta(new_status, counted=0)
+        delta = {key: new[key] - old[key] for key in _STATS_KEYS}
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber._add_stats(timestamp.date().isoformat(), delta)
+                subscriber._signal()
+
+    def publish_notifications(self, count: int):
+        """`count` new unread in-app alerts were committed."""
+        if not self._subscribers or count <= 0:
+            return
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.new_notifications += count
+                subscriber._signal()
+
+    def publish_notifications_read(self):
+        """All alerts were marked read: unread counts restart from zero."""
+        if not self._subscribers:
+            return
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.notifications_read = True
+                subscriber.new_notifications = 0
+                subscriber._signal()
+
+
+live_events = LiveEventBus(feed_size=settings.LIVE_EVENTS_FEED_SIZE)
@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-transaction scoring calls into one vectorized model pass.
+
+    Each request thread calls submit() with its 1-D feature row and blocks on a Future.
+    A single background thread collects rows for up to `window_ms` (or until `max_rows`
+    are waiting), stacks them into an N x 30 matrix, runs `score_fn` once and hands
+    every caller its own row of the result.
+
+    `score_fn` takes an N x F matrix and returns a tuple of length-N arrays
+    (e.g. xgboost_scores, autoencoder_scores, reconstruction_errors).
+    Rows submitted with a `context` (e.g. the model version a request started
+    with) are only batched with rows sharing it, and score_fn receives it as a
+    second argument.
+    """
+
+    def __init__(self, score_fn, window_ms: float = 2.0, max_rows: int = 64):
+        self.score_fn = score_fn
+        self.window_s = max(window_ms, 0.0) / 1000.0
+        self.max_rows = max(int(max_rows), 1)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stops the scheduler; rows already queued are still scored before it exits."""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)  # Wake the worker
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, features_row, timeout: float = None, context=None):
+        """Scores one feature row through the shared batch. Blocks until the result is ready."""
+        return self.submit_future(features_row, context).result(timeout)
+
+    def submit_future(self, features_row, context=None) -> Future:
+        """Non-blocking submit: returns the Future (wrap with asyncio.wrap_future in async code)."""
+        if not self._running:
+            raise RuntimeError("MicroBatcher is not running")
+        future = Future()
+        self._queue.put((np.asarray(features_row, dtype=np.float64).ravel(), future, context))
+        return future
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _collect(self, first):
+        """Gathers rows that arrive within the batching window after `first`."""
+        batch = [first]
+        deadline = time.perf_counter() + self.window_s
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:  # Stop sentinel — finish this batch, then exit
+                self._running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _score(self, batch):
+        # Rows of different lengths (or contexts) can't share a matrix: score each group separately
+        groups = {}
+        for row, future, context in batch:
+            groups.setdefault((row.shape[0], id(context)), (context, []))[1].append((row, future))
+
+        for context, items in groups.values():
+            futures = [f for _, f in items]
+            try:
+                matrix = np.vstack([row for row, _ in items])
+                outputs = self.score_fn(matrix) if context is None else self.score_fn(matrix, context)
+                for i, future in enumerate(futures):
+                    future.set_result(tuple(float(out[i]) for out in outputs))
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if not self._running:
+                    break
+                continue
+            if first is None:
+                if not self._running:
+                    break
+                continue
+            self._score(self._collect(first))
+
+        # Drain anything submitted while stopping
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+        for start in range(0, len(leftovers), self.max_rows):
+            self._score(leftovers[start:start + self.max_rows])
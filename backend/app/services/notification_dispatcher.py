@@ -0,0 +1,148 @@
+import queue
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, NamedTuple
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.notification import Notification
+from app.services.live_events import live_events
+from app.services.notification_service import notification_service
+
+
+class NotificationJob(NamedTuple):
+    """One scored transaction whose alerts still have to go out."""
+    transaction_id: int
+    merchant: str
+    status: str
+    fraud_score: float
+    persist_alert: bool  # False when the in-app alert row was already written (write-behind)
+
+
+class NotificationDispatcher:
+    """
+    Moves check_and_notify off the request path.
+
+    The scoring endpoints enqueue a NotificationJob once the transaction is committed
+    and return. A small pool of worker threads drains the bounded queue; each worker
+    takes up to `max_batch` jobs at a time, inserts their in-app Notification rows
+    with one multi-row INSERT + commit, then sends the Slack / e-mail alerts.
+
+    When the queue stays full for `put_timeout_s`, dispatch() returns False and the
+    caller notifies inline, so a slow Slack endpoint slows scoring down rather than
+    growing the backlog without bound. stop() drains everything still queued.
+    """
+
+    def __init__(self, session_factory, queue_size: int = 10000, workers: int = 4,
+                 max_batch: int = 200, flush_interval_ms: float = 10.0, put_timeout_s: float = 0.5):
+        self.session_factory = session_factory
+        self.workers = max(int(workers), 1)
+        self.max_batch = max(int(max_batch), 1)
+        self.flush_interval_s = max(flush_interval_ms, 0.0) / 1000.0
+        self.put_timeout_s = put_timeout_s
+        self._queue: "queue.Queue[NotificationJob]" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._run, name=f"notification-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Stops accepting jobs and blocks until the queue has been drained."""
+        if not self._running:
+            return
+        self._running = False
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0.0))
+        self._threads = []
+
+    def dispatch(self, transaction_id: int, merchant: str, status: str, fraud_score: float,
+                 persist_alert: bool = True) -> bool:
+        """Queues the alerts for one transaction. Returns False if the caller must notify inline."""
+        if not self._running:
+            return False
+        try:
+            self._queue.put(
+                NotificationJob(transaction_id, merchant, status, fraud_score, persist_alert),
+                timeout=self.put_timeout_s,
+            )
+            return True
+        except queue.Full:
+            return False
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _run(self):
+        while self._running or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.perf_counter() + self.flush_interval_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, jobs: List[NotificationJob]):
+        db = self.session_factory()
+        try:
+            # 1. In-app alerts for the whole batch in one round-trip
+            alerts = []
+            for job in jobs:
+                if job.persist_alert:
+                    alert = notification_service.build_alert(job.transaction_id, job.merchant, job.status, job.fraud_score)
+                    if alert:
+                        alerts.append(alert)
+            if alerts:
+                try:
+                    db.execute(insert(Notification), alerts)
+                    db.commit()
+                    live_events.publish_notifications(len(alerts))
+                except Exception as e:
+                    db.rollback()
+                    print(f"❌ Failed to store {len(alerts)} notifications: {e}")
+
+            # 2-3. Slack + e-mail, one transaction at a time
+            for job in jobs:
+                if notification_service.needs_external_alert(job.fraud_score):
+                    try:
+                        notification_service.send_external_alerts(
+                            db, SimpleNamespace(id=job.transaction_id, fraud_score=job.fraud_score)
+                        )
+                    except Exception as e:
+                        print(f"⚠️  External alert for transaction {job.transaction_id} failed: {e}")
+        finally:
+            db.close()
+
+
+notification_dispatcher = NotificationDispatcher(
+    SessionLocal,
+    queue_size=settings.NOTIFICATION_QUEUE_SIZE,
+    workers=settings.NOTIFICATION_WORKERS,
+    max_batch=settings.NOTIFICATION_MAX_BATCH,
+    flush_interval_ms=settings.NOTIFICATION_FLUSH_MS,
+)
@@ -1,66 +1,85 @@
-import requests
-import json
 from sqlalchemy.orm import Session
-from app.models.config import SystemConfig
+from app.services.config_cache import config_cache
+from app.services.email_sender import email_sender
+from app.services.slack_client import slack_client
+from app.services.subscriber_registry import subscriber_registry
+from app.services.live_events import live_events
 from app.models.user import User
 from app.models.notification import Notification
 
 
 class NotificationService:
 
-    def create_alert(self, db: Session, transaction):
+    def build_alert(self, transaction_id: int, merchant: str, status: str, fraud_score: float):
         """
-        Creates a persistent Notification record in the database.
-        Called automatically after every transaction scored by the AI.
+        Returns the Notification column values for a scored transaction,
+        or None if its status doesn't warrant an in-app alert.
         """
-        score_pct = transaction.fraud_score * 100
+        score_pct = fraud_score * 100
 
-        if transaction.status == "Decline":
-            notif = Notification(
-                title="🚨 Critical Fraud Detected",
-                message=(
-                    f"Transaction #{transaction.id} at '{transaction.merchant}' "
+        if status == "Decline":
+            return {
+                "title": "🚨 Critical Fraud Detected",
+                "message": (
+                    f"Transaction #{transaction_id} at '{merchant}' "
                     f"was declined — Score: {score_pct:.0f}%"
                 ),
-                severity="critical",
-                transaction_id=transaction.id,
-                is_read=False,
-            )
-            db.add(notif)
-            db.commit()
+                "severity": "critical",
+                "transaction_id": transaction_id,
+                "is_read": False,
+            }
 
-        elif transaction.status == "Escalate":
-            notif = Notification(
-                title="⚠️ Manual Review Required",
-                message=(
-                    f"Transaction #{transaction.id} at '{transaction.merchant}' "
+        elif status == "Escalate":
+            return {
+                "title": "⚠️ Manual Review Required",
+                "message": (
+                    f"Transaction #{transaction_id} at '{merchant}' "
                     f"needs review — Score: {score_pct:.0f}%"
                 ),
-                severity="warning",
-                transaction_id=transaction.id,
-                is_read=False,
-            )
-            db.add(notif)
+                "severity": "warning",
+                "transaction_id": transaction_id,
+                "is_read": False,
+            }
+
+        return None
+
+    def create_alert(self, db: Session, transaction):
+        """
+        Creates a persistent Notification record in the database.
+        Called automatically after every transaction scored by the AI.
+        """
+        alert = self.build_alert(transaction.id, transaction.merchant, transaction.status, transaction.fraud_score)
+        if alert:
+            db.add(Notification(**alert))
             db.commit()
+            live_events.publish_notifications(1)
 
     def send_slack_alert(self, db: Session, message: str):
-        """Sends a message to the configured Slack Webhook."""
-        config = db.query(SystemConfig).filter(SystemConfig.key == "slack_webhook_url").first()
-        if not config or not config.value:
+        """
+        Queues a message for the configured Slack Webhook.
+        Delivery (pooling, coalescing, rate limit, retries) is handled by slack_client.
+        """
+        webhook_url = config_cache.get(db).slack_webhook_url
+        if not webhook_url:
             return  # No webhook configured
 
-        try:
-            payload = {"text": message}
-            response = requests.post(config.value, json=payload)
-            if response.status_code != 200:
-                print(f"❌ Failed to send Slack alert: {response.text}")
-        except Exception as e:
-            print(f"❌ Error sending Slack alert: {e}")
+        slack_client.send(webhook_url, message)
 
     def send_email_alert(self, to_email: str, subject: str, content: str):
-        """Mock/Placeholder for sending email."""
-        print(f"\n📧 [EMAIL MOCK] To: {to_email} | Subject: {subject}")
-        print(f"Content: {content}\n")
+        """Queues an e-mail on the pooled sender (mocked to the console without SMTP credentials)."""
+        email_sender.send(to_email, subject, content)
+
+    def is_actionable(self, status: str, fraud_score: float) -> bool:
+        """
+        True if check_and_notify would do anything for this decision
+        (in-app alert for Decline/Escalate, Slack above 70%).
+        Lets batch scoring skip the call for the clean majority of transactions.
+        """
+        return status in ("Decline", "Escalate") or self.needs_external_alert(fraud_score)
+
+    def needs_external_alert(self, fraud_score: float) -> bool:
+        """True if send_external_alerts would send anything (Slack above 70%; e-mail starts at 90%)."""
+        return fraud_score * 100 > 70
 
     def check_and_notify(self, db: Session, transaction, customer_user: User = None):
         """
@@ -70,10 +89,15 @@ class NotificationService:
         # 1. Persist in-app alert (drives the red dot)
         self.create_alert(db, transaction)
 
+        # 2-3. Slack + e-mail
+        self.send_external_alerts(db, transaction)
+
+    def send_external_alerts(self, db: Session, transaction):
+        """Slack (score > 70%) and subscriber e-mail (score > 90%) for an already-persisted transaction."""
         fraud_score_percent = transaction.fraud_score * 100
 
         # 2. Global Slack Alert (System Config)
-        if fraud_score_percent > 70:
+        if self.needs_external_alert(transaction.fraud_score):
             self.send_slack_alert(
                 db,
                 f"🚨 High Verification Alert! Transaction ID: {transaction.id} | Score: {fraud_score_percent:.1f}%",
@@ -81,18 +105,12 @@ class NotificationService:
 
         # 3. User Email Alerts (Subscribed Users — scores > 90%)
         if fraud_score_percent > 90:
-            users = db.query(User).all()
-            for user in users:
-                try:
-                    prefs = json.loads(user.notification_preferences) if user.notification_preferences else {}
-                    if prefs.get("email_high_risk"):
-                        self.send_email_alert(
-                            user.email,
-                            "🚨 CRITICAL FRAUD ALERT",
-                            f"Transaction {transaction.id} has a score of {fraud_score_percent:.1f}%.",
-                        )
-                except Exception:
-                    continue
+            for email in subscriber_registry.emails(db):
+                self.send_email_alert(
+                    email,
+                    "🚨 CRITICAL FRAUD ALERT",
+                    f"Transaction {transaction.id} has a score of {fraud_score_percent:.1f}%.",
+                )
 
 
 notification_service = NotificationService()
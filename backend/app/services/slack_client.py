@@ -0,0 +1,191 @@
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, up to `burst` saved up."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 1e-6)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Takes one token, sleeping if needed. Returns False if `deadline` (monotonic) passes first."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class SlackWebhookClient:
+    """
+    Pooled, coalescing Slack incoming-webhook sender.
+
+    send() only buffers the message. A background thread waits `coalesce_window_ms`
+    after the first buffered message, then posts everything collected for the same
+    webhook as one message (at most `max_messages_per_post` lines each), over a
+    keep-alive connection pool.
+
+    Each post is rate-limited by a token bucket, retried on connection errors,
+    429 and 5xx with jittered exponential backoff (honouring Retry-After), and
+    bounded by a per-request timeout plus an overall delivery deadline.
+    """
+
+    def __init__(self, coalesce_window_ms: float = 1000.0, max_messages_per_post: int = 20,
+                 rate_per_second: float = 1.0, burst: int = 3, max_retries: int = 3,
+                 timeout_s: float = 5.0, deadline_s: float = 30.0, pool_size: int = 4,
+                 backoff_base_s: float = 0.5, backoff_max_s: float = 8.0, max_pending: int = 1000):
+        self.coalesce_window_s = max(coalesce_window_ms, 0.0) / 1000.0
+        self.max_messages_per_post = max(int(max_messages_per_post), 1)
+        self.max_retries = max(int(max_retries), 0)
+        self.timeout_s = timeout_s
+        self.deadline_s = deadline_s
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.max_pending = max(int(max_pending), 1)
+
+        self._bucket = TokenBucket(rate_per_second, burst)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._pending: Dict[str, List[str]] = {}  # webhook url -> buffered messages
+        self._pending_count = 0
+        self._inflight = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def send(self, webhook_url: str, text: str):
+        """Buffers one alert for `webhook_url`; it is posted after the coalescing window."""
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending_count >= self.max_pending:
+                print(f"⚠️  Slack buffer full ({self.max_pending}), alert dropped")
+                return
+            self._pending.setdefault(webhook_url, []).append(text)
+            self._pending_count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slack-client", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Blocks until every buffered alert has been delivered (or given up on)."""
+        end = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._pending_count or self._inflight:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 30.0):
+        """Delivers what is still buffered (without waiting out the window) and closes the pool."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._session.close()
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending_count and not self._closed:
+                    self._cond.wait()
+                if not self._pending_count:
+                    return
+                # Coalescing window, measured from the first buffered alert
+                window_end = time.monotonic() + self.coalesce_window_s
+                while not self._closed:
+                    remaining = window_end - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, {}
+                self._inflight, self._pending_count = self._pending_count, 0
+
+            for url, messages in batch.items():
+                for start in range(0, len(messages), self.max_messages_per_post):
+                    chunk = messages[start:start + self.max_messages_per_post]
+                    try:
+                        self._deliver(url, "\n".join(chunk))
+                    except Exception as e:
+                        # Anything unexpected must not kill the thread: post() never restarts it
+                        print(f"❌ Slack alert delivery crashed, {len(chunk)} alert(s) dropped: {e}")
+                    finally:
+                        with self._cond:
+                            self._inflight -= len(chunk)
+                            self._cond.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform(0, min(cap, base * 2^attempt))
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)))
+
+    def _deliver(self, url: str, text: str) -> bool:
+        deadline = time.monotonic() + self.deadline_s
+        for attempt in range(self.max_retries + 1):
+            if not self._bucket.acquire(deadline):
+                break
+            retry_after = None
+            try:
+                response = self._session.post(url, json={"text": text}, timeout=self.timeout_s)
+            except requests.RequestException as e:
+                print(f"⚠️  Slack alert attempt {attempt + 1} failed: {e}")
+            else:
+                if 200 <= response.status_code < 300:
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    print(f"❌ Failed to send Slack alert: {response.status_code} {response.text}")
+                    return False
+                print(f"⚠️  Slack alert attempt {attempt + 1} got HTTP {response.status_code}")
+                try:
+                    retry_after = float(response.headers.get("Retry-After"))
+                except (TypeError, ValueError):
+                    retry_after = None
+
+            if attempt == self.max_retries:
+                break
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            if time.monotonic() + delay > deadline:
+                break
+            time.sleep(delay)
+
+        print(f"❌ Failed to send Slack alert after {attempt + 1} attempt(s)")
+        return False
+
+
+slack_client = SlackWebhookClient(
+    coalesce_window_ms=settings.SLACK_COALESCE_WINDOW_MS,
+    max_messages_per_post=settings.SLACK_MAX_MESSAGES_PER_POST,
+    rate_per_second=settings.SLACK_RATE_PER_SECOND,
+    burst=settings.SLACK_RATE_BURST,
+    max_retries=settings.SLACK_MAX_RETRIES,
+    timeout_s=settings.SLACK_TIMEOUT_SECONDS,
+    deadline_s=settings.SLACK_DELIVERY_DEADLINE_SECONDS,
+)
@@ -0,0 +1,76 @@
+import json
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+
+
+def wants_high_risk_email(notification_preferences: Optional[str]) -> bool:
+    """True if a user's notification_preferences JSON opts in to high-risk e-mail alerts."""
+    try:
+        prefs = json.loads(notification_preferences) if notification_preferences else {}
+    except (TypeError, ValueError):
+        return False
+    return isinstance(prefs, dict) and bool(prefs.get("email_high_risk"))
+
+
+class HighRiskSubscriberRegistry:
+    """
+    In-memory set of users subscribed to high-risk e-mail alerts (user id (UUID string) -> e-mail).
+
+    Built with one scan of the users table, then kept current by
+    UserService.update_profile calling update(); the TTL picks up profile
+    changes made by other worker processes. Alert fan-out reads an immutable
+    tuple of addresses instead of loading and parsing every User row.
+
+    update() and invalidate() bump a generation counter; a load() whose scan
+    overlapped one of them is discarded, so a TTL reload cannot put back a
+    preference that was changed while it was reading.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._subscribers: Dict[str, str] = {}
+        self._emails: Tuple[str, ...] = ()
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def emails(self, db: Session) -> Tuple[str, ...]:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl_seconds:
+            self.load(db)
+        return self._emails
+
+    def load(self, db: Session):
+        generation = self._generation
+        rows = db.query(User.id, User.email, User.notification_preferences).all()
+        subscribers = {user_id: email for user_id, email, prefs in rows if wants_high_risk_email(prefs)}
+        with self._lock:
+            if generation != self._generation:
+                return  # update() / invalidate() ran during the scan: keep the newer state
+            self._subscribers = subscribers
+            self._emails = tuple(subscribers.values())
+            self._loaded_at = time.monotonic()
+
+    def update(self, user: User):
+        """Adds or removes one user after their preferences were committed."""
+        with self._lock:
+            self._generation += 1
+            if wants_high_risk_email(user.notification_preferences):
+                self._subscribers[user.id] = user.email
+            else:
+                self._subscribers.pop(user.id, None)
+            self._emails = tuple(self._subscribers.values())
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._loaded_at = None
+
+
+subscriber_registry = HighRiskSubscriberRegistry(ttl_seconds=settings.SUBSCRIBER_REGISTRY_TTL_SECONDS)
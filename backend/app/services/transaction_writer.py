@@ -0,0 +1,157 @@
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from app.models.notification import Notification
+from app.models.transaction import Transaction
+from app.services.live_events import live_events
+from app.services.daily_stats import daily_stats
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.notification_service import notification_service
+
+
+class TransactionWriter:
+    """
+    Write-behind persistence for scored transactions (TRANSACTION_PERSISTENCE=write_behind).
+
+    /api/predict hands over the Transaction column values and returns immediately.
+    A background thread drains the bounded queue every `flush_interval_ms` and
+    writes each group with one multi-row INSERT for transactions, one for their
+    Notification alerts, and a single commit. Slack / e-mail alerts for the
+    flushed rows are then handed to the notification dispatcher.
+
+    When the queue stays full for `put_timeout_s`, submit() returns False and the
+    caller falls back to a synchronous write, so pressure slows producers down
+    instead of dropping decisions. stop() drains everything still queued: the
+    running check in submit() and the stop signal share one lock, and the writer
+    thread only exits once no submit() is mid-put and the queue is empty.
+    """
+
+    def __init__(self, session_factory, queue_size: int = 10000, flush_interval_ms: float = 5.0,
+                 max_batch: int = 500, put_timeout_s: float = 0.5):
+        self.session_factory = session_factory
+        self.flush_interval_s = max(flush_interval_ms, 0.0) / 1000.0
+        self.max_batch = max(int(max_batch), 1)
+        self.put_timeout_s = put_timeout_s
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._running = False
+        self._submitting = 0  # submit() calls past the running check, still putting
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="transaction-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Stops accepting work and blocks until every queued row has been flushed."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"❌ Write-behind writer still busy after {timeout:.0f}s: "
+                  f"{self._queue.qsize()} queued transactions will be lost at exit")
+        self._thread = None
+
+    def submit(self, txn_fields: dict) -> bool:
+        """Queues one Transaction's column values. Returns False if the caller must write it itself."""
+        with self._lock:
+            if not self._running:
+                return False
+            self._submitting += 1
+        try:
+            self._queue.put(txn_fields, timeout=self.put_timeout_s)
+            return True
+        except queue.Full:
+            return False
+        finally:
+            with self._lock:
+                self._submitting -= 1
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _done(self) -> bool:
+        with self._lock:
+            return not self._running and not self._submitting and self._queue.empty()
+
+    def _run(self):
+        while not self._done():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.perf_counter() + self.flush_interval_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, rows):
+        db = self.session_factory()
+        try:
+            ids = db.execute(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                rows,
+            ).scalars().all()
+
+            alerts = []
+            for row, txn_id in zip(rows, ids):
+                alert = notification_service.build_alert(txn_id, row["merchant"], row["status"], row["fraud_score"])
+                if alert:
+                    alerts.append(alert)
+            if alerts:
+                db.execute(insert(Notification), alerts)
+            daily_stats.record(db, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            db.close()
+            if len(rows) > 1:
+                # Isolate the bad row(s) so one failure doesn't lose the whole group
+                for row in rows:
+                    self._flush([row])
+            else:
+                print(f"❌ Write-behind insert failed, transaction dropped: {e}")
+            return
+
+        try:
+            if live_events.active:
+                live_events.publish_transactions(db, [{**row, "id": txn_id} for row, txn_id in zip(rows, ids)])
+                live_events.publish_notifications(len(alerts))
+        except Exception as e:
+            print(f"⚠️  Live feed update after write-behind flush failed: {e}")
+
+        # Alert rows are already committed; only Slack / e-mail remain
+        try:
+            for row, txn_id in zip(rows, ids):
+                if not notification_service.needs_external_alert(row["fraud_score"]):
+                    continue
+                if not notification_dispatcher.dispatch(
+                    txn_id, row["merchant"], row["status"], row["fraud_score"], persist_alert=False
+                ):
+                    notification_service.send_external_alerts(
+                        db, SimpleNamespace(id=txn_id, fraud_score=row["fraud_score"])
+                    )
+        except Exception as e:
+            print(f"⚠️  External alerts after write-behind flush failed: {e}")
+        finally:
+            db.close()
@@ -4,6 +4,7 @@ import json
 from app.repositories.user_repo import user_repo
 from app.schemas.user import UserCreate, UserUpdate
 from app.models.user import User
+from app.services.subscriber_registry import subscriber_registry
 from app.utils.password import get_password_hash
 from app.utils.security_2fa import generate_totp_secret, get_totp_uri, verify_totp
 
@@ -82,6 +83,8 @@ class UserService:
         db.refresh(user)
         db.commit()
         db.refresh(user)
+        # Keep the high-risk e-mail fan-out list in sync
+        subscriber_registry.update(user)
         return user
 
     def forgot_password(self, db: Session, email: str):
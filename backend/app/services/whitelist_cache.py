@@ -0,0 +1,60 @@
+import threading
+import time
+from typing import FrozenSet, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.rules import MerchantWhitelist
+
+
+def normalize_merchant_name(name: str) -> str:
+    """Canonical form used for whitelist matching (case-insensitive, surrounding spaces ignored)."""
+    return (name or "").strip().lower()
+
+
+class MerchantWhitelistIndex:
+    """
+    In-memory, case-insensitive hash set of whitelisted merchants.
+
+    The scoring path checks membership in O(1) without a database round-trip.
+    add_merchant / remove_merchant call rebuild() after committing, which swaps in
+    a freshly built frozenset in one assignment; the TTL picks up changes made
+    by other worker processes. As in the config cache, rebuild() and invalidate()
+    bump a generation counter, and a rebuild that was overtaken while querying
+    does not install its (possibly pre-write) set.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._state: Optional[Tuple[FrozenSet[str], float]] = None  # (names, loaded_at)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def names(self, db: Session) -> FrozenSet[str]:
+        state = self._state
+        if state is None or time.monotonic() - state[1] > self.ttl_seconds:
+            return self.rebuild(db)
+        return state[0]
+
+    def contains(self, db: Session, merchant: str) -> bool:
+        return normalize_merchant_name(merchant) in self.names(db)
+
+    def rebuild(self, db: Session) -> FrozenSet[str]:
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        rows = db.query(MerchantWhitelist.merchant_name).all()
+        names = frozenset(normalize_merchant_name(name) for (name,) in rows)
+        with self._lock:
+            if generation == self._generation:
+                self._state = (names, time.monotonic())
+        return names
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._state = None
+
+
+merchant_whitelist_index = MerchantWhitelistIndex(ttl_seconds=settings.WHITELIST_CACHE_TTL_SECONDS)
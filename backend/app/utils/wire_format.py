@@ -0,0 +1,92 @@
+"""
+Binary wire format for /api/predict and /api/predict/batch.
+
+Content-Type: application/x-fraud-transactions. All fields are little-endian.
+
+    offset  size            field
+    0       4               magic b"FTX1"
+    4       4   uint32      count        (transactions in the body; 1 for /api/predict)
+    8       2   uint16      n_features   (must be 30)
+    10      2               reserved (0)
+    12      4*count*n       float32      features, row-major (count x n_features)
+    ..      4*count         uint32       customer_id per transaction
+    ..      8*count         float64      amount per transaction (LKR)
+    ..      2*count         uint16       merchant name length in bytes
+    ..      sum(lengths)    utf-8        merchant names, concatenated
+
+The feature block is decoded with np.frombuffer: no per-element parsing or
+validation, and the (count x n_features) matrix is a view on the request
+body. The feature count is checked once, from the header.
+"""
+import struct
+
+import numpy as np
+
+MEDIA_TYPE = "application/x-fraud-transactions"
+MAGIC = b"FTX1"
+N_FEATURES = 30
+
+_HEADER = struct.Struct("<4sIHH")
+
+
+class WireFormatError(ValueError):
+    """Malformed binary transaction payload."""
+
+
+def decode_transactions(body: bytes):
+    """
+    Returns (features, customer_ids, amounts, merchants):
+    features is a read-only float32 (count x n_features) view on `body`.
+    """
+    if len(body) < _HEADER.size:
+        raise WireFormatError("Body shorter than the header")
+    magic, count, n_features, _ = _HEADER.unpack_from(body)
+    if magic != MAGIC:
+        raise WireFormatError("Bad magic (expected FTX1)")
+    if n_features != N_FEATURES:
+        raise WireFormatError(f"Expected {N_FEATURES} features per transaction, got {n_features}")
+
+    offset = _HEADER.size
+    fixed_size = offset + count * (4 * n_features + 4 + 8 + 2)
+    if len(body) < fixed_size:
+        raise WireFormatError(f"Body too short for {count} transactions")
+
+    features = np.frombuffer(body, dtype="<f4", count=count * n_features, offset=offset).reshape(count, n_features)
+    offset += 4 * count * n_features
+    customer_ids = np.frombuffer(body, dtype="<u4", count=count, offset=offset)
+    offset += 4 * count
+    amounts = np.frombuffer(body, dtype="<f8", count=count, offset=offset)
+    offset += 8 * count
+    lengths = np.frombuffer(body, dtype="<u2", count=count, offset=offset)
+    offset += 2 * count
+
+    if len(body) != offset + int(lengths.sum()):
+        raise WireFormatError("Merchant block length does not match the body size")
+    merchants = []
+    try:
+        for length in lengths.tolist():
+            merchants.append(body[offset:offset + length].decode("utf-8"))
+            offset += length
+    except UnicodeDecodeError as e:
+        raise WireFormatError(f"Merchant name is not valid UTF-8: {e}")
+
+    return features, customer_ids, amounts, merchants
+
+
+def encode_transactions(features, customer_ids, amounts, merchants) -> bytes:
+    """Client-side counterpart of decode_transactions (used by the benchmarks / simulators)."""
+    features = np.ascontiguousarray(features, dtype="<f4")
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    count, n_features = features.shape
+    names = [str(m).encode("utf-8") for m in merchants]
+    if not (len(customer_ids) == len(amounts) == len(names) == count):
+        raise WireFormatError("features, customer_ids, amounts and merchants must have one entry per transaction")
+    return b"".join([
+        _HEADER.pack(MAGIC, count, n_features, 0),
+        features.tobytes(),
+        np.asarray(customer_ids, dtype="<u4").tobytes(),
+        np.asarray(amounts, dtype="<f8").tobytes(),
+        np.array([len(n) for n in names], dtype="<u2").tobytes(),
+        *names,
+    ])
@@ -0,0 +1,101 @@
+"""
+XGBoost Inference Backend Benchmark
+===================================
+
+Compares the XGBOOST_BACKEND options on fraud_model.pkl:
+    sklearn  — XGBClassifier.predict_proba (DMatrix + sklearn wrapper)
+    inplace  — Booster.inplace_predict
+    flat     — FlatTreeEnsemble (flattened NumPy tree arrays)
+    auto     — flat up to --flat-max-rows, inplace above
+
+For each batch size it reports the time per call and per row, and checks
+that the probabilities match the sklearn wrapper. Exits non-zero on a parity
+failure.
+
+Usage:
+    python benchmark_xgboost_backends.py
+    python benchmark_xgboost_backends.py --sizes 1 8 64 --repeats 500
+"""
+
+import argparse
+import sys
+import time
+import joblib
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+from app.ml.tree_ensemble import AutoXGBoostPredictor, FlatTreeEnsemble, InplaceBoosterPredictor
+
+
+def make_features(n_rows, seed=7):
+    """Simulator-shaped rows: uniform PCA features, ~10% with attack spikes, a few NaNs."""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-2.0, 2.0, size=(n_rows, 30))
+    attacks = rng.random(n_rows) < 0.10
+    X[attacks, 0] = 50.0
+    X[attacks, 4] = -50.0
+    X[rng.random((n_rows, 30)) < 0.001] = np.nan
+    return X
+
+
+def time_call(fn, X, repeats):
+    fn(X)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XGBoost inference backends")
+    parser.add_argument("--model", default="fraud_model.pkl")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 64, 512, 4096])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--flat-max-rows", type=int, default=16, help="Cut-over used by the auto backend")
+    parser.add_argument("--tolerance", type=float, default=1e-5, help="Max abs probability difference")
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    backends = {
+        "sklearn": model,
+        "inplace": InplaceBoosterPredictor(model),
+        "flat": FlatTreeEnsemble.from_xgb_model(model),
+        "auto": AutoXGBoostPredictor(model, args.flat_max_rows),
+    }
+    flat = backends["flat"]
+
+    print("\n" + "="*112)
+    print("⏱️  XGBOOST INFERENCE BACKENDS")
+    print(f"   {flat.n_trees} trees, max depth {flat.max_depth}, {len(flat.feature)} nodes")
+    print("="*112)
+
+    # ── Parity ────────────────────────────────────────────────────────────
+    X = make_features(20000)
+    reference = model.predict_proba(X)[:, 1]
+    ok = True
+    for name in ("inplace", "flat", "auto"):
+        diff = float(np.max(np.abs(backends[name].predict_proba(X)[:, 1] - reference)))
+        passed = diff <= args.tolerance
+        ok &= passed
+        print(f"\n🔍 Parity {name:<8} vs sklearn: max |Δp| = {diff:.2e}  {'✅' if passed else '❌'}")
+
+    # ── Timing ────────────────────────────────────────────────────────────
+    print(f"\n{'batch':>6} | " + " | ".join(f"{name + ' µs/call (µs/row)':>24}" for name in backends))
+    print("-"*112)
+    for size in args.sizes:
+        X = make_features(size, seed=size)
+        repeats = max(3, args.repeats // max(1, size // 64))
+        timings = {name: time_call(b.predict_proba, X, repeats) for name, b in backends.items()}
+        cells = [f"{t * 1e6:>9.1f} ({t * 1e6 / size:>7.2f})" for t in timings.values()]
+        print(f"{size:>6} | " + " | ".join(f"{c:>24}" for c in cells)
+              + f"   auto x{timings['sklearn'] / timings['auto']:.1f} vs sklearn")
+
+    print()
+    if not ok:
+        print("❌ Parity check FAILED")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
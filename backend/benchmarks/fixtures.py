@@ -0,0 +1,127 @@
+"""
+Deterministic fixtures for the benchmark suite.
+
+- Stand-in model artifacts: a small XGBoost classifier trained on seeded
+  synthetic rows and a random-weight NumpyAutoencoder with the production
+  layer shapes. They are written under the same file names the app loads,
+  so the normal startup / model registry code path is exercised, but
+  without the real (large, TensorFlow) artifacts.
+- Seed data: customers and 7 days of transactions, topped up in place so
+  successive data sizes reuse the rows already inserted.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import joblib
+import numpy as np
+
+N_FEATURES = 30
+AUTOENCODER_LAYERS = [30, 20, 15, 10, 15, 20, 30]
+MERCHANTS = ["Amazon", "Netflix", "Uber", "Apple", "Walmart", "Target", "Daraz", "PickMe", "DarkWeb Store"]
+TRANSACTIONS_PER_CUSTOMER = 50
+
+
+def make_features(n_rows: int, seed: int = 7) -> np.ndarray:
+    """Simulator-shaped rows: uniform PCA features, ~10% with attack spikes."""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-2.0, 2.0, size=(n_rows, N_FEATURES))
+    attacks = rng.random(n_rows) < 0.10
+    X[attacks, 0] = 50.0
+    X[attacks, 4] = -50.0
+    return X
+
+
+def write_stand_in_models(directory: str, seed: int = 0):
+    """Writes fraud_model.pkl, autoencoder_numpy.npz and autoencoder_metadata.pkl into `directory`."""
+    from xgboost import XGBClassifier
+    from app.ml.numpy_autoencoder import NumpyAutoencoder
+
+    X = make_features(4000, seed=seed)
+    y = (X[:, 0] > 10).astype(int)
+    model = XGBClassifier(n_estimators=50, max_depth=4, random_state=seed, n_jobs=1, tree_method="hist")
+    model.fit(X, y)
+    joblib.dump(model, os.path.join(directory, "fraud_model.pkl"))
+
+    rng = np.random.default_rng(seed)
+    shapes = list(zip(AUTOENCODER_LAYERS[:-1], AUTOENCODER_LAYERS[1:]))
+    autoencoder = NumpyAutoencoder(
+        weights=[rng.normal(0.0, 1.0 / np.sqrt(n_in), size=(n_in, n_out)) for n_in, n_out in shapes],
+        biases=[np.zeros(n_out) for _, n_out in shapes],
+        activations=["relu"] * (len(shapes) - 1) + ["sigmoid"],
+        scaler_mean=np.zeros(N_FEATURES),
+        scaler_scale=np.full(N_FEATURES, 1.2),
+    )
+    autoencoder.save(os.path.join(directory, "autoencoder_numpy.npz"))
+
+    errors = autoencoder.reconstruction_error(make_features(4000, seed=seed + 1))
+    joblib.dump({"reconstruction_threshold": float(np.percentile(errors, 95))},
+                os.path.join(directory, "autoencoder_metadata.pkl"))
+
+
+def make_payloads(n: int, customer_count: int, seed: int = 11) -> list:
+    """/api/predict request bodies (same shape as Simulator/simulator.py sends)."""
+    rng = np.random.default_rng(seed)
+    X = make_features(n, seed=seed)
+    return [
+        {
+            "features": X[i].tolist(),
+            "metadata": {
+                "customer_id": int(rng.integers(1, customer_count + 1)),
+                "merchant": MERCHANTS[int(rng.integers(len(MERCHANTS)))],
+                "amount": round(float(rng.uniform(500.0, 15000.0)), 2),
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def seed_database(session_factory, n_transactions: int, seed: int = 3):
+    """Tops the customers / transactions tables up to the requested size (never deletes)."""
+    from sqlalchemy import func, insert
+    from app.models.customer import Customer
+    from app.models.transaction import Transaction
+    from app.services.daily_stats import daily_stats
+
+    n_customers = max(n_transactions // TRANSACTIONS_PER_CUSTOMER, 10)
+    db = session_factory()
+    try:
+        have_customers = db.query(func.count(Customer.id)).scalar()
+        if have_customers < n_customers:
+            db.execute(insert(Customer), [
+                {
+                    "full_name": f"Customer {i:05d}",
+                    "email": f"customer{i:05d}@bench.local",
+                    "card_type": "Visa" if i % 3 else "Mastercard",
+                    "card_last_four": f"{i % 10000:04d}",
+                }
+                for i in range(have_customers + 1, n_customers + 1)
+            ])
+
+        have_transactions = db.query(func.count(Transaction.id)).scalar()
+        missing = n_transactions - have_transactions
+        if missing > 0:
+            rng = np.random.default_rng(seed + have_transactions)
+            now = datetime.now()
+            scores = rng.beta(0.6, 4.0, size=missing)
+            statuses = np.where(scores > 0.8, "Decline", np.where(scores > 0.5, "Escalate", "Approve"))
+            db.execute(insert(Transaction), [
+                {
+                    "customer_id": int(rng.integers(1, n_customers + 1)),
+                    "merchant": MERCHANTS[int(rng.integers(len(MERCHANTS)))],
+                    "amount": round(float(rng.uniform(500.0, 15000.0)), 2),
+                    "timestamp": now - timedelta(seconds=float(rng.uniform(0, 7 * 86400))),
+                    "fraud_score": round(float(scores[i]), 4),
+                    "xgboost_score": round(float(scores[i]), 4),
+                    "autoencoder_score": round(float(rng.random()), 4),
+                    "reconstruction_error": round(float(rng.random()), 6),
+                    "status": str(statuses[i]),
+                    "processing_time_ms": float(rng.uniform(5.0, 40.0)),
+                }
+                for i in range(missing)
+            ])
+            daily_stats.rebuild(db)  # Inserted around the scoring path: recount the dashboard rollup
+        db.commit()
+        return n_customers
+    finally:
+        db.close()
@@ -0,0 +1,236 @@
+"""
+API Hot-Path Benchmark Suite
+============================
+
+Runs the FastAPI app in-process (TestClient, no server) on a throw-away
+SQLite database with small deterministic stand-in models, and times the
+hot endpoints at several data sizes:
+
+    predict          POST /api/predict
+    predict_batch    POST /api/predict/batch (64 transactions)
+    *_binary         the same two in the binary wire format
+    customers        GET  /api/customers (first page; customers_1000 for a 1000-row page)
+    transactions     GET  /api/transactions (full list) and /api/transactions/recent
+    trends           GET  /api/dashboard/trends (7 days; trends_90 for 90)
+    stats            GET  /api/dashboard/stats
+    search           GET  /api/search?q=...
+    report_*         GET  /api/reports/... (all four CSV reports)
+
+Read-only endpoints run first at each size, then the writing ones, so every
+size is measured against exactly the same seeded rows. Each benchmark runs
+for at least --min-time seconds (and --min-runs calls) and reports the
+median / p95 / mean per call.
+
+Results can be saved as a JSON baseline and later compared against it;
+--compare exits non-zero if any benchmark got slower than the threshold.
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 1000 20000 --save benchmarks/baselines/main.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baselines/main.json
+    python benchmarks/run_benchmarks.py --only predict trends --sizes 5000
+
+Settings such as XGBOOST_BACKEND, TRANSACTION_PERSISTENCE or
+MICRO_BATCH_ENABLED are read from the environment as usual, so the same
+suite can compare configurations.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+BATCH_SIZE = 64
+RECORDED_SETTINGS = ["XGBOOST_BACKEND", "AUTOENCODER_BACKEND", "TRANSACTION_PERSISTENCE",
+                     "MICRO_BATCH_ENABLED", "NOTIFICATION_ASYNC", "INFERENCE_PROCESSES"]
+
+
+def benchmark_cases(customer_count):
+    """(name, writes, method, path, request kwargs factory). The factory gets the call index."""
+    from fixtures import make_payloads
+    from app.utils.wire_format import MEDIA_TYPE, encode_transactions
+
+    def encode(chunk):
+        return encode_transactions(
+            [p["features"] for p in chunk],
+            *zip(*[(p["metadata"]["customer_id"], p["metadata"]["amount"], p["metadata"]["merchant"]) for p in chunk]),
+        )
+
+    payloads = make_payloads(512, customer_count)
+    batches = [{"transactions": payloads[i:i + BATCH_SIZE]} for i in range(0, len(payloads), BATCH_SIZE)]
+    binary = {"content-type": MEDIA_TYPE}
+    binary_payloads = [encode([p]) for p in payloads]
+    binary_batches = [encode(b["transactions"]) for b in batches]
+    return [
+        ("customers", False, "GET", "/api/customers", lambda i: {}),
+        ("customers_search", False, "GET", "/api/customers", lambda i: {"params": {"search": "Customer 0001"}}),
+        ("customers_1000", False, "GET", "/api/customers", lambda i: {"params": {"limit": 1000}}),
+        ("transactions", False, "GET", "/api/transactions", lambda i: {}),
+        ("transactions_recent", False, "GET", "/api/transactions/recent", lambda i: {"params": {"limit": 50}}),
+        ("trends", False, "GET", "/api/dashboard/trends", lambda i: {}),
+        ("trends_90", False, "GET", "/api/dashboard/trends", lambda i: {"params": {"days": 90}}),
+        ("stats", False, "GET", "/api/dashboard/stats", lambda i: {}),
+        ("search", False, "GET", "/api/search", lambda i: {"params": {"q": "Amaz"}}),
+        ("report_daily_fraud_summary", False, "GET", "/api/reports/daily-fraud-summary", lambda i: {}),
+        ("report_false_positives", False, "GET", "/api/reports/false-positives", lambda i: {}),
+        ("report_model_performance", False, "GET", "/api/reports/model-performance", lambda i: {}),
+        ("report_geographic", False, "GET", "/api/reports/geographic", lambda i: {}),
+        ("predict", True, "POST", "/api/predict", lambda i: {"json": payloads[i % len(payloads)]}),
+        ("predict_batch", True, "POST", "/api/predict/batch", lambda i: {"json": batches[i % len(batches)]}),
+        ("predict_binary", True, "POST", "/api/predict",
+         lambda i: {"content": binary_payloads[i % len(binary_payloads)], "headers": binary}),
+        ("predict_batch_binary", True, "POST", "/api/predict/batch",
+         lambda i: {"content": binary_batches[i % len(binary_batches)], "headers": binary}),
+    ]
+
+
+def time_case(client, method, path, make_kwargs, min_time, min_runs, max_runs):
+    for i in range(2):  # Warm-up (caches, first-query compilation)
+        response = client.request(method, path, **make_kwargs(i))
+        if response.status_code != 200:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() - started < min_time):
+        kwargs = make_kwargs(len(timings))
+        t0 = time.perf_counter()
+        client.request(method, path, **kwargs)
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    timings = np.array(timings)
+    return {
+        "median_ms": round(float(np.median(timings)), 4),
+        "p95_ms": round(float(np.percentile(timings, 95)), 4),
+        "mean_ms": round(float(timings.mean()), 4),
+        "runs": int(len(timings)),
+    }
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="fraud-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("AUTOENCODER_BACKEND", "numpy")  # Stand-in autoencoder is NumPy-only
+    os.chdir(workdir)  # Model artifacts (and .env) are resolved relative to the working directory
+
+    app_output = io.StringIO()
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(app_output)
+
+    with quiet:
+        from fixtures import seed_database, write_stand_in_models
+        write_stand_in_models(workdir)
+
+        from fastapi.testclient import TestClient
+        import app.main as main
+        from app.core.config import settings
+        from app.core.database import SessionLocal
+        from app.utils.deps import get_current_user
+
+    main.app.dependency_overrides[get_current_user] = lambda: None  # Reports require a login
+    results = {}
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": args.sizes,
+        "settings": {name: getattr(settings, name) for name in RECORDED_SETTINGS},
+    }
+
+    with quiet:
+        client = TestClient(main.app)
+        client.__enter__()
+    try:
+        for size in sorted(args.sizes):
+            with quiet:
+                customer_count = seed_database(SessionLocal, size)
+            print(f"\n[size {size}] {customer_count} customers, {size} transactions")
+            cases = benchmark_cases(customer_count)
+            # Reads before writes: every size measures the same seeded rows
+            for name, writes, method, path, make_kwargs in sorted(cases, key=lambda case: case[1]):
+                if args.only and name not in args.only:
+                    continue
+                with quiet:
+                    result = time_case(client, method, path, make_kwargs, args.min_time, args.min_runs, args.max_runs)
+                results[f"{name}@{size}"] = result
+                print(f"  {name:<28} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms   ({result['runs']} runs)")
+    finally:
+        with quiet:
+            client.__exit__(None, None, None)
+
+    return {"meta": meta, "results": results}
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """Prints the change per benchmark; returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key, current in report["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:<36} {'-':>10} {current['median_ms']:>10.3f}      new")
+            continue
+        ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        slower = ratio > 1 + threshold and current["median_ms"] - base["median_ms"] > min_delta_ms
+        faster = ratio < 1 / (1 + threshold)
+        flag = "  REGRESSION" if slower else ("  faster" if faster else "")
+        print(f"{key:<36} {base['median_ms']:>10.3f} {current['median_ms']:>10.3f} {ratio - 1:>+7.0%}{flag}")
+        if slower:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths in-process")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Transaction counts to seed")
+    parser.add_argument("--only", nargs="+", help="Run only these benchmarks (e.g. predict trends)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per benchmark (at least)")
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=2000)
+    parser.add_argument("--save", metavar="PATH", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this (noise)")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own output")
+    args = parser.parse_args()
+
+    # Resolve paths before run() switches to the scratch directory
+    save_path = os.path.abspath(args.save) if args.save else None
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = run(args)
+
+    if save_path:
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        with open(save_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {save_path}")
+
+    if baseline is not None:
+        if baseline["meta"].get("settings") != report["meta"]["settings"]:
+            print(f"\n⚠️  Baseline settings differ: {baseline['meta'].get('settings')}")
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
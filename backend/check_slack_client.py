@@ -0,0 +1,157 @@
+"""
+Slack Webhook Client Check
+==========================
+
+Runs SlackWebhookClient against a local stub webhook (http.server on
+127.0.0.1) — nothing is sent to Slack. Scenarios:
+
+    coalesce    — a burst of alerts arrives as one message
+    retry-5xx   — 500s are retried with backoff until the stub accepts
+    retry-429   — Retry-After is honoured
+    no-retry    — a 4xx (bad webhook) is not retried
+    timeout     — a stub that never answers is cut off by the timeout
+    keep-alive  — consecutive posts reuse one pooled connection
+    rate-limit  — posts are spaced by the token bucket
+
+Exits non-zero if any scenario fails.
+
+Usage:
+    python check_slack_client.py
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.slack_client import SlackWebhookClient
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Slack
+
+    # Set per scenario: list of (status, headers, delay_s) served in order, then 200
+    script = []
+    received = []   # (text, client port, arrival time)
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            step = StubWebhook.script.pop(0) if StubWebhook.script else (200, {}, 0.0)
+            StubWebhook.received.append((json.loads(body)["text"], self.client_address[1], time.monotonic()))
+        status, headers, delay = step
+        if delay:
+            time.sleep(delay)
+        payload = b"ok" if status == 200 else b"error"
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def reset(script=()):
+    StubWebhook.script = list(script)
+    StubWebhook.received = []
+
+
+def make_client(**overrides):
+    options = dict(coalesce_window_ms=200, rate_per_second=100, burst=10, max_retries=3,
+                   timeout_s=2.0, deadline_s=10.0, backoff_base_s=0.05, backoff_max_s=0.2)
+    options.update(overrides)
+    return SlackWebhookClient(**options)
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+    results = []
+
+    def check(name, ok, detail):
+        results.append(ok)
+        print(f"  {'✅' if ok else '❌'} {name:<12} {detail}")
+
+    print(f"Stub webhook at {url}\n")
+
+    # coalesce
+    reset()
+    client = make_client()
+    for i in range(50):
+        client.send(url, f"alert {i}")
+    client.flush()
+    posts = len(StubWebhook.received)
+    lines = sum(text.count("\n") + 1 for text, _, _ in StubWebhook.received)
+    check("coalesce", posts == 3 and lines == 50, f"50 alerts -> {posts} posts (20 lines max each), {lines} lines")
+    client.close()
+
+    # retry-5xx
+    reset([(500, {}, 0.0), (503, {}, 0.0)])
+    client = make_client()
+    client.send(url, "retry me")
+    client.flush()
+    check("retry-5xx", len(StubWebhook.received) == 3, f"{len(StubWebhook.received)} attempts (2 failures + success)")
+    client.close()
+
+    # retry-429
+    reset([(429, {"Retry-After": "1"}, 0.0)])
+    client = make_client()
+    client.send(url, "slow down")
+    client.flush()
+    gap = StubWebhook.received[-1][2] - StubWebhook.received[0][2] if len(StubWebhook.received) == 2 else 0.0
+    check("retry-429", len(StubWebhook.received) == 2 and gap >= 0.95, f"retried after {gap:.2f}s (Retry-After: 1)")
+    client.close()
+
+    # no-retry
+    reset([(404, {}, 0.0)])
+    client = make_client()
+    client.send(url, "bad hook")
+    client.flush()
+    check("no-retry", len(StubWebhook.received) == 1, f"{len(StubWebhook.received)} attempt on HTTP 404")
+    client.close()
+
+    # timeout
+    reset([(200, {}, 3.0)])
+    client = make_client(timeout_s=0.5, max_retries=0)
+    client.send(url, "hang")
+    start = time.monotonic()
+    client.flush()
+    elapsed = time.monotonic() - start
+    check("timeout", elapsed < 1.5, f"gave up after {elapsed:.2f}s (0.2s window + 0.5s timeout)")
+    client.close()
+
+    # keep-alive
+    reset()
+    client = make_client(coalesce_window_ms=0)
+    for i in range(5):
+        client.send(url, f"alert {i}")
+        client.flush()
+    ports = {port for _, port, _ in StubWebhook.received}
+    check("keep-alive", len(StubWebhook.received) == 5 and len(ports) == 1,
+          f"{len(StubWebhook.received)} posts over {len(ports)} connection(s)")
+    client.close()
+
+    # rate-limit
+    reset()
+    client = make_client(coalesce_window_ms=0, max_messages_per_post=1, rate_per_second=10, burst=1)
+    for i in range(6):
+        client.send(url, f"alert {i}")
+    client.flush()
+    times = [t for _, _, t in StubWebhook.received]
+    span = times[-1] - times[0] if times else 0.0
+    check("rate-limit", len(times) == 6 and span >= 0.45, f"6 posts at 10/s took {span:.2f}s")
+    client.close()
+
+    server.shutdown()
+    print(f"\n{sum(results)}/{len(results)} scenarios passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
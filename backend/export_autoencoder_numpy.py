@@ -0,0 +1,105 @@
+"""
+Export Autoencoder Weights for the NumPy Inference Backend
+==========================================================
+
+Reads the trained Keras autoencoder + its StandardScaler once and writes the
+weights to a plain .npz file. The API can then serve the autoencoder with
+AUTOENCODER_BACKEND=numpy, without importing TensorFlow.
+
+After exporting, the script runs a parity check against Keras and exits
+with a non-zero status if the two backends disagree.
+
+Usage:
+    python export_autoencoder_numpy.py
+    python export_autoencoder_numpy.py --model autoencoder_model.h5 --output autoencoder_numpy.npz
+
+Re-run this after every autoencoder retrain (train_autoencoder.py / retrain_models.py).
+"""
+
+import os
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+
+import argparse
+import sys
+import joblib
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+from tensorflow.keras.models import load_model
+
+from app.ml.numpy_autoencoder import NumpyAutoencoder
+
+
+def load_keras_autoencoder(path=None):
+    """Loads the autoencoder the same way the API does (.keras first, .h5 fallback)."""
+    candidates = [path] if path else ["autoencoder_model.keras", "autoencoder_model.h5"]
+    last_error = None
+    for candidate in candidates:
+        try:
+            return load_model(candidate, compile=False), candidate
+        except Exception as e:
+            last_error = e
+    raise RuntimeError(f"Could not load autoencoder: {last_error}")
+
+
+def parity_check(keras_model, scaler, engine, n_rows=2000, seed=42):
+    """Compares NumPy vs Keras reconstruction error on normal + attack-like rows."""
+    rng = np.random.default_rng(seed)
+    normal = rng.uniform(-2.0, 2.0, size=(n_rows, engine.n_features))
+    attacks = normal[: n_rows // 10].copy()
+    attacks[:, 0] = 50.0    # Same spikes the simulator injects
+    attacks[:, 4] = -50.0
+    features = np.vstack([normal, attacks])
+
+    scaled = scaler.transform(features)
+    keras_error = np.mean(np.power(scaled - keras_model.predict(scaled, verbose=0), 2), axis=1)
+    numpy_error = engine.reconstruction_error(features)
+
+    return {
+        "rows": len(features),
+        "max_scaled_diff": float(np.max(np.abs(engine.transform(features) - scaled))),
+        "max_error_diff": float(np.max(np.abs(keras_error - numpy_error))),
+        "max_relative_diff": float(np.max(np.abs(keras_error - numpy_error) / np.maximum(keras_error, 1e-12))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the autoencoder for NumPy inference")
+    parser.add_argument("--model", default=None, help="Keras model (.keras or .h5)")
+    parser.add_argument("--scaler", default="autoencoder_scaler.pkl")
+    parser.add_argument("--output", default="autoencoder_numpy.npz")
+    parser.add_argument("--tolerance", type=float, default=1e-4,
+                        help="Max allowed relative difference in reconstruction error")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("📦 AUTOENCODER → NUMPY EXPORT")
+    print("="*70)
+
+    keras_model, model_path = load_keras_autoencoder(args.model)
+    scaler = joblib.load(args.scaler)
+    print(f"\n✅ Loaded {model_path} + {args.scaler}")
+
+    engine = NumpyAutoencoder.from_keras(keras_model, scaler)
+    layout = " → ".join([str(engine.n_features)] + [str(w.shape[1]) for w in engine.weights])
+    print(f"   Layers: {layout} ({', '.join(engine.activations)})")
+
+    engine.save(args.output)
+    print(f"✅ Saved {args.output}")
+
+    # Parity check against Keras, using the file we just wrote
+    result = parity_check(keras_model, scaler, NumpyAutoencoder.load(args.output))
+    print(f"\n🔍 Parity check on {result['rows']} rows:")
+    print(f"   Max scaled-feature diff:       {result['max_scaled_diff']:.3e}")
+    print(f"   Max reconstruction-error diff: {result['max_error_diff']:.3e}")
+    print(f"   Max relative diff:             {result['max_relative_diff']:.3e}")
+
+    if result["max_relative_diff"] > args.tolerance:
+        print(f"\n❌ Parity check FAILED (tolerance {args.tolerance:.0e})")
+        sys.exit(1)
+    print("\n✅ Parity check passed — set AUTOENCODER_BACKEND=numpy to serve without TensorFlow\n")
+
+
+if __name__ == "__main__":
+    main()
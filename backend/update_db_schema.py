@@ -40,6 +40,27 @@ def update_schema():
             print("system_config table created successfully.")
         except Exception as e:
             print(f"Error creating system_config table: {e}")
+
+        # 4. Case-insensitive index for merchant whitelist lookups
+        try:
+            print("Creating lower(merchant_name) index on merchant_whitelist...")
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_merchant_whitelist_merchant_name_lower "
+                "ON merchant_whitelist (lower(merchant_name))"
+            ))
+            print("merchant_whitelist index created successfully.")
+        except Exception as e:
+            print(f"Error creating merchant_whitelist index: {e}")
+
+        # 5. Per-customer transaction lookups (/api/customers aggregates)
+        try:
+            print("Creating customer_id index on transactions...")
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transactions_customer_id ON transactions (customer_id)"
+            ))
+            print("transactions index created successfully.")
+        except Exception as e:
+            print(f"Error creating transactions index: {e}")
             
         connection.commit()
 
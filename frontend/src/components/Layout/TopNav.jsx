@@ -5,6 +5,7 @@ import {
   Home, CreditCard, Users, FileText, Server, AlertTriangle, Info,
 } from 'lucide-react';
 import { useAuth } from '../../hooks/useAuth.jsx';
+import { subscribeLiveEvents } from '../../services/liveEvents.js';
 
 const API = 'http://localhost:8000';
 const getToken = () => localStorage.getItem('access_token') || '';
@@ -148,24 +149,11 @@ const TopNav = () => {
     setSearchResults({ transactions: [], customers: [] });
   };
 
-  // ── Unread count polling (every 15 s) ────────────────────────────────
-  const fetchUnreadCount = useCallback(async () => {
-    try {
-      const res = await fetch(`${API}/api/notifications/unread-count`);
-      if (res.ok) {
-        const data = await res.json();
-        setUnreadCount(data.count);
-      }
-    } catch {
-      // silently ignore — network blip
-    }
-  }, []);
-
-  useEffect(() => {
-    fetchUnreadCount();
-    const interval = setInterval(fetchUnreadCount, 15000);
-    return () => clearInterval(interval);
-  }, [fetchUnreadCount]);
+  // ── Unread count (pushed by the live feed, services/liveEvents.js) ───
+  useEffect(() => subscribeLiveEvents({
+    snapshot: (snapshot) => setUnreadCount(snapshot.unread_count),
+    notifications: ({ read, new: added }) => setUnreadCount((prev) => (read ? 0 : prev) + added),
+  }), []);
 
   // ── Fetch notification list ──────────────────────────────────────────
   const fetchNotifications = useCallback(async () => {
@@ -12,13 +12,20 @@ const Customers = () => {
   const [loading, setLoading] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const [filterType, setFilterType] = useState('all');
+  const [nextCursor, setNextCursor] = useState(null); // X-Next-Cursor of the last page loaded
+  const [totalCount, setTotalCount] = useState(null);
 
-  // Fetch customers from backend
-  const fetchCustomers = async () => {
+  // Fetch customers from backend (first page, or the page after `after`)
+  const fetchCustomers = async (after = null) => {
     try {
       const queryParams = new URLSearchParams();
       if (searchQuery) queryParams.append('search', searchQuery);
       if (filterType !== 'all') queryParams.append('risk_filter', filterType);
+      if (after) {
+        queryParams.append('after', after);
+      } else {
+        queryParams.append('include_total', 'true');
+      }
 
       const response = await fetch(`http://localhost:8000/api/customers?${queryParams}`);
       if (response.ok) {
@@ -37,7 +44,9 @@ const Customers = () => {
             isFrozen: c.is_frozen,
             isActive: c.is_active
         }));
-        setCustomers(mappedCustomers);
+        setCustomers((prev) => (after ? [...prev, ...mappedCustomers] : mappedCustomers));
+        setNextCursor(response.headers.get('X-Next-Cursor'));
+        if (!after) setTotalCount(Number(response.headers.get('X-Total-Count')));
       }
     } catch (error) {
       console.error("Failed to fetch customers:", error);
@@ -147,7 +156,7 @@ const Customers = () => {
               <option value="high">High Risk (&gt;50%)</option>
               <option value="safe">Safe Customers</option>
           </select>
-          <Button variant="secondary" icon={Filter} onClick={fetchCustomers}>
+          <Button variant="secondary" icon={Filter} onClick={() => fetchCustomers()}>
             Refresh
           </Button>
         </div>
@@ -222,6 +231,18 @@ const Customers = () => {
             </tbody>
           </table>
         </div>
+        {customers.length > 0 && (
+          <div className="flex items-center justify-between px-6 py-3 border-t border-gray-200 dark:border-slate-700">
+            <p className="text-sm text-gray-500 dark:text-slate-400">
+              Showing {customers.length}{totalCount !== null ? ` of ${totalCount}` : ''} customers
+            </p>
+            {nextCursor && (
+              <Button variant="secondary" onClick={() => fetchCustomers(nextCursor)}>
+                Load more
+              </Button>
+            )}
+          </div>
+        )}
       </Card>
 
       {/* Add Customer Modal */}
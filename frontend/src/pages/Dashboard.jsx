@@ -6,6 +6,7 @@ import Card from '../components/Common/Card.jsx';
 import Badge from '../components/Common/Badge.jsx';
 import Modal from '../components/Common/Modal.jsx';
 import Button from '../components/Common/Button.jsx';
+import { applyStatsDelta, subscribeLiveEvents } from '../services/liveEvents.js';
 
 const Dashboard = () => {
   const navigate = useNavigate();
@@ -15,54 +16,36 @@ const Dashboard = () => {
     total_transactions: 0,
     fraud_detected: 0,
     under_review: 0,
-    avg_response_ms: 0
+    avg_response_ms: 0,
+    latency_sum_ms: 0,
+    latency_count: 0
   });
   const [graphData, setGraphData] = useState([]);
+  const [trendDays, setTrendDays] = useState(7);
+  const [snapshotCount, setSnapshotCount] = useState(0); // Bumped by each live-feed snapshot
   const [riskyMerchants, setRiskyMerchants] = useState([]);
 
-  // Fetch recent transactions (Polling)
+  // Live feed: recent transactions, today's stats and the charts, pushed over
+  // server-sent events (services/liveEvents.js) instead of polled every 2 seconds
   useEffect(() => {
-    const fetchTransactions = async () => {
-        try {
-            const response = await fetch('http://localhost:8000/api/transactions/recent');
-            if (response.ok) {
-                const data = await response.json();
-                // Map backend data to UI format
-                // Backend returns: id, customer_id, merchant, amount, timestamp, fraud_score, status, customer_name, card_type, card_last_four
-                const mappedTxns = data.map(txn => ({
-                    id: txn.id,
-                    time: new Date(txn.timestamp).toLocaleTimeString(),
-                    amount: `LKR ${txn.amount.toFixed(2)}`,
-                    merchant: txn.merchant,
-                    // customer info for display
-                    description: `Transaction by ${txn.customer_name} (${txn.card_type} ...${txn.card_last_four})`,
-                    score: txn.fraud_score,
-                    decision: txn.status, 
-                    status: txn.status === 'Decline' ? 'danger' : (txn.status === 'Escalate' ? 'warning' : 'success')
-                }));
-                setTransactions(mappedTxns);
-            }
-        } catch (error) {
-            console.error("Error fetching transactions:", error);
-        }
-    };
+    let day = null; // Stats deltas apply to the day of the last snapshot
+
+    // Map backend data to UI format
+    // Backend returns: id, customer_id, merchant, amount, timestamp, fraud_score, status, customer_name, card_type, card_last_four
+    const mapTransaction = (txn) => ({
+        id: txn.id,
+        time: new Date(txn.timestamp).toLocaleTimeString(),
+        amount: `LKR ${txn.amount.toFixed(2)}`,
+        merchant: txn.merchant,
+        // customer info for display
+        description: `Transaction by ${txn.customer_name} (${txn.card_type} ...${txn.card_last_four})`,
+        score: txn.fraud_score,
+        decision: txn.status, 
+        status: txn.status === 'Decline' ? 'danger' : (txn.status === 'Escalate' ? 'warning' : 'success')
+    });
 
     const fetchDashboardData = async () => {
         try {
-            // Fetch Stats
-            const statsRes = await fetch('http://localhost:8000/api/dashboard/stats');
-            if (statsRes.ok) {
-                const statsJson = await statsRes.json();
-                setStats(statsJson);
-            }
-
-            // Fetch Graph Trends
-            const trendsRes = await fetch('http://localhost:8000/api/dashboard/trends');
-            if (trendsRes.ok) {
-                const trendsJson = await trendsRes.json();
-                setGraphData(trendsJson);
-            }
-
             // Fetch Risky Merchants
             const riskRes = await fetch('http://localhost:8000/api/dashboard/risky-merchants');
             if (riskRes.ok) {
@@ -74,19 +57,45 @@ const Dashboard = () => {
         }
     };
 
-    // Initial fetch
-    fetchTransactions();
-    fetchDashboardData();
-
-    // Poll every 2 seconds
-    const interval = setInterval(() => {
-        fetchTransactions();
-        fetchDashboardData();
-    }, 2000);
-
-    return () => clearInterval(interval);
+    return subscribeLiveEvents({
+        // On every (re)connect, at least once a minute
+        snapshot: (snapshot) => {
+            day = snapshot.day;
+            setTransactions(snapshot.transactions.map(mapTransaction));
+            setStats(snapshot.stats);
+            fetchDashboardData(); // Charts change slowly: refreshed with each snapshot
+            setSnapshotCount((count) => count + 1);
+        },
+        transactions: (rows) => {
+            setTransactions((prev) => {
+                const incoming = rows.map(mapTransaction);
+                const ids = new Set(incoming.map((txn) => txn.id));
+                return [...incoming, ...prev.filter((txn) => !ids.has(txn.id))].slice(0, 10);
+            });
+        },
+        stats: (delta) => {
+            if (delta.day !== day) return; // Other day: the next snapshot is authoritative
+            setStats((prev) => applyStatsDelta(prev, delta));
+        }
+    });
   }, []);
 
+  // Fetch Graph Trends (on range change and with each live-feed snapshot)
+  useEffect(() => {
+    const fetchTrends = async () => {
+        try {
+            const trendsRes = await fetch(`http://localhost:8000/api/dashboard/trends?days=${trendDays}`);
+            if (trendsRes.ok) {
+                const trendsJson = await trendsRes.json();
+                setGraphData(trendsJson);
+            }
+        } catch (error) {
+            console.error("Error fetching trends:", error);
+        }
+    };
+    fetchTrends();
+  }, [trendDays, snapshotCount]);
+
   const dashboardKPIs = [
     { label: 'Transactions Today', value: stats.total_transactions.toLocaleString(), icon: CreditCard, color: 'blue' },
     { label: 'Fraud Detected', value: stats.fraud_detected, icon: AlertTriangle, color: 'red' },
@@ -145,7 +154,18 @@ const Dashboard = () => {
 
       {/* Fraud Trends Chart */}
       <Card className="p-6">
-        <h2 className="text-lg font-semibold text-gray-900 dark:text-white mb-4">Fraud Trends (Last 7 Days)</h2>
+        <div className="flex items-center justify-between mb-4">
+          <h2 className="text-lg font-semibold text-gray-900 dark:text-white">Fraud Trends (Last {trendDays} Days)</h2>
+          <select
+            value={trendDays}
+            onChange={(e) => setTrendDays(Number(e.target.value))}
+            className="text-sm border border-gray-300 dark:border-slate-600 rounded-lg px-2 py-1 bg-white dark:bg-slate-800 text-gray-700 dark:text-slate-200"
+          >
+            {[7, 30, 90].map((days) => (
+              <option key={days} value={days}>{days} days</option>
+            ))}
+          </select>
+        </div>
         <ResponsiveContainer width="100%" height={300}>
           <LineChart data={graphData}>
             <CartesianGrid strokeDasharray="3 3" stroke="#e5e7eb" strokeOpacity={0.2} />
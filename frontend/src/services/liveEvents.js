@@ -0,0 +1,81 @@
+// Live dashboard feed (GET /api/events, server-sent events).
+// One EventSource per tab, shared by every component that subscribes;
+// it is opened on the first subscription and closed with the last one.
+// EventSource reconnects on its own, and every (re)connect starts with a
+// `snapshot` event, so subscribers never need to poll. Later events are
+// folded into the cached snapshot, so a late subscriber starts from the
+// current state rather than from the connection's first snapshot.
+
+const EVENTS_URL = 'http://localhost:8000/api/events';
+const EVENT_TYPES = ['snapshot', 'transactions', 'stats', 'notifications'];
+const FEED_SIZE = 10; // Backend LIVE_EVENTS_FEED_SIZE
+
+const listeners = new Map(EVENT_TYPES.map((type) => [type, new Set()]));
+let source = null;
+let lastSnapshot = null;
+
+const listenerCount = () =>
+  [...listeners.values()].reduce((total, set) => total + set.size, 0);
+
+// Adds a `stats` event to snapshot stats; the average is computed like the server's
+export const applyStatsDelta = (stats, delta) => {
+  const latencySum = stats.latency_sum_ms + delta.processing_ms_sum;
+  const latencyCount = stats.latency_count + delta.latency_count;
+  return {
+    total_transactions: stats.total_transactions + delta.total_transactions,
+    fraud_detected: stats.fraud_detected + delta.fraud_detected,
+    under_review: stats.under_review + delta.under_review,
+    avg_response_ms: latencyCount > 0 ? Math.floor(latencySum / latencyCount) : 0,
+    latency_sum_ms: latencySum,
+    latency_count: latencyCount
+  };
+};
+
+const applyToSnapshot = {
+  transactions: (snapshot, rows) => {
+    const ids = new Set(rows.map((txn) => txn.id));
+    const transactions = [...rows, ...snapshot.transactions.filter((txn) => !ids.has(txn.id))];
+    return { ...snapshot, transactions: transactions.slice(0, FEED_SIZE) };
+  },
+  stats: (snapshot, delta) =>
+    // Other day: the next snapshot is authoritative
+    delta.day === snapshot.day ? { ...snapshot, stats: applyStatsDelta(snapshot.stats, delta) } : snapshot,
+  notifications: (snapshot, { read, new: added }) =>
+    ({ ...snapshot, unread_count: (read ? 0 : snapshot.unread_count) + added }),
+};
+
+const open = () => {
+  source = new EventSource(EVENTS_URL);
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => {
+      const data = JSON.parse(event.data);
+      if (type === 'snapshot') {
+        lastSnapshot = data;
+      } else if (lastSnapshot) {
+        lastSnapshot = applyToSnapshot[type](lastSnapshot, data);
+      }
+      listeners.get(type).forEach((handler) => handler(data));
+    });
+  });
+};
+
+// handlers: { snapshot, transactions, stats, notifications } — any subset.
+// Returns the unsubscribe function (use it as a useEffect cleanup).
+export const subscribeLiveEvents = (handlers) => {
+  const entries = Object.entries(handlers).filter(([type]) => listeners.has(type));
+  entries.forEach(([type, handler]) => listeners.get(type).add(handler));
+  if (!source) {
+    open();
+  } else if (lastSnapshot && handlers.snapshot) {
+    handlers.snapshot(lastSnapshot); // Late subscriber: start from the up-to-date snapshot
+  }
+
+  return () => {
+    entries.forEach(([type, handler]) => listeners.get(type).delete(handler));
+    if (source && listenerCount() === 0) {
+      source.close();
+      source = null;
+      lastSnapshot = null;
+    }
+  };
+};